@@ -1,17 +1,12 @@
-import docx
 import csv
 import re
 
+from app.services.docx_tables import iter_docx_rows
+from app.services.program_names import parse_program_name
+
 def generate_short_name(program_name, year):
-    # Логика формирования short_name: Код_Профиль_Год
-    match = re.match(r"(\d{2}\.\d{2}\.\d{2}) (.+?) \((.+)\)", program_name)
-    if match:
-        code = match.group(1)  # Код программы
-        profile = match.group(3)  # Профиль программы
-        short_name = f"{code}_{profile[:3].upper()}_{year}"  # Берем первые 3 буквы профиля и добавляем год
-        return short_name
-    print(f"Не удалось сформировать short_name для: {program_name}")  # Отладочный вывод
-    return "Unknown"
+    # short_name в том же формате, что пишут в БД импорт программ и справок
+    return parse_program_name(program_name).short_name(year)
 
 def process_docx(file_path):
     # Извлекаем год из названия файла
@@ -19,33 +14,32 @@ def process_docx(file_path):
     year_match = re.search(r'\d{4}', file_name)
     year = year_match.group(0) if year_match else "Unknown"
 
-    # Открываем .docx файл
-    doc = docx.Document(file_path)
     data = set()  # Используем множество для хранения уникальных записей
 
-    # Ищем таблицы в документе
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                if "Наименование образовательных программ" in cell.text:
-                    # Обрабатываем строки таблицы
-                    for row in table.rows[1:]:  # Пропускаем заголовок
-                        # Отладочный вывод всех ячеек строки
-                        row_data = [cell.text.strip() for cell in row.cells]
-                        print(f"Данные строки: {row_data}")
-
-                        # Извлекаем данные из последнего столбца
-                        program_name = row.cells[-1].text.strip()
-                        print(f"Обрабатываемая строка: {program_name}")  # Отладочный вывод
-                        if program_name:
-                            # Разделяем программы по ";"
-                            programs = program_name.split(";")
-                            for program in programs:
-                                program = program.strip()
-                                short_name = generate_short_name(program, year)
-                                # Добавляем уникальную запись в множество
-                                data.add((program, short_name, year))
-                    break
+    # Строки всех таблиц читаются потоково; нужна таблица с программами
+    header_table = None
+    for table_index, row_data in iter_docx_rows(file_path):
+        if header_table != table_index:
+            if any("Наименование образовательных программ" in text for text in row_data):
+                header_table = table_index  # Заголовок пропускаем
+            continue
+
+        # Отладочный вывод всех ячеек строки
+        print(f"Данные строки: {[text.strip() for text in row_data]}")
+
+        # Извлекаем данные из последнего столбца
+        program_name = row_data[-1].strip() if row_data else ""
+        print(f"Обрабатываемая строка: {program_name}")  # Отладочный вывод
+        if program_name:
+            # Разделяем программы по ";"
+            programs = program_name.split(";")
+            for program in programs:
+                program = program.strip()
+                if not program:  # Пустой фрагмент: ";" в конце или ";;"
+                    continue
+                short_name = generate_short_name(program, year)
+                # Добавляем уникальную запись в множество
+                data.add((program, short_name, year))
 
     # Сохраняем результат в CSV
     output_file = f"processed_programs_{year}.csv"
@@ -63,5 +57,6 @@ def save_to_csv(data, output_file):
         writer.writerows(sorted_data)  # Уникальные строки
 
 # Пример вызова функции
-file_path = "/Users/anatoliy/Documents/Proj_VS/KadrSp/АИС_МАГИ_2023.docx"
-process_docx(file_path)
\ No newline at end of file
+if __name__ == "__main__":
+    file_path = "/Users/anatoliy/Documents/Proj_VS/KadrSp/АИС_МАГИ_2023.docx"
+    process_docx(file_path)
@@ -0,0 +1,101 @@
+"""
+Настройка логирования приложения.
+
+- Уровень и формат задаются переменными окружения LOG_LEVEL (INFO) и
+  LOG_FORMAT (text | json).
+- Каждая запись содержит идентификатор запроса (request_id). Он берётся из
+  заголовка X-Request-ID или генерируется и возвращается в ответе.
+- Подробная отладочная трассировка горячих путей (по строкам файла, по
+  дисциплинам) включается только для доли запросов LOG_DEBUG_SAMPLE_RATE и
+  только при уровне DEBUG. Такой код оборачивается в `if tracing(logger):`,
+  поэтому при выключенной отладке сообщения даже не форматируются.
+"""
+import json
+import logging
+import os
+import random
+import uuid
+from contextvars import ContextVar
+
+from fastapi import Request
+
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+_trace_var: ContextVar[bool] = ContextVar("trace", default=True)
+
+
+class RequestContextFilter(logging.Filter):
+    """Добавляет request_id текущего запроса в каждую запись."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def setup_logging():
+    """Настраивает корневой логгер (вызывается при старте и в процессах разбора)."""
+    handler = logging.StreamHandler()
+    handler.addFilter(RequestContextFilter())
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(
+            logging.Formatter(
+                "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+            )
+        )
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(LOG_LEVEL)
+
+
+def tracing(logger: logging.Logger) -> bool:
+    """Нужно ли писать подробную отладку в текущем запросе."""
+    return _trace_var.get() and logger.isEnabledFor(logging.DEBUG)
+
+
+def set_request_context(request_id: str = None, trace: bool = None) -> str:
+    """
+    Привязывает к текущему контексту идентификатор запроса и решение
+    о выборочной трассировке (по умолчанию — случайная выборка).
+    Возвращает идентификатор.
+    """
+    request_id = request_id or uuid.uuid4().hex
+    if trace is None:
+        trace = random.random() < LOG_DEBUG_SAMPLE_RATE
+    request_id_var.set(request_id)
+    _trace_var.set(trace)
+    return request_id
+
+
+def get_request_context() -> tuple:
+    """(request_id, trace) текущего контекста — для передачи в другой процесс."""
+    return request_id_var.get(), _trace_var.get()
+
+
+async def request_context_middleware(request: Request, call_next):
+    """HTTP middleware: идентификатор запроса в логах и в заголовке ответа."""
+    request_id = set_request_context(request.headers.get(REQUEST_ID_HEADER))
+    response = await call_next(request)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
@@ -1,10 +1,22 @@
+import logging
+import time
+
 from fastapi import FastAPI, Request, APIRouter
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
-from app.routers import teachers, import_router, admin, curriculum
+from app.routers import teachers, import_router, admin, curriculum, reports, export
 from app.database import engine, Base
+from app.services import import_jobs
+from app.services.uploads import cleanup_spool
+from app.logging_config import setup_logging, request_context_middleware
+from app.services.request_metrics import (
+    QUERY_BUDGET,
+    route_label,
+    route_metrics,
+    server_timing,
+    start_request,
+)
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, HTMLResponse
 from pathlib import Path
 
  
@@ -12,8 +24,42 @@ from pathlib import Path
 # Создаем таблицы в БД (в реальном проекте используйте миграции!)
 Base.metadata.create_all(bind=engine)
 
+setup_logging()
+logger = logging.getLogger(__name__)
+
 app = FastAPI()
 
+
+@app.middleware("http")
+async def request_timing(request: Request, call_next):
+    """
+    Время обработки, число SQL-запросов и время в БД для каждого запроса:
+    заголовок Server-Timing, агрегаты для /metrics и предупреждение
+    при превышении бюджета запросов (QUERY_BUDGET).
+    """
+    stats = start_request()
+    started = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - started
+
+    route = route_label(request.scope)
+    response.headers["Server-Timing"] = server_timing(stats, elapsed)
+    route_metrics.observe(request.method, route, response.status_code, stats, elapsed)
+    if stats.queries > QUERY_BUDGET:
+        logger.warning(
+            "%s %s: %d SQL-запросов (бюджет %d), %.1f мс в БД",
+            request.method,
+            route,
+            stats.queries,
+            QUERY_BUDGET,
+            stats.db_time * 1000,
+        )
+    return response
+
+
+# Идентификатор запроса для логов (X-Request-ID)
+app.middleware("http")(request_context_middleware)
+
 # Подключение статических файлов (CSS/JS)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -25,6 +71,30 @@ app.include_router(teachers.router)
 app.include_router(import_router.router)
 app.include_router(admin.router)
 app.include_router(curriculum.router)
+app.include_router(reports.router)
+app.include_router(export.router)
+
+
+@app.on_event("startup")
+def cleanup_upload_spool():
+    # Файлы, оставшиеся от прерванных импортов
+    cleanup_spool()
+
+
+@app.on_event("shutdown")
+def shutdown_import_jobs():
+    import_jobs.shutdown()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """
+    Метрики маршрутов в текстовом формате Prometheus.
+    """
+    return PlainTextResponse(
+        route_metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 
 @app.get("/", response_class=HTMLResponse)
 def read_home(request: Request):
@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Table, Text, Float
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Table, Text, Float, UniqueConstraint, Index, DateTime, func, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from app.database import Base
 
 Base = declarative_base()
 
+# Класс операторов gin_trgm_ops индекса ix_curriculum_discipline_trgm — из pg_trgm,
+# поэтому create_all в PostgreSQL сначала создаёт расширение
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True)
@@ -13,7 +21,8 @@ class User(Base):
 teacher_program_association = Table(
     'teacher_programs', Base.metadata,
     Column('teacher_id', Integer, ForeignKey('teachers.teacher_id', ondelete="CASCADE")),
-    Column('program_id', Integer, ForeignKey('education_programs.program_id', ondelete="CASCADE"))
+    Column('program_id', Integer, ForeignKey('education_programs.program_id', ondelete="CASCADE"), index=True),
+    UniqueConstraint('teacher_id', 'program_id', name='uq_teacher_programs_teacher_program'),
 )
 
 # Таблица преподавателей
@@ -50,7 +59,7 @@ class Qualification(Base):
     program_name = Column(Text, nullable=False)  # Название программы повышения квалификации
     year = Column(Integer, nullable=False)  # Год прохождения программы
 
-    teacher_id = Column(Integer, ForeignKey("teachers.teacher_id", ondelete="CASCADE"), nullable=False)  # Связь с преподавателем
+    teacher_id = Column(Integer, ForeignKey("teachers.teacher_id", ondelete="CASCADE"), nullable=False, index=True)  # Связь с преподавателем
     teacher = relationship("Teacher", back_populates="qualifications", lazy="selectin")
 
 # Таблица переподготовок преподавателей
@@ -58,7 +67,7 @@ class Retraining(Base):
     __tablename__ = "retrainings"
 
     retraining_id = Column(Integer, primary_key=True, index=True)  # Уникальный идентификатор переподготовки
-    teacher_id = Column(Integer, ForeignKey('teachers.teacher_id', ondelete="CASCADE"), nullable=False)  # Связь с преподавателем
+    teacher_id = Column(Integer, ForeignKey('teachers.teacher_id', ondelete="CASCADE"), nullable=False, index=True)  # Связь с преподавателем
     program_name = Column(Text, nullable=False)  # Название программы переподготовки
     year = Column(Integer, nullable=False)  # Год прохождения программы
 
@@ -91,10 +100,14 @@ class EducationProgram(Base):
 
 class TaughtDiscipline(Base):
     __tablename__ = "taught_disciplines"
+    __table_args__ = (
+        # Уникальный индекс покрывает и поиск по teacher_id
+        UniqueConstraint("teacher_id", "curriculum_id", name="uq_taught_disciplines_teacher_curriculum"),
+    )
 
     discipline_id = Column(Integer, primary_key=True, index=True)
     teacher_id = Column(Integer, ForeignKey("teachers.teacher_id", ondelete="CASCADE"), nullable=False)
-    curriculum_id = Column(Integer, ForeignKey("curriculum.curriculum_id", ondelete="CASCADE"), nullable=False)
+    curriculum_id = Column(Integer, ForeignKey("curriculum.curriculum_id", ondelete="CASCADE"), nullable=False, index=True)
 
     teacher = relationship("Teacher", back_populates="taught_disciplines", overlaps="disciplines")
     curriculum = relationship("Curriculum", back_populates="taught_disciplines", overlaps="teacher")
@@ -102,6 +115,15 @@ class TaughtDiscipline(Base):
 # Таблица учебных планов
 class Curriculum(Base):
     __tablename__ = "curriculum"
+    __table_args__ = (
+        # Триграммный индекс для нечеткого поиска дисциплин (app/services/discipline_matching.py)
+        Index(
+            "ix_curriculum_discipline_trgm",
+            "discipline",
+            postgresql_using="gin",
+            postgresql_ops={"discipline": "gin_trgm_ops"},
+        ),
+    )
     
     curriculum_id = Column(Integer, primary_key=True)  # Уникальный идентификатор учебного плана
     discipline = Column(String(255), nullable=False)  # Название дисциплины
@@ -115,7 +137,7 @@ class Curriculum(Base):
     course_project_hours = Column(Float, default=0.0)  # Количество часов на курсовой проект
     total_practice_hours = Column(Float, default=0.0)  # Общее количество часов практики
     final_work_hours = Column(Integer, default=0)  # Количество часов на выполнение выпускной квалификационной работы
-    program_id = Column(Integer, ForeignKey('education_programs.program_id'))  # Связь с образовательной программой
+    program_id = Column(Integer, ForeignKey('education_programs.program_id'), index=True)  # Связь с образовательной программой
     
     program = relationship("EducationProgram", back_populates="curriculum")  # Связь с образовательной программой
     
@@ -127,3 +149,56 @@ class Curriculum(Base):
     def program_short_name(self):
         return self.program.short_name if self.program else None
 
+
+# Журнал применённых импортов: по хэшу содержимого повторная загрузка
+# того же файла распознаётся без разбора
+class ImportLedger(Base):
+    __tablename__ = "import_ledger"
+    __table_args__ = (
+        # Последний импорт вида/программы: ORDER BY ledger_id DESC LIMIT 1
+        Index("ix_import_ledger_kind_program", "kind", "program_id", "ledger_id"),
+    )
+
+    ledger_id = Column(Integer, primary_key=True)
+    kind = Column(String(32), nullable=False)  # Вид импорта: curriculum, teachers
+    content_hash = Column(String(64), nullable=False, index=True)  # SHA-256 содержимого файла
+    filename = Column(String(255))  # Исходное имя файла
+    program_id = Column(Integer, ForeignKey('education_programs.program_id', ondelete="CASCADE"), nullable=True)  # Программа учебного плана
+    rows_parsed = Column(Integer, default=0)  # Строк разобрано из файла
+    rows_written = Column(Integer, default=0)  # Строк изменено в БД
+    applied_at = Column(DateTime, server_default=func.now(), nullable=False)  # Время применения
+
+
+# Сводная учебная нагрузка (часы учебных планов). Таблицы пересчитываются
+# по затронутым ключам в той же транзакции, что и импорт (services/teaching_load.py)
+class LoadTotalsMixin:
+    disciplines = Column(Integer, nullable=False, default=0)  # Число строк плана
+    lecture_hours = Column(Float, nullable=False, default=0.0)
+    practice_hours = Column(Float, nullable=False, default=0.0)
+    lab_hours = Column(Float, nullable=False, default=0.0)
+    exam_hours = Column(Float, nullable=False, default=0.0)
+    test_hours = Column(Float, nullable=False, default=0.0)
+    course_project_hours = Column(Float, nullable=False, default=0.0)
+    total_practice_hours = Column(Float, nullable=False, default=0.0)
+    final_work_hours = Column(Float, nullable=False, default=0.0)
+    total_hours = Column(Float, nullable=False, default=0.0)  # Сумма всех видов часов
+    updated_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+class ProgramLoad(LoadTotalsMixin, Base):
+    __tablename__ = "load_by_program"
+
+    program_id = Column(Integer, ForeignKey('education_programs.program_id', ondelete="CASCADE"), primary_key=True)
+
+
+class DepartmentLoad(LoadTotalsMixin, Base):
+    __tablename__ = "load_by_department"
+
+    department = Column(String(255), primary_key=True)
+
+
+# Часы дисциплины засчитываются каждому из ведущих её преподавателей полностью
+class TeacherLoad(LoadTotalsMixin, Base):
+    __tablename__ = "load_by_teacher"
+
+    teacher_id = Column(Integer, ForeignKey('teachers.teacher_id', ondelete="CASCADE"), primary_key=True)
@@ -1,10 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from sqlalchemy import text  # Добавьте этот импорт
-from app.database import get_db, Base, engine
-from app.models import Qualification, Retraining, EducationProgram, Teacher, TaughtDiscipline, Curriculum
+from app.database import (
+    get_db, engine, async_engine, engine_metrics, async_engine_metrics,
+    POOL_SETTINGS, STATEMENT_TIMEOUT_MS,
+)
+from app.models import (
+    Qualification, Retraining, EducationProgram, Teacher, TaughtDiscipline, Curriculum, ImportLedger,
+    ProgramLoad, DepartmentLoad, TeacherLoad,
+)
+from app.services.import_ledger import invalidate_applied
 from app.services.import_utils import import_education_programs
-import os
+from app.services.pool_metrics import pool_status
+from app.services.response_cache import bump_data_version
+from app.services.teaching_load import rebuild_load
+from app.services.uploads import spool_upload_sync, remove_spooled
 
 
 
@@ -15,6 +25,10 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 def clear_database(db: Session = Depends(get_db)):
     try:
         # Удаляем записи из зависимых таблиц
+        db.query(ImportLedger).delete()
+        db.query(ProgramLoad).delete()
+        db.query(DepartmentLoad).delete()
+        db.query(TeacherLoad).delete()
         db.query(Curriculum).delete()
         db.query(TaughtDiscipline).delete()
         db.query(Qualification).delete()
@@ -25,34 +39,62 @@ def clear_database(db: Session = Depends(get_db)):
         db.query(EducationProgram).delete()
 
         # Сбрасываем последовательности ID (используем правильные имена из pg_class)
-        db.execute(text("TRUNCATE TABLE education_programs, teachers, curriculum, qualifications, retrainings, taught_disciplines RESTART IDENTITY CASCADE"))
+        db.execute(text("TRUNCATE TABLE education_programs, teachers, curriculum, qualifications, retrainings, taught_disciplines, import_ledger, load_by_program, load_by_department, load_by_teacher RESTART IDENTITY CASCADE"))
 
         db.commit()
+        bump_data_version()
         return {"message": "Все данные удалены, ID сброшены"}
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))    
 
+@router.post("/rebuild-load")
+def rebuild_teaching_load(db: Session = Depends(get_db)):
+    """
+    Полностью пересчитывает итоги учебной нагрузки (/reports/load).
+    Нужен только после правок планов или связей в обход импорта.
+    """
+    try:
+        rebuild_load(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    bump_data_version()
+    return {"message": "Итоги учебной нагрузки пересчитаны"}
+
+
 @router.post("/upload-programs")
 def upload_programs(file: UploadFile = File(...), db: Session = Depends(get_db)):
     """
     Загружает образовательные программы из загруженного CSV-файла.
     """
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Только CSV-файлы поддерживаются.")
-    
-    # Сохраняем временный файл
-    temp_file = f"temp_{file.filename}"
-    with open(temp_file, "wb") as buffer:
-        buffer.write(file.file.read())
-    
+    # Сохраняем файл в спул
+    upload = spool_upload_sync(file, (".csv",), "Только CSV-файлы поддерживаются.")
+
     try:
+        # Программы, к которым привязывает кадровая справка, меняются: журнал
+        # справок сбрасывается и фиксируется вместе с импортом (или откатывается)
+        invalidate_applied(db, "teachers")
         # Импортируем данные в базу
-        import_education_programs(temp_file, db)
+        import_education_programs(upload.path, db)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         # Удаляем временный файл
-        os.remove(temp_file)
+        remove_spooled(upload.path)
     
-    return {"message": "Образовательные программы успешно загружены."}
\ No newline at end of file
+    return {"message": "Образовательные программы успешно загружены."}
+
+
+@router.get("/metrics")
+def pool_metrics():
+    """
+    Состояние пулов соединений: занятые и сверхлимитные соединения,
+    счётчики выдачи/возврата и время ожидания свободного соединения.
+    """
+    return {
+        "config": dict(POOL_SETTINGS, statement_timeout_ms=STATEMENT_TIMEOUT_MS),
+        "sync": pool_status(engine, engine_metrics),
+        "async": pool_status(async_engine.sync_engine, async_engine_metrics),
+    }
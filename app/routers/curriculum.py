@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
 from typing import Optional, List
 from app.models import Curriculum, EducationProgram, TaughtDiscipline, Teacher
-from app.database import get_db
-from app.schemas import CurriculumBase, EducationProgramBase
+from app.database import get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas import CurriculumBase, EducationProgramBase, EducationProgramOption
+from app.services.response_cache import cached_json
+from pydantic import TypeAdapter
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import selectinload
 from fastapi.responses import FileResponse
 import logging
+from app.logging_config import tracing
 from pathlib import Path
 import os
 
@@ -16,6 +20,9 @@ import os
 templates = Jinja2Templates(directory="app/templates")
 
 router = APIRouter(prefix="/curriculum", tags=["curriculum"])
+logger = logging.getLogger(__name__)
+
+_education_programs_adapter = TypeAdapter(List[EducationProgramBase])
 
 
 @router.get("/view", response_class=HTMLResponse)
@@ -61,41 +68,42 @@ def curriculum_view(request: Request):
 
 
 @router.get("/", response_model=List[CurriculumBase])
-def get_curriculum(
+async def get_curriculum(
     curriculum_id: Optional[int] = None,
     program_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Получить список дисциплин учебных планов с привязанными преподавателями.
     """
     # Загружаем дисциплины с привязанными преподавателями
-    query = db.query(Curriculum).options(
-        joinedload(Curriculum.teachers)  # Загружаем связанных преподавателей
+    query = select(Curriculum).options(
+        selectinload(Curriculum.teachers)  # Загружаем связанных преподавателей
     )
 
     # Фильтрация по curriculum_id
     if curriculum_id:
-        curriculum = query.filter(Curriculum.curriculum_id == curriculum_id).first()
+        curriculum = (
+            await db.execute(query.where(Curriculum.curriculum_id == curriculum_id))
+        ).unique().scalar_one_or_none()
         if not curriculum:
             raise HTTPException(status_code=404, detail="Учебный план не найден")
         return [curriculum]
 
     # Фильтрация по program_id
     if program_id:
-        query = query.filter(Curriculum.program_id == program_id)
-
-    # Отладка: вывод данных для проверки
-    results = query.all()
-    print("\nDEBUG INFO:")
-    for curriculum in results:
-        print(f"Discipline: {curriculum.discipline}")
-        if hasattr(curriculum, "teachers"):
-            print(f"  Teachers count: {len(curriculum.teachers)}")
-            for teacher in curriculum.teachers:
-                print(f"    - {teacher.full_name}")
-        else:
-            print("  No teachers attribute!")
+        query = query.where(Curriculum.program_id == program_id)
+
+    results = (await db.execute(query)).unique().scalars().all()
+
+    # Отладка: дисциплины и преподаватели (только при выборочной трассировке)
+    if tracing(logger):
+        for curriculum in results:
+            logger.debug(
+                "Discipline: %s, teachers: %s",
+                curriculum.discipline,
+                [teacher.full_name for teacher in curriculum.teachers],
+            )
 
     return results
 
@@ -127,33 +135,42 @@ def get_curriculum(
 
 
 @router.get("/EducationProgram", response_model=List[EducationProgramBase])
-def get_education_programs(db: Session = Depends(get_db)):
-    programs = (
-        db.query(EducationProgram)
-        .options(
-            selectinload(EducationProgram.curriculum).selectinload(Curriculum.teachers)
-        )
-        .all()
-    )
+async def get_education_programs(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Программы с дисциплинами и преподавателями. Ответ кэшируется до следующего
+    изменения данных; при совпадении If-None-Match возвращается 304 без запроса к БД
+    (сессия не подключается, пока не выполнен первый запрос).
+    """
 
-    # Отладочный вывод
-    for program in programs:
-        print(f"\nПрограмма: {program.program_name}")
-        for curr in program.curriculum:
-            print(f"  Дисциплина: {curr.discipline}")
-            print(f"  Преподаватели: {[t.full_name for t in curr.teachers]}")
+    async def build():
+        programs = (
+            (
+                await db.execute(
+                    select(EducationProgram).options(
+                        selectinload(EducationProgram.curriculum).selectinload(
+                            Curriculum.teachers
+                        )
+                    )
+                )
+            )
+            .unique()
+            .scalars()
+            .all()
+        )
+        return _education_programs_adapter.dump_json(programs)
 
-    return programs
+    return await cached_json(request, "education-programs", build)
 
 
 @router.get("/test_teachers/{curriculum_id}")
-def test_teachers(curriculum_id: int, db: Session = Depends(get_db)):
+async def test_teachers(curriculum_id: int, db: AsyncSession = Depends(get_async_db)):
     curriculum = (
-        db.query(Curriculum)
-        .options(selectinload(Curriculum.teachers))
-        .filter(Curriculum.curriculum_id == curriculum_id)
-        .first()
-    )
+        await db.execute(
+            select(Curriculum)
+            .options(selectinload(Curriculum.teachers))
+            .where(Curriculum.curriculum_id == curriculum_id)
+        )
+    ).unique().scalar_one_or_none()
 
     if not curriculum:
         raise HTTPException(404, "Discipline not found")
@@ -165,42 +182,44 @@ def test_teachers(curriculum_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/debug_teachers")
-def debug_teachers(db: Session = Depends(get_db)):
+async def debug_teachers(db: AsyncSession = Depends(get_async_db)):
     """
     Возвращает все связи преподавателей с дисциплинами, включая program_id.
     Полезно для отладки отсутствующих связей в основном API.
     """
-    # Получаем все связи через JOIN с дополнительной информацией
+    # Получаем все связи через JOIN одним запросом по колонкам
     query = (
-        db.query(
-            TaughtDiscipline,
-            Teacher,
-            Curriculum,
-            EducationProgram.program_id,  # Добавляем program_id
+        select(
+            EducationProgram.program_id,
+            EducationProgram.program_name,
+            Curriculum.discipline,
+            Curriculum.department,
+            TaughtDiscipline.curriculum_id,
+            Teacher.teacher_id,
+            Teacher.full_name,
+            Teacher.position,
         )
         .join(Teacher, TaughtDiscipline.teacher_id == Teacher.teacher_id)
         .join(Curriculum, TaughtDiscipline.curriculum_id == Curriculum.curriculum_id)
         .join(EducationProgram, Curriculum.program_id == EducationProgram.program_id)
     )
 
-    results = query.all()
+    results = await db.execute(query)
 
     return [
         {
-            "program_id": program_id,  # Новое поле
-            "program_name": (
-                curriculum.program.program_name if curriculum.program else None
-            ),
-            "discipline": curriculum.discipline,
-            "department": curriculum.department,
-            "curriculum_id": link.curriculum_id,
+            "program_id": row.program_id,
+            "program_name": row.program_name,
+            "discipline": row.discipline,
+            "department": row.department,
+            "curriculum_id": row.curriculum_id,
             "teacher": {
-                "teacher_id": teacher.teacher_id,
-                "full_name": teacher.full_name,
-                "position": teacher.position,
+                "teacher_id": row.teacher_id,
+                "full_name": row.full_name,
+                "position": row.position,
             },
         }
-        for link, teacher, curriculum, program_id in results
+        for row in results
     ]
 
 
@@ -225,7 +244,6 @@ def debug_teachers(db: Session = Depends(get_db)):
 
 #     return programs
 
-logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).resolve().parent
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
 
@@ -243,13 +261,20 @@ async def get_curriculum_page():
     return FileResponse(file_path)
 
 
-@router.get("/programs", response_model=List[EducationProgramBase])
-async def get_all_programs(db: Session = Depends(get_db)):
-    """Получение списка всех образовательных программ"""
+@router.get("/programs", response_model=List[EducationProgramOption])
+async def get_all_programs(db: AsyncSession = Depends(get_async_db)):
+    """Получение списка всех образовательных программ (только поля для выбора)"""
     try:
         programs = (
-            db.query(EducationProgram).order_by(EducationProgram.program_name).all()
-        )
+            await db.execute(
+                select(
+                    EducationProgram.program_id,
+                    EducationProgram.program_name,
+                    EducationProgram.short_name,
+                    EducationProgram.year,
+                ).order_by(EducationProgram.program_name)
+            )
+        ).all()
         logger.info(f"Found {len(programs)} programs")
         if not programs:
             logger.warning("No programs found in database")
@@ -259,23 +284,114 @@ async def get_all_programs(db: Session = Depends(get_db)):
         raise HTTPException(500, detail="Internal server error")
 
 
-@router.get("/program/{program_id}", response_model=List[CurriculumBase])
-async def get_curriculum_by_program(program_id: int, db: Session = Depends(get_db)):
-    """Получение учебного плана по ID программы"""
-    try:
-        curriculum = (
-            db.query(Curriculum)
-            .options(joinedload(Curriculum.teachers))
-            .order_by(Curriculum.semester, Curriculum.discipline)
-            .all()
+# Поля дисциплины, доступные в компактном ответе /program/{program_id}
+CURRICULUM_FIELDS = (
+    "curriculum_id",
+    "discipline",
+    "department",
+    "semester",
+    "lecture_hours",
+    "practice_hours",
+    "lab_hours",
+    "exam_hours",
+    "test_hours",
+    "course_project_hours",
+    "total_practice_hours",
+    "final_work_hours",
+    "program_id",
+)
+TEACHER_FIELDS = ("teacher_id", "full_name", "position")
+
+
+def _requested_fields(fields: Optional[str]) -> List[str]:
+    """Разбирает параметр fields=a,b,c; без параметра возвращаются все поля."""
+    if not fields:
+        return list(CURRICULUM_FIELDS) + ["teachers"]
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = set(requested) - set(CURRICULUM_FIELDS) - {"teachers"}
+    if unknown:
+        raise HTTPException(
+            400,
+            detail={
+                "message": f"Неизвестные поля: {', '.join(sorted(unknown))}",
+                "available_fields": list(CURRICULUM_FIELDS) + ["teachers"],
+            },
         )
+    return requested
 
-        if not curriculum:
-            logger.warning(f"No curriculum found for program_id: {program_id}")
-            raise HTTPException(404, detail="Учебный план не найден")
 
-        logger.info(f"Found {len(curriculum)} disciplines for program {program_id}")
-        return curriculum
+def curriculum_rows_query(program_id: int, fields: List[str]):
+    """
+    Один запрос по колонкам учебного плана программы (без ORM-объектов).
+    Преподаватели присоединяются LEFT JOIN, только если запрошено поле teachers.
+    """
+    curriculum_fields = [f for f in fields if f in CURRICULUM_FIELDS]
+    query = select(
+        Curriculum.curriculum_id.label("_curriculum_id"),
+        *(getattr(Curriculum, f) for f in curriculum_fields),
+    ).where(Curriculum.program_id == program_id)
+
+    if "teachers" in fields:
+        query = (
+            query.add_columns(
+                *(getattr(Teacher, f).label(f"teacher_{f}") for f in TEACHER_FIELDS)
+            )
+            .outerjoin(
+                TaughtDiscipline,
+                TaughtDiscipline.curriculum_id == Curriculum.curriculum_id,
+            )
+            .outerjoin(Teacher, Teacher.teacher_id == TaughtDiscipline.teacher_id)
+        )
+        order = (Teacher.full_name,)
+    else:
+        order = ()
+
+    return query.order_by(
+        Curriculum.semester, Curriculum.discipline, Curriculum.curriculum_id, *order
+    )
+
+
+def group_curriculum_rows(rows, fields: List[str]) -> List[dict]:
+    """Собирает плоские строки JOIN в список дисциплин с вложенными преподавателями."""
+    curriculum_fields = [f for f in fields if f in CURRICULUM_FIELDS]
+    with_teachers = "teachers" in fields
+    result = {}
+    for row in rows:
+        row = row._mapping
+        item = result.get(row["_curriculum_id"])
+        if item is None:
+            item = {f: row[f] for f in curriculum_fields}
+            if with_teachers:
+                item["teachers"] = []
+            result[row["_curriculum_id"]] = item
+        if with_teachers and row["teacher_teacher_id"] is not None:
+            item["teachers"].append({f: row[f"teacher_{f}"] for f in TEACHER_FIELDS})
+    return list(result.values())
+
+
+@router.get("/program/{program_id}")
+async def get_curriculum_by_program(
+    program_id: int,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Получение учебного плана по ID программы.
+    Параметр fields (через запятую) ограничивает набор полей ответа,
+    например fields=discipline,semester,teachers.
+    """
+    requested = _requested_fields(fields)
+    try:
+        curriculum = group_curriculum_rows(
+            await db.execute(curriculum_rows_query(program_id, requested)), requested
+        )
     except Exception as e:
         logger.error(f"Error fetching curriculum: {str(e)}")
         raise HTTPException(500, detail="Internal server error")
+
+    if not curriculum:
+        logger.warning(f"No curriculum found for program_id: {program_id}")
+        raise HTTPException(404, detail="Учебный план не найден")
+
+    logger.info(f"Found {len(curriculum)} disciplines for program {program_id}")
+    return curriculum
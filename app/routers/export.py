@@ -0,0 +1,46 @@
+import os
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+
+from app.services.snapshot_export import (
+    FORMATS,
+    available_formats,
+    default_format,
+    write_snapshot,
+)
+
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.get("/snapshot")
+def export_snapshot(
+    format: Optional[str] = Query(
+        None, description="parquet, arrow или csv (по умолчанию parquet, без pyarrow — csv)"
+    ),
+):
+    """
+    Снимок всех данных одним zip-архивом: по файлу на таблицу (программы,
+    учебные планы, преподаватели, связи, курсы) и manifest.json.
+    """
+    fmt = format or default_format()
+    if fmt not in FORMATS:
+        raise HTTPException(
+            status_code=400, detail=f"Неизвестный формат, допустимы: {', '.join(FORMATS)}"
+        )
+    if fmt not in available_formats():
+        raise HTTPException(
+            status_code=400, detail=f"Формат {fmt} недоступен: на сервере не установлен pyarrow"
+        )
+
+    path = write_snapshot(fmt)
+    return FileResponse(
+        path,
+        media_type="application/zip",
+        filename=f"kadrsp-{fmt}-{date.today().isoformat()}.zip",
+        background=BackgroundTask(os.remove, path),
+    )
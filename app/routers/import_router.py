@@ -1,60 +1,34 @@
-from fastapi import APIRouter, UploadFile, File, Depends, BackgroundTasks, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from app.database import get_db
-from app.services.import_utils import parse_docx, import_teachers_with_programs, parse_excel, import_curriculum
-import os
-import uuid
-import zipfile
-from io import BytesIO 
+from app.services.import_jobs import ARCHIVE_KINDS, submit_archive, submit_import, get_job
+from app.services.uploads import (
+    remove_spooled,
+    spool_upload,
+    spool_upload_sync,
+    spool_zip_members,
+)
+import logging
 
 router = APIRouter(prefix="/import", tags=["import"])
+logger = logging.getLogger(__name__)
 
 
-def process_import(file_path: str, db: Session):
-    try:
-        # Парсим данные из файла
-        teachers_data = parse_docx(file_path)
-        
-        # Импортируем преподавателей с привязкой к программам
-        import_teachers_with_programs(db, teachers_data)
-    except IntegrityError as e:
-        db.rollback()
-        print(f"Ошибка уникальности: {e}")
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        # Удаляем временный файл
-        os.remove(file_path)
-
-
-@router.post("/upload-curriculum")
-async def upload_curriculum_endpoint(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
-):
+@router.post("/upload-curriculum", status_code=202)
+async def upload_curriculum_endpoint(file: UploadFile = File(...)):
+    """
+    Принимает учебный план и ставит его в очередь импорта.
+    Ход импорта отдаётся по /import/jobs/{job_id}.
+    """
+    # Сохранение файла в спул порциями, с ограничением размера
+    upload = await spool_upload(
+        file, (".xlsx", ".xls"), "Поддерживаются только файлы Excel (.xlsx, .xls)"
+    )
     try:
-        # Сохранение файла
-        temp_path = f"temp_{uuid.uuid4()}.xlsx"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-
-        # Синхронный вызов импорта
-        result = import_curriculum(
-            file_path=temp_path,
-            filename=file.filename,
-            db=db,
-            background_tasks=background_tasks
-        )
-
-        return JSONResponse(content=result, status_code=200)
-    
+        job = submit_import("curriculum", upload.path, upload.filename, upload.sha256)
     except Exception as e:
+        remove_spooled(upload.path)
         raise HTTPException(500, detail=str(e))
+    return JSONResponse(content=job, status_code=202)
 
 
 # @router.post("/upload-curriculum")
@@ -81,29 +55,59 @@ async def upload_curriculum_endpoint(
 
 
 
-@router.post("/teachers/import")
-def import_teachers(file: UploadFile = File(...), db: Session = Depends(get_db)):
+@router.post("/teachers/import", status_code=202)
+def import_teachers(file: UploadFile = File(...)):
     """
-    Импортирует преподавателей из загруженного файла.
+    Принимает файл преподавателей и ставит его в очередь импорта.
+    Ход импорта отдаётся по /import/jobs/{job_id}.
     """
-    if not file.filename.endswith(".docx"):
-        raise HTTPException(status_code=400, detail="Поддерживаются только файлы .docx")
+    # Сохраняем файл в спул
+    upload = spool_upload_sync(file, (".docx",), "Поддерживаются только файлы .docx")
+    try:
+        job = submit_import("teachers", upload.path, upload.filename, upload.sha256)
+    except Exception:
+        remove_spooled(upload.path)
+        raise
+    return JSONResponse(content=job, status_code=202)
 
-    # Сохраняем временный файл
-    temp_file = f"temp_{file.filename}"
-    with open(temp_file, "wb") as buffer:
-        buffer.write(file.file.read())
 
+@router.post("/archive", status_code=202)
+def import_archive(file: UploadFile = File(...)):
+    """
+    Принимает zip-архив с учебными планами (.xlsx, .xls) и кадровыми справками
+    (.docx) и ставит их импорт в очередь одним заданием. Файлы разбираются
+    параллельно; планы одной программы записываются одной транзакцией, затем
+    импортируются справки. Исход и время по каждому файлу — в поле files
+    задания /import/jobs/{job_id}.
+    """
+    upload = spool_upload_sync(file, (".zip",), "Поддерживаются только zip-архивы")
     try:
-        # Парсим данные из файла
-        teachers_data = parse_docx(temp_file)
-        import_teachers_with_programs(db, teachers_data)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Ошибка импорта преподавателей: {str(e)}")
+        members, skipped = spool_zip_members(upload.path, tuple(ARCHIVE_KINDS))
     finally:
-        os.remove(temp_file)
+        remove_spooled(upload.path)
+
+    if not members:
+        raise HTTPException(
+            status_code=400, detail="В архиве нет файлов .xlsx, .xls или .docx"
+        )
+    try:
+        job = submit_archive(upload.filename, members, skipped)
+    except Exception:
+        for member in members:
+            remove_spooled(member.path)
+        raise
+    return JSONResponse(content=job, status_code=202)
+
 
-    return {"message": "Преподаватели успешно импортированы"}
+@router.get("/jobs/{job_id}")
+def get_import_job(job_id: str):
+    """
+    Состояние задания импорта: фаза, число разобранных и записанных строк, ошибки.
+    """
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Задание импорта не найдено")
+    return job
 
 # @router.post("/teachers")
 # async def import_teachers_from_docx(
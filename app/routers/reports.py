@@ -0,0 +1,167 @@
+import json
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+
+from app.database import get_async_db
+from app.models import DepartmentLoad, EducationProgram, ProgramLoad, Teacher, TeacherLoad
+from app.services.excel_reports import write_department_report, write_program_report
+from app.services.response_cache import cached_json
+from app.services.teaching_load import TOTAL_FIELDS
+
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+def _totals(load) -> dict:
+    data = {field: getattr(load, field) for field in TOTAL_FIELDS}
+    data["updated_at"] = load.updated_at.isoformat() if load.updated_at else None
+    return data
+
+
+def _program_row(load, program_name, short_name) -> dict:
+    return {
+        "program_id": load.program_id,
+        "program_name": program_name,
+        "short_name": short_name,
+        **_totals(load),
+    }
+
+
+def _teacher_row(load, full_name) -> dict:
+    return {"teacher_id": load.teacher_id, "full_name": full_name, **_totals(load)}
+
+
+def _department_row(load) -> dict:
+    return {"department": load.department, **_totals(load)}
+
+
+def _dump(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+_PROGRAMS_QUERY = select(
+    ProgramLoad, EducationProgram.program_name, EducationProgram.short_name
+).join(EducationProgram, EducationProgram.program_id == ProgramLoad.program_id)
+_TEACHERS_QUERY = select(TeacherLoad, Teacher.full_name).join(
+    Teacher, Teacher.teacher_id == TeacherLoad.teacher_id
+)
+
+
+@router.get("/load")
+async def load_summary(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Общая нагрузка по всем учебным планам (сумма итогов кафедр) и число
+    программ, кафедр и преподавателей с нагрузкой.
+    """
+
+    async def build():
+        columns = [
+            func.coalesce(func.sum(getattr(DepartmentLoad, field)), 0)
+            for field in TOTAL_FIELDS
+        ]
+        totals = (await db.execute(select(*columns))).one()
+        counts = {}
+        for name, model in (
+            ("programs", ProgramLoad),
+            ("departments", DepartmentLoad),
+            ("teachers", TeacherLoad),
+        ):
+            counts[name] = await db.scalar(select(func.count()).select_from(model))
+        return _dump({**counts, "totals": dict(zip(TOTAL_FIELDS, totals))})
+
+    return await cached_json(request, "load-summary", build)
+
+
+@router.get("/load/programs")
+async def load_by_programs(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Нагрузка по образовательным программам, по убыванию общего числа часов."""
+
+    async def build():
+        rows = await db.execute(_PROGRAMS_QUERY.order_by(ProgramLoad.total_hours.desc()))
+        return _dump([_program_row(*row) for row in rows])
+
+    return await cached_json(request, "load-programs", build)
+
+
+@router.get("/load/programs/{program_id}")
+async def load_by_program(program_id: int, db: AsyncSession = Depends(get_async_db)):
+    row = (await db.execute(_PROGRAMS_QUERY.where(ProgramLoad.program_id == program_id))).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Нет данных о нагрузке программы")
+    return _program_row(*row)
+
+
+@router.get("/load/departments")
+async def load_by_departments(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Нагрузка по кафедрам, по убыванию общего числа часов."""
+
+    async def build():
+        rows = await db.scalars(
+            select(DepartmentLoad).order_by(DepartmentLoad.total_hours.desc())
+        )
+        return _dump([_department_row(load) for load in rows])
+
+    return await cached_json(request, "load-departments", build)
+
+
+@router.get("/load/departments/{department:path}")
+async def load_by_department(department: str, db: AsyncSession = Depends(get_async_db)):
+    load = await db.get(DepartmentLoad, department)
+    if not load:
+        raise HTTPException(status_code=404, detail="Нет данных о нагрузке кафедры")
+    return _department_row(load)
+
+
+@router.get("/load/teachers")
+async def load_by_teachers(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Нагрузка преподавателей, по убыванию общего числа часов."""
+
+    async def build():
+        rows = await db.execute(_TEACHERS_QUERY.order_by(TeacherLoad.total_hours.desc()))
+        return _dump([_teacher_row(*row) for row in rows])
+
+    return await cached_json(request, "load-teachers", build)
+
+
+@router.get("/load/teachers/{teacher_id}")
+async def load_by_teacher(teacher_id: int, db: AsyncSession = Depends(get_async_db)):
+    row = (await db.execute(_TEACHERS_QUERY.where(TeacherLoad.teacher_id == teacher_id))).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Нет данных о нагрузке преподавателя")
+    return _teacher_row(*row)
+
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _xlsx_response(path: str, filename: str) -> FileResponse:
+    return FileResponse(
+        path,
+        media_type=XLSX_MEDIA_TYPE,
+        filename=filename,
+        background=BackgroundTask(os.remove, path),
+    )
+
+
+@router.get("/curriculum/{program_id}.xlsx")
+def curriculum_report(program_id: int):
+    """Учебный план программы в Excel: дисциплины, часы и преподаватели."""
+    report = write_program_report(program_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Программа не найдена")
+    path, short_name = report
+    return _xlsx_response(path, f"{short_name}.xlsx")
+
+
+@router.get("/curriculum/department/{department:path}.xlsx")
+def department_report(department: str):
+    """Дисциплины кафедры во всех программах в Excel, с часами и преподавателями."""
+    path = write_department_report(department)
+    if path is None:
+        raise HTTPException(status_code=404, detail="У кафедры нет дисциплин")
+    return _xlsx_response(path, f"{department.replace('/', '_')}.xlsx")
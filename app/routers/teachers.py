@@ -1,19 +1,27 @@
-from typing import List
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from app.models import Teacher, Qualification, Curriculum
-from app.services.import_utils import (
-    parse_excel,
-    import_curriculum,
-    assign_teacher_to_program,
-    import_teachers_with_programs,
-    parse_docx,
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi.responses import JSONResponse
+from app.models import (
+    Teacher,
+    Qualification,
+    Curriculum,
+    EducationProgram,
+    TaughtDiscipline,
+    teacher_program_association,
 )
+from app.services.import_utils import assign_teacher_to_program
 from app.schemas import TeacherCreate, TeacherResponse
-from app.database import get_db
+from app.database import get_db, get_async_db
+from app.services.import_jobs import submit_import
+from app.services.import_ledger import invalidate_applied
+from app.services.response_cache import bump_data_version
+from app.services.uploads import spool_upload_sync, remove_spooled
+from sqlalchemy import String, cast, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from typing import Optional
-import os, docx
+import base64
+import json
 
 
 router = APIRouter(prefix="/api", tags=["teachers"])
@@ -41,43 +49,183 @@ def create_teacher(teacher: TeacherCreate, db: Session = Depends(get_db)):
         new_teacher.qualifications.append(qualification)
 
     db.add(new_teacher)
+    # Прежние кадровые справки больше не совпадают с данными в БД
+    invalidate_applied(db, "teachers")
     db.commit()
+    bump_data_version()
     db.refresh(new_teacher)
     return new_teacher
 
 
+# Сортировки списка преподавателей: ключ и признак числового значения.
+# Пустой стаж сортируется как 0, второй ключ — teacher_id (уникален)
+TEACHER_SORTS = {
+    "full_name": (Teacher.full_name, False),
+    "position": (Teacher.position, False),
+    "total_experience": (func.coalesce(Teacher.total_experience, 0), True),
+    "teaching_experience": (func.coalesce(Teacher.teaching_experience, 0), True),
+    "professional_experience": (func.coalesce(Teacher.professional_experience, 0), True),
+}
+# Разделители полей и элементов в агрегированном списке программ
+_FIELD_SEP, _ITEM_SEP = "\x1f", "\x1e"
+
+
+def _encode_cursor(value, teacher_id: int) -> str:
+    raw = json.dumps([value, teacher_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, numeric: bool):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, teacher_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Некорректный курсор страницы")
+    expected = int if numeric else str
+    if type(value) is not expected or type(teacher_id) is not int:
+        raise HTTPException(status_code=400, detail="Курсор не соответствует сортировке")
+    return value, teacher_id
+
+
+def _teacher_page_query():
+    """Проекция строки списка: поля преподавателя и агрегированные связи."""
+    disciplines = (
+        select(func.aggregate_strings(Curriculum.discipline, ", "))
+        .select_from(TaughtDiscipline)
+        .join(Curriculum, Curriculum.curriculum_id == TaughtDiscipline.curriculum_id)
+        .where(TaughtDiscipline.teacher_id == Teacher.teacher_id)
+        .scalar_subquery()
+    )
+    qualifications = (
+        select(func.aggregate_strings(Qualification.program_name, ", "))
+        .where(Qualification.teacher_id == Teacher.teacher_id)
+        .scalar_subquery()
+    )
+    programs = (
+        select(
+            func.aggregate_strings(
+                cast(EducationProgram.program_id, String)
+                + _FIELD_SEP
+                + EducationProgram.program_name,
+                _ITEM_SEP,
+            )
+        )
+        .select_from(teacher_program_association)
+        .join(
+            EducationProgram,
+            EducationProgram.program_id == teacher_program_association.c.program_id,
+        )
+        .where(teacher_program_association.c.teacher_id == Teacher.teacher_id)
+        .scalar_subquery()
+    )
+    return select(
+        Teacher.teacher_id,
+        Teacher.full_name,
+        Teacher.position,
+        Teacher.total_experience,
+        Teacher.teaching_experience,
+        Teacher.professional_experience,
+        Teacher.education_level,
+        Teacher.academic_degree,
+        Teacher.academic_title,
+        disciplines.label("disciplines_raw"),
+        qualifications.label("qualifications_raw"),
+        programs.label("programs"),
+    )
+
+
+def _programs_list(raw: Optional[str]) -> list:
+    programs = []
+    for item in (raw or "").split(_ITEM_SEP):
+        if item:
+            program_id, program_name = item.split(_FIELD_SEP, 1)
+            programs.append({"program_id": int(program_id), "program_name": program_name})
+    return sorted(programs, key=lambda p: p["program_id"])
+
+
 @router.get("/teachers")
-def get_teachers(db: Session = Depends(get_db)):
-    teachers = db.query(Teacher).options(joinedload(Teacher.programs)).all()
-    return [
-        {
-            "teacher_id": teacher.teacher_id,
-            "full_name": teacher.full_name,
-            "position": teacher.position,
-            "total_experience": teacher.total_experience,
-            "teaching_experience": teacher.teaching_experience,
-            "professional_experience": teacher.professional_experience,
-            "education_level": teacher.education_level,
-            "academic_degree": teacher.academic_degree,
-            "academic_title": teacher.academic_title,
-            "disciplines_raw": ", ".join(
-                [d.discipline for d in teacher.disciplines]
-            ),  # Исправлено
-            "qualifications_raw": ", ".join(
-                [q.program_name for q in teacher.qualifications]
-            ),
-            "programs": [
-                {"program_id": p.program_id, "program_name": p.program_name}
-                for p in teacher.programs
-            ],  # Добавлено program_id
-        }
-        for teacher in teachers
-    ]
+async def get_teachers(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: str = "full_name",
+    program_id: Optional[int] = None,
+    department: Optional[str] = None,
+    position: Optional[str] = None,
+    degree: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Страница списка преподавателей (keyset-пагинация).
+    sort — поле из TEACHER_SORTS, с "-" — по убыванию. Следующая страница
+    запрашивается с cursor=next_cursor. Фильтры: program_id и department —
+    точное совпадение, position и degree — подстрока без учёта регистра.
+    Страница получается одним запросом.
+    """
+    descending = sort.startswith("-")
+    sort_name = sort.lstrip("-")
+    if sort_name not in TEACHER_SORTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Сортировка возможна по полям: {', '.join(TEACHER_SORTS)}",
+        )
+    sort_key, numeric = TEACHER_SORTS[sort_name]
+
+    query = _teacher_page_query().add_columns(sort_key.label("sort_value"))
+    if program_id is not None:
+        query = query.where(
+            select(teacher_program_association.c.teacher_id)
+            .where(
+                teacher_program_association.c.teacher_id == Teacher.teacher_id,
+                teacher_program_association.c.program_id == program_id,
+            )
+            .exists()
+        )
+    if department:
+        query = query.where(
+            select(TaughtDiscipline.teacher_id)
+            .join(Curriculum, Curriculum.curriculum_id == TaughtDiscipline.curriculum_id)
+            .where(
+                TaughtDiscipline.teacher_id == Teacher.teacher_id,
+                Curriculum.department == department,
+            )
+            .exists()
+        )
+    if position:
+        query = query.where(Teacher.position.ilike(f"%{position}%"))
+    if degree:
+        query = query.where(Teacher.academic_degree.ilike(f"%{degree}%"))
+
+    key = tuple_(sort_key, Teacher.teacher_id)
+    if cursor:
+        after = tuple_(*_decode_cursor(cursor, numeric))
+        query = query.where(key < after if descending else key > after)
+    if descending:
+        query = query.order_by(sort_key.desc(), Teacher.teacher_id.desc())
+    else:
+        query = query.order_by(sort_key, Teacher.teacher_id)
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].sort_value, rows[-1].teacher_id)
+
+    items = []
+    for row in rows:
+        item = row._asdict()
+        del item["sort_value"]
+        item["disciplines_raw"] = item["disciplines_raw"] or ""
+        item["qualifications_raw"] = item["qualifications_raw"] or ""
+        item["programs"] = _programs_list(item["programs"])
+        items.append(item)
+    return {"items": items, "next_cursor": next_cursor, "sort": sort, "limit": limit}
 
 
 @router.get("/teachers/{teacher_id}", response_model=TeacherResponse)
-def get_teacher(teacher_id: int, db: Session = Depends(get_db)):
-    teacher = db.query(Teacher).filter(Teacher.teacher_id == teacher_id).first()
+async def get_teacher(teacher_id: int, db: AsyncSession = Depends(get_async_db)):
+    teacher = (
+        await db.execute(select(Teacher).where(Teacher.teacher_id == teacher_id))
+    ).unique().scalar_one_or_none()
     if not teacher:
         raise HTTPException(status_code=404, detail="Преподаватель не найден")
     return teacher
@@ -91,6 +239,8 @@ def assign_program_to_teacher(
     Привязывает преподавателя к образовательной программе.
     """
     try:
+        # Фиксируется вместе с привязкой; если привязка уже была, откатывается
+        invalidate_applied(db, "teachers")
         assign_teacher_to_program(db, teacher_id, program_id)
         return {
             "message": f"Преподаватель с ID {teacher_id} привязан к программе с ID {program_id}"
@@ -101,28 +251,18 @@ def assign_program_to_teacher(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/teachers/import")
-def import_teachers(file: UploadFile = File(...), db: Session = Depends(get_db)):
+@router.post("/teachers/import", status_code=202)
+def import_teachers(file: UploadFile = File(...)):
     """
-    Импортирует преподавателей из загруженного файла и привязывает их к образовательным программам.
+    Принимает файл преподавателей и ставит его в очередь импорта
+    (то же задание, что и /import/teachers/import).
+    Ход импорта отдаётся по /import/jobs/{job_id}.
     """
-    if not file.filename.endswith(".docx"):
-        raise HTTPException(status_code=400, detail="Поддерживаются только файлы .docx")
-
-    # Сохраняем временный файл
-    temp_file = f"temp_{file.filename}"
-    with open(temp_file, "wb") as buffer:
-        buffer.write(file.file.read())
-
+    # Сохраняем файл в спул
+    upload = spool_upload_sync(file, (".docx",), "Поддерживаются только файлы .docx")
     try:
-        # Парсим данные из файла
-        teachers_data = parse_docx(temp_file)  # Функция для парсинга docx
-        import_teachers_with_programs(db, teachers_data)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Ошибка импорта преподавателей: {str(e)}"
-        )
-    finally:
-        os.remove(temp_file)
-
-    return {"message": "Преподаватели успешно импортированы"}
+        job = submit_import("teachers", upload.path, upload.filename, upload.sha256)
+    except Exception:
+        remove_spooled(upload.path)
+        raise
+    return JSONResponse(content=job, status_code=202)
@@ -70,3 +70,14 @@ class EducationProgramBase(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class EducationProgramOption(BaseModel):
+    """Программа в выпадающем списке: без учебного плана и преподавателей."""
+    program_id: int
+    program_name: str
+    short_name: Optional[str]
+    year: int
+
+    class Config:
+        from_attributes = True
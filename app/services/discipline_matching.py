@@ -0,0 +1,168 @@
+"""
+Сопоставление названий дисциплин из кадровых документов с дисциплинами учебных планов.
+
+В PostgreSQL поиск выполняется одним запросом по GIN-индексу pg_trgm
+(ix_curriculum_discipline_trgm). Для тестов и других СУБД есть реализация в памяти
+с теми же правилами: кандидат подходит, если его триграммное сходство с искомым
+названием не ниже порога или искомое название входит в него подстрокой
+(как прежний ilike('%name%')). Лучший кандидат выбирается в первую очередь среди
+дисциплин целевых программ, затем по убыванию сходства и по curriculum_id.
+"""
+import json
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models import Curriculum
+
+
+# Порог по умолчанию для pg_trgm (pg_trgm.similarity_threshold)
+SIMILARITY_THRESHOLD = 0.3
+
+# Запрос: (название, id программ преподавателя или None)
+MatchRequest = Tuple[str, Optional[Sequence[int]]]
+
+
+def _words(value: str) -> List[str]:
+    words, word = [], []
+    for char in value.lower() + " ":
+        if char.isalnum():
+            word.append(char)
+        elif word:
+            words.append("".join(word))
+            word = []
+    return words
+
+
+def trigrams(value: str) -> set:
+    """Множество триграмм строки по правилам pg_trgm."""
+    result = set()
+    for word in _words(value):
+        padded = "  " + word + " "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def similarity(a: str, b: str) -> float:
+    """Триграммное сходство, как функция similarity() из pg_trgm."""
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    common = len(ta & tb)
+    return common / (len(ta) + len(tb) - common)
+
+
+class InMemoryDisciplineMatcher:
+    """Сопоставление в памяти по инвертированному индексу триграмм."""
+
+    def __init__(self, rows: Iterable[Tuple[int, str, Optional[int]]], threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._rows = []  # (curriculum_id, discipline в нижнем регистре, trigrams, program_id)
+        self._by_trigram = defaultdict(set)
+        self.add_many(rows)
+
+    def add_many(self, rows: Iterable[Tuple[int, str, Optional[int]]]):
+        for curriculum_id, discipline, program_id in rows:
+            grams = trigrams(discipline)
+            position = len(self._rows)
+            self._rows.append((curriculum_id, discipline.lower(), grams, program_id))
+            for gram in grams:
+                self._by_trigram[gram].add(position)
+
+    def _best(self, name: str, programs: Optional[Sequence[int]]) -> Optional[int]:
+        lowered = name.lower()
+        grams = trigrams(name)
+        overlap = defaultdict(int)
+        for gram in grams:
+            for position in self._by_trigram.get(gram, ()):
+                overlap[position] += 1
+        # Вхождение подстрокой даёт общую триграмму, если в названии есть слово
+        # хотя бы из трёх символов; короткие названия проверяем полным проходом
+        full_scan = max(map(len, _words(name)), default=0) < 3
+        candidates = range(len(self._rows)) if full_scan else overlap
+
+        targets = set(programs or ())
+        best_key, best_id = None, None
+        for position in candidates:
+            curriculum_id, discipline, row_grams, program_id = self._rows[position]
+            common = overlap.get(position, 0)
+            union = len(grams) + len(row_grams) - common
+            score = common / union if union else 0.0
+            if score < self.threshold and lowered not in discipline:
+                continue
+            key = (program_id in targets, score, -curriculum_id)
+            if best_key is None or key > best_key:
+                best_key, best_id = key, curriculum_id
+        return best_id
+
+    def match_many(self, requests: List[MatchRequest]) -> List[Optional[int]]:
+        return [self._best(name, programs) for name, programs in requests]
+
+    def match(self, name: str, programs: Optional[Sequence[int]] = None) -> Optional[int]:
+        return self._best(name, programs)
+
+
+_PG_MATCH_SQL = text(
+    """
+    SELECT q.idx, m.curriculum_id
+    FROM jsonb_to_recordset(CAST(:payload AS jsonb))
+        AS q(idx integer, name text, pattern text, programs integer[])
+    LEFT JOIN LATERAL (
+        SELECT c.curriculum_id
+        FROM curriculum c
+        WHERE c.discipline % q.name OR c.discipline ILIKE q.pattern
+        ORDER BY
+            coalesce(c.program_id = ANY(q.programs), false) DESC,
+            similarity(c.discipline, q.name) DESC,
+            c.curriculum_id
+        LIMIT 1
+    ) m ON true
+    """
+)
+
+
+def _like_pattern(name: str) -> str:
+    escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class PgTrgmDisciplineMatcher:
+    """Сопоставление средствами pg_trgm: все названия файла — одним запросом."""
+
+    def __init__(self, db: Session, threshold: float = SIMILARITY_THRESHOLD):
+        self.db = db
+        self.threshold = threshold
+
+    def match_many(self, requests: List[MatchRequest]) -> List[Optional[int]]:
+        if not requests:
+            return []
+        payload = [
+            {
+                "idx": idx,
+                "name": name,
+                "pattern": _like_pattern(name),
+                "programs": "{" + ",".join(str(p) for p in programs) + "}" if programs else None,
+            }
+            for idx, (name, programs) in enumerate(requests)
+        ]
+        self.db.execute(
+            text("SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"),
+            {"threshold": str(self.threshold)},
+        )
+        rows = self.db.execute(_PG_MATCH_SQL, {"payload": json.dumps(payload, ensure_ascii=False)})
+        result: Dict[int, Optional[int]] = dict(rows.fetchall())
+        return [result.get(idx) for idx in range(len(requests))]
+
+    def match(self, name: str, programs: Optional[Sequence[int]] = None) -> Optional[int]:
+        return self.match_many([(name, programs)])[0]
+
+
+def get_discipline_matcher(db: Session):
+    """Сопоставитель для сессии: pg_trgm в PostgreSQL, иначе — индекс в памяти."""
+    if db.get_bind().dialect.name == "postgresql":
+        return PgTrgmDisciplineMatcher(db)
+    return InMemoryDisciplineMatcher(
+        db.query(Curriculum.curriculum_id, Curriculum.discipline, Curriculum.program_id)
+    )
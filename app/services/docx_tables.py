@@ -0,0 +1,172 @@
+"""
+Чтение таблиц из .docx без построения объектной модели документа.
+
+word/document.xml читается из архива один раз потоковым разбором lxml
+(iterparse); строки таблиц отдаются по мере чтения, обработанные элементы
+сразу удаляются из дерева, поэтому память не растёт с размером таблицы.
+
+Значения ячеек совпадают с python-docx (row.cells / cell.text): абзацы
+соединяются "\\n", w:tab — "\\t", ячейка с gridSpan повторяется для каждой
+занятой колонки, продолжение вертикального объединения (vMerge) получает
+текст ячейки выше. Учитываются только таблицы верхнего уровня (doc.tables).
+"""
+import zipfile
+from typing import Iterator, List, Tuple
+
+from lxml import etree
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_W = "{%s}" % W_NS
+
+_BODY = _W + "body"
+_TBL = _W + "tbl"
+_TR = _W + "tr"
+_TC = _W + "tc"
+_P = _W + "p"
+_R = _W + "r"
+_HYPERLINK = _W + "hyperlink"
+_TC_PR = _W + "tcPr"
+_GRID_SPAN = _W + "gridSpan"
+_V_MERGE = _W + "vMerge"
+_VAL = _W + "val"
+
+# Текстовые элементы run, как в python-docx (CT_R.text)
+_RUN_TEXT = {
+    _W + "t": None,
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+_BR = _W + "br"
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag in _RUN_TEXT:
+            text = _RUN_TEXT[tag]
+            parts.append((child.text or "") if text is None else text)
+        elif tag == _BR and child.get(_W + "type", "textWrapping") == "textWrapping":
+            parts.append("\n")
+    return "".join(parts)
+
+
+def _paragraph_text(paragraph) -> str:
+    parts = []
+    for child in paragraph:
+        if child.tag == _R:
+            parts.append(_run_text(child))
+        elif child.tag == _HYPERLINK:
+            parts.extend(_run_text(run) for run in child if run.tag == _R)
+    return "".join(parts)
+
+
+def cell_text(tc) -> str:
+    """Текст ячейки w:tc: абзацы верхнего уровня через перевод строки."""
+    return "\n".join(_paragraph_text(p) for p in tc if p.tag == _P)
+
+
+def _tc_properties(tc) -> Tuple[int, bool]:
+    """(gridSpan, является ли ячейка продолжением вертикального объединения)."""
+    span, continued = 1, False
+    for tc_pr in tc:
+        if tc_pr.tag != _TC_PR:
+            continue
+        for prop in tc_pr:
+            if prop.tag == _GRID_SPAN:
+                span = int(prop.get(_VAL, "1"))
+            elif prop.tag == _V_MERGE:
+                continued = prop.get(_VAL, "continue") == "continue"
+        break
+    return span, continued
+
+
+def _grid_before(tr) -> int:
+    tr_pr = tr.find(_W + "trPr")
+    if tr_pr is None:
+        return 0
+    before = tr_pr.find(_W + "gridBefore")
+    return int(before.get(_VAL, "0")) if before is not None else 0
+
+
+def _row_cells(tr, above: dict) -> Tuple[List[str], dict]:
+    """
+    Значения ячеек строки и карта "смещение в сетке -> (span, текст)" для
+    следующей строки (по ней разрешаются продолжения vMerge).
+    """
+    cells = []
+    grid = {}
+    offset = _grid_before(tr)
+    for tc in tr:
+        if tc.tag != _TC:
+            continue
+        span, continued = _tc_properties(tc)
+        if continued and offset in above:
+            span, text = above[offset]
+        else:
+            text = cell_text(tc)
+        grid[offset] = (span, text)
+        cells.extend([text] * span)
+        offset += span
+    return cells, grid
+
+
+def _discard(element):
+    """Освобождает обработанный элемент и всё, что было перед ним."""
+    element.clear()
+    while element.getprevious() is not None:
+        del element.getparent()[0]
+
+
+def iter_docx_rows(file_path) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Лениво отдаёт (номер таблицы, значения ячеек строки) для всех таблиц
+    верхнего уровня документа. file_path — путь или файловый объект.
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml:
+        table_index = -1
+        depth = 0
+        above = {}
+        # События только для таблиц и строк: остальные элементы обходятся в C
+        events = etree.iterparse(
+            xml, events=("start", "end"), tag=(_TBL, _TR), huge_tree=True
+        )
+        for event, element in events:
+            if event == "start":
+                if element.tag == _TBL:
+                    parent = element.getparent()
+                    if depth or (parent is not None and parent.tag == _BODY):
+                        depth += 1
+                        if depth == 1:
+                            table_index += 1
+                            above = {}
+                continue
+
+            if not depth:
+                continue
+            if element.tag == _TR and depth == 1:
+                cells, above = _row_cells(element, above)
+                yield table_index, cells
+                _discard(element)
+            elif element.tag == _TBL:
+                depth -= 1
+                if not depth:
+                    # Вместе с таблицей удаляется и предшествующий ей текст
+                    _discard(element)
+
+
+def iter_table_rows(file_path, table_index: int = 0) -> Iterator[List[str]]:
+    """Лениво отдаёт строки таблицы с номером table_index (как doc.tables[i].rows)."""
+    found = False
+    for index, cells in iter_docx_rows(file_path):
+        if index < table_index:
+            continue
+        if index > table_index:
+            break
+        found = True
+        yield cells
+    if not found:
+        raise IndexError(f"В документе нет таблицы с номером {table_index}")
@@ -0,0 +1,172 @@
+"""
+Отчёты по учебным планам в Excel: дисциплины программы или кафедры с часами
+и преподавателями.
+
+Строки берутся одним запросом (Curriculum + TaughtDiscipline + Teacher) через
+курсор на стороне сервера и сразу пишутся в книгу openpyxl в режиме write-only,
+без ORM-объектов: память не зависит от размера отчёта. Преподаватели одной
+дисциплины идут подряд (запрос упорядочен по дисциплине) и собираются в одну
+ячейку. Файл создаётся в спуле загрузок и удаляется после отдачи.
+"""
+import os
+import tempfile
+from itertools import groupby
+from typing import Optional
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from sqlalchemy import select
+
+from app.database import engine
+from app.models import Curriculum, EducationProgram, TaughtDiscipline, Teacher
+from app.services.teaching_load import HOUR_FIELDS
+from app.services.uploads import SPOOL_DIR
+
+
+REPORT_BATCH_SIZE = 2000
+
+HOUR_TITLES = {
+    "lecture_hours": "Лекции",
+    "practice_hours": "Практические",
+    "lab_hours": "Лабораторные",
+    "exam_hours": "Экзамен",
+    "test_hours": "Зачёт",
+    "course_project_hours": "Курсовой проект",
+    "total_practice_hours": "Практика",
+    "final_work_hours": "ВКР",
+}
+
+_BOLD = Font(bold=True)
+
+
+def _report_query():
+    return (
+        select(
+            Curriculum.curriculum_id,
+            EducationProgram.short_name,
+            Curriculum.semester,
+            Curriculum.discipline,
+            Curriculum.department,
+            *(getattr(Curriculum, field) for field in HOUR_FIELDS),
+            Teacher.full_name,
+        )
+        .select_from(Curriculum)
+        .outerjoin(EducationProgram, EducationProgram.program_id == Curriculum.program_id)
+        .outerjoin(TaughtDiscipline, TaughtDiscipline.curriculum_id == Curriculum.curriculum_id)
+        .outerjoin(Teacher, Teacher.teacher_id == TaughtDiscipline.teacher_id)
+    )
+
+
+def _bold_row(sheet, values):
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.font = _BOLD
+        cells.append(cell)
+    return cells
+
+
+def _write_workbook(
+    connection, query, title: str, sheet_title: str, with_program: bool
+) -> str:
+    """Пишет отчёт по строкам query в xlsx-файл спула и возвращает путь к нему."""
+    workbook = Workbook(write_only=True)
+    # Имя листа Excel: до 31 символа, без []:*?/\
+    sheet_title = "".join(c for c in sheet_title if c not in "[]:*?/\\")[:31]
+    sheet = workbook.create_sheet(title=sheet_title or "Отчёт")
+
+    headers = ["Семестр", "Дисциплина", "Кафедра"]
+    widths = [9, 60, 40]
+    if with_program:
+        headers.insert(0, "Программа")
+        widths.insert(0, 20)
+    headers += [HOUR_TITLES[field] for field in HOUR_FIELDS] + ["Всего", "Преподаватели"]
+    widths += [12] * (len(HOUR_FIELDS) + 1) + [60]
+    for index, width in enumerate(widths, start=1):
+        sheet.column_dimensions[get_column_letter(index)].width = width
+    sheet.freeze_panes = "A4"
+
+    sheet.append(_bold_row(sheet, [title]))
+    sheet.append([])
+    sheet.append(_bold_row(sheet, headers))
+
+    totals = [0] * (len(HOUR_FIELDS) + 1)
+    result = connection.execution_options(
+        stream_results=True, max_row_buffer=REPORT_BATCH_SIZE
+    ).execute(query)
+    # Строки одной дисциплины идут подряд: по строке на преподавателя
+    for _, rows in groupby(result, key=lambda row: row[0]):
+        rows = list(rows)
+        first = rows[0]
+        hours = [value or 0 for value in first[5:5 + len(HOUR_FIELDS)]]
+        hours.append(sum(hours))
+        for index, value in enumerate(hours):
+            totals[index] += value
+        teachers = ", ".join(row[-1] for row in rows if row[-1])
+        line = [first.semester, first.discipline, first.department]
+        if with_program:
+            line.insert(0, first.short_name)
+        sheet.append(line + hours + [teachers])
+
+    sheet.append([])
+    sheet.append(_bold_row(sheet, ["Итого"] + [None] * (len(headers) - len(totals) - 2) + totals))
+
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=".xlsx", dir=SPOOL_DIR)
+    os.close(fd)
+    try:
+        workbook.save(path)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def write_program_report(program_id: int) -> Optional[tuple]:
+    """
+    Отчёт по учебному плану программы: (путь к xlsx, short_name программы)
+    или None, если программы нет.
+    """
+    with engine.connect() as connection:
+        program = connection.execute(
+            select(EducationProgram.program_name, EducationProgram.short_name).where(
+                EducationProgram.program_id == program_id
+            )
+        ).first()
+        if program is None:
+            return None
+        short_name = program.short_name or str(program_id)
+        query = _report_query().where(Curriculum.program_id == program_id).order_by(
+            Curriculum.semester.asc().nulls_last(),
+            Curriculum.discipline,
+            Curriculum.curriculum_id,
+            Teacher.full_name,
+        )
+        path = _write_workbook(
+            connection, query, program.program_name, short_name, with_program=False
+        )
+    return path, short_name
+
+
+def write_department_report(department: str) -> Optional[str]:
+    """Отчёт по дисциплинам кафедры во всех программах; None, если дисциплин нет."""
+    with engine.connect() as connection:
+        exists = connection.execute(
+            select(Curriculum.curriculum_id)
+            .where(Curriculum.department == department)
+            .limit(1)
+        ).first()
+        if exists is None:
+            return None
+        query = _report_query().where(Curriculum.department == department).order_by(
+            EducationProgram.short_name.asc().nulls_last(),
+            Curriculum.semester.asc().nulls_last(),
+            Curriculum.discipline,
+            Curriculum.curriculum_id,
+            Teacher.full_name,
+        )
+        return _write_workbook(
+            connection, query, f"Кафедра: {department}", department, with_program=True
+        )
@@ -0,0 +1,455 @@
+"""
+Очередь фоновых заданий импорта.
+
+Разбор файлов выполняется в ограниченном пуле процессов, запись в БД — в пуле
+потоков со своей сессией на задание. Состояние заданий хранится в памяти
+процесса и отдаётся через /import/jobs/{job_id}.
+
+Задание "archive" импортирует файлы zip-архива: все файлы сразу ставятся в пул
+разбора, а запись идёт по мере готовности — сначала учебные планы (по программам,
+одна транзакция на программу), затем кадровые справки, каждая в своей
+транзакции. По каждому файлу в задании хранятся исход и время разбора и записи.
+"""
+import contextvars
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+from fastapi import HTTPException
+
+from app.database import SessionLocal
+from app.services.import_ledger import find_applied, ledger_summary, record_import
+from app.services.response_cache import bump_data_version
+from app.services.uploads import remove_spooled
+from app.logging_config import get_request_context, set_request_context, setup_logging
+from app.services.import_utils import (
+    find_curriculum_program,
+    parse_docx,
+    parse_excel,
+    import_teachers_with_programs,
+    store_curriculum,
+)
+
+
+logger = logging.getLogger(__name__)
+
+PARSE_WORKERS = int(os.getenv("IMPORT_PARSE_WORKERS", "2"))
+WRITE_WORKERS = int(os.getenv("IMPORT_WRITE_WORKERS", "2"))
+MAX_STORED_JOBS = int(os.getenv("IMPORT_MAX_STORED_JOBS", "200"))
+
+_jobs = OrderedDict()
+_lock = threading.Lock()
+_parse_pool = None
+_write_pool = None
+
+
+def _store_teachers(db, filename, teachers_data):
+    import_teachers_with_programs(db, teachers_data)
+    return {"status": "success", "imported_count": len(teachers_data)}
+
+
+# Тип задания -> (функция разбора файла, функция записи в БД)
+JOB_KINDS = {
+    "teachers": (parse_docx, _store_teachers),
+    "curriculum": (parse_excel, store_curriculum),
+}
+# Расширение файла архива -> тип импорта
+ARCHIVE_KINDS = {
+    ".xlsx": "curriculum",
+    ".xls": "curriculum",
+    ".docx": "teachers",
+}
+
+
+def _pools():
+    global _parse_pool, _write_pool
+    with _lock:
+        if _parse_pool is None:
+            # spawn: дочерние процессы не наследуют соединения и потоки родителя
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=setup_logging,
+            )
+            _write_pool = ThreadPoolExecutor(
+                max_workers=WRITE_WORKERS, thread_name_prefix="import-job"
+            )
+        return _parse_pool, _write_pool
+
+
+def _update(job_id: str, **fields):
+    with _lock:
+        if job_id in _jobs:
+            _jobs[job_id].update(fields)
+
+
+def _register(job: dict) -> str:
+    with _lock:
+        _jobs[job["job_id"]] = job
+        while len(_jobs) > MAX_STORED_JOBS:
+            _jobs.popitem(last=False)
+    return job["job_id"]
+
+
+def _new_job(kind: str, filename: str, content_hash: str = None, **extra) -> dict:
+    return {
+        "job_id": uuid.uuid4().hex,
+        "kind": kind,
+        "filename": filename,
+        "sha256": content_hash,
+        "status": "queued",
+        "phase": "queued",
+        "rows_parsed": 0,
+        "rows_written": 0,
+        "errors": [],
+        "result": None,
+        "created_at": datetime.utcnow().isoformat(),
+        "finished_at": None,
+        **extra,
+    }
+
+
+def submit_import(kind: str, file_path: str, filename: str, content_hash: str = None) -> dict:
+    """
+    Ставит файл в очередь импорта и сразу возвращает описание задания.
+    Файл удаляется после завершения задания.
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Неизвестный тип импорта: {kind}")
+
+    job_id = _register(_new_job(kind, filename, content_hash))
+    _, write_pool = _pools()
+    # Задание пишет в лог с идентификатором запроса, который его создал
+    write_pool.submit(
+        contextvars.copy_context().run,
+        _run_job,
+        job_id,
+        kind,
+        file_path,
+        filename,
+        content_hash,
+    )
+    return get_job(job_id)
+
+
+def _file_entry(
+    filename: str, kind: str = None, content_hash: str = None, status: str = "queued"
+) -> dict:
+    return {
+        "filename": filename,
+        "kind": kind,
+        "sha256": content_hash,
+        "status": status,
+        "program_id": None,
+        "rows_parsed": 0,
+        "rows_written": 0,
+        "parse_seconds": None,
+        "write_seconds": None,
+        "error": None,
+    }
+
+
+def archive_kind(filename: str):
+    """Тип импорта файла из архива по расширению (None — файл не импортируется)."""
+    return ARCHIVE_KINDS.get(os.path.splitext(filename)[1].lower())
+
+
+def submit_archive(filename: str, members: list, skipped: list = ()) -> dict:
+    """
+    Ставит в очередь импорт распакованных файлов архива (SpooledUpload).
+    Пропущенные файлы попадают в отчёт со статусом "skipped".
+    Файлы удаляются после завершения задания.
+    """
+    files = [
+        _file_entry(member.filename, archive_kind(member.filename), member.sha256)
+        for member in members
+    ]
+    files += [_file_entry(name, status="skipped") for name in skipped]
+    job_id = _register(_new_job("archive", filename, files=files))
+
+    _, write_pool = _pools()
+    write_pool.submit(contextvars.copy_context().run, _run_archive, job_id, list(members))
+    return get_job(job_id)
+
+
+def get_job(job_id: str):
+    """Текущее состояние задания или None, если задание неизвестно."""
+    with _lock:
+        job = _jobs.get(job_id)
+        if not job:
+            return None
+        job = dict(job, errors=list(job["errors"]))
+        if "files" in job:
+            job["files"] = [dict(entry) for entry in job["files"]]
+        return job
+
+
+def _parse(parse, file_path: str, request_context: tuple):
+    # Выполняется в процессе разбора: переносим контекст запроса для логов
+    set_request_context(*request_context)
+    return parse(file_path)
+
+
+def _timed_parse(parse, file_path: str, request_context: tuple):
+    # Время разбора в самом процессе, без ожидания в очереди пула
+    started = time.perf_counter()
+    data = _parse(parse, file_path, request_context)
+    return data, time.perf_counter() - started
+
+
+def _run_job(job_id: str, kind: str, file_path: str, filename: str, content_hash: str = None):
+    parse, store = JOB_KINDS[kind]
+    parse_pool, _ = _pools()
+    try:
+        # Тот же файл уже применён — разбирать и писать нечего
+        if content_hash:
+            _update(job_id, status="running", phase="checking")
+            db = SessionLocal()
+            try:
+                applied = find_applied(db, kind, filename, content_hash)
+                result = ledger_summary(applied) if applied else None
+            finally:
+                db.close()
+            if result:
+                _update(job_id, status="done", phase="done", result=result)
+                return
+
+        _update(job_id, status="running", phase="parsing")
+        data = parse_pool.submit(_parse, parse, file_path, get_request_context()).result()
+        _update(job_id, phase="writing", rows_parsed=len(data))
+
+        db = SessionLocal()
+        try:
+            result = store(db, filename, data)
+            if content_hash:
+                record_import(db, kind, content_hash, filename, len(data), result)
+        finally:
+            db.close()
+        _update(
+            job_id,
+            status="done",
+            phase="done",
+            rows_written=result.get("imported_count", len(data)),
+            result=result,
+        )
+    except HTTPException as e:
+        _update(job_id, status="failed", errors=[e.detail])
+    except Exception as e:
+        logger.error("Ошибка задания импорта %s: %s", job_id, e, exc_info=True)
+        _update(job_id, status="failed", errors=[str(e)])
+    finally:
+        _update(job_id, finished_at=datetime.utcnow().isoformat())
+        remove_spooled(file_path)
+
+
+def _update_file(job_id: str, index: int, **fields):
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+        entry = job["files"][index]
+        entry.update(fields)
+        if fields.get("error"):
+            job["errors"].append(f"{entry['filename']}: {fields['error']}")
+        job["rows_parsed"] = sum(f["rows_parsed"] for f in job["files"])
+        job["rows_written"] = sum(f["rows_written"] for f in job["files"])
+
+
+def _error_text(error: Exception):
+    return error.detail if isinstance(error, HTTPException) else str(error)
+
+
+def _curriculum_groups(job_id: str, members: list, indexes: list) -> OrderedDict:
+    """
+    Группирует учебные планы по программам (program_id -> номера файлов в порядке
+    записи). Группа, последний файл которой уже применён, не записывается.
+    """
+    groups = OrderedDict()
+    db = SessionLocal()
+    try:
+        for index in indexes:
+            member = members[index]
+            program = find_curriculum_program(db, member.filename)
+            if program is None:
+                _update_file(
+                    job_id,
+                    index,
+                    status="failed",
+                    error=f"Программа с кодом {member.filename.split('_')[0]} не найдена",
+                )
+                continue
+            groups.setdefault(program.program_id, []).append(index)
+
+        for program_id, group in list(groups.items()):
+            last = members[group[-1]]
+            applied = find_applied(db, "curriculum", last.filename, last.sha256)
+            if applied:
+                for index in group:
+                    _update_file(job_id, index, status="unchanged", program_id=program_id)
+                del groups[program_id]
+    finally:
+        db.close()
+    return groups
+
+
+def _write_program(job_id: str, program_id: int, group: list, members: list, parsed: dict):
+    """Записывает все планы программы одной транзакцией, в порядке group."""
+    outcomes = {}
+    current = None
+    db = SessionLocal()
+    try:
+        for index in group:
+            current = index
+            data, parse_seconds = parsed[index].result()
+            _update_file(
+                job_id,
+                index,
+                status="writing",
+                program_id=program_id,
+                rows_parsed=len(data),
+                parse_seconds=round(parse_seconds, 3),
+            )
+            member = members[index]
+            started = time.perf_counter()
+            result = store_curriculum(db, member.filename, data, commit=False)
+            record_import(
+                db, "curriculum", member.sha256, member.filename, len(data), result, commit=False
+            )
+            outcomes[index] = (result, time.perf_counter() - started)
+        current = None
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning("Планы программы %s не записаны: %s", program_id, _error_text(e))
+        for index in group:
+            if index == current:
+                _update_file(job_id, index, status="failed", error=_error_text(e))
+            else:
+                _update_file(
+                    job_id,
+                    index,
+                    status="failed",
+                    rows_written=0,
+                    error="Не записан: транзакция программы отменена",
+                )
+        return
+    finally:
+        db.close()
+
+    if any(result.get("imported_count") for result, _ in outcomes.values()):
+        bump_data_version()
+    for index, (result, seconds) in outcomes.items():
+        _update_file(
+            job_id,
+            index,
+            status=result.get("status", "success"),
+            rows_written=result.get("imported_count", 0),
+            write_seconds=round(seconds, 3),
+        )
+
+
+def _write_staff(job_id: str, index: int, member, parsed: dict):
+    """Записывает кадровую справку архива в своей транзакции."""
+    try:
+        data, parse_seconds = parsed[index].result()
+        _update_file(
+            job_id,
+            index,
+            status="writing",
+            rows_parsed=len(data),
+            parse_seconds=round(parse_seconds, 3),
+        )
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            if find_applied(db, "teachers", member.filename, member.sha256):
+                result = {"status": "unchanged", "imported_count": 0}
+            else:
+                result = _store_teachers(db, member.filename, data)
+                record_import(db, "teachers", member.sha256, member.filename, len(data), result)
+        finally:
+            db.close()
+        _update_file(
+            job_id,
+            index,
+            status=result["status"],
+            rows_written=result["imported_count"],
+            write_seconds=round(time.perf_counter() - started, 3),
+        )
+    except Exception as e:
+        logger.warning("Файл %s не импортирован: %s", member.filename, _error_text(e))
+        _update_file(job_id, index, status="failed", error=_error_text(e))
+
+
+def _run_archive(job_id: str, members: list):
+    parse_pool, _ = _pools()
+    started = time.perf_counter()
+    try:
+        _update(job_id, status="running", phase="checking")
+        # Порядок записи: учебные планы, затем кадровые справки, каждые по имени
+        # файла (связи преподавателей с дисциплинами строятся по загруженным планам)
+        order = sorted(
+            range(len(members)),
+            key=lambda i: (archive_kind(members[i].filename) != "curriculum", members[i].filename),
+        )
+        curricula = [i for i in order if archive_kind(members[i].filename) == "curriculum"]
+        staff = [i for i in order if archive_kind(members[i].filename) == "teachers"]
+        groups = _curriculum_groups(job_id, members, curricula)
+
+        # Весь разбор — сразу в пул процессов; запись ждёт только нужные файлы
+        _update(job_id, phase="parsing")
+        request_context = get_request_context()
+        parsed = {}
+        for index in [i for group in groups.values() for i in group] + staff:
+            parse, _ = JOB_KINDS[archive_kind(members[index].filename)]
+            parsed[index] = parse_pool.submit(
+                _timed_parse, parse, members[index].path, request_context
+            )
+            _update_file(job_id, index, status="parsing")
+
+        _update(job_id, phase="writing")
+        for program_id, group in groups.items():
+            _write_program(job_id, program_id, group, members, parsed)
+        for index in staff:
+            _write_staff(job_id, index, members[index], parsed)
+
+        job = get_job(job_id)
+        counts = {}
+        for entry in job["files"]:
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        imported = [entry for entry in job["files"] if entry["status"] != "skipped"]
+        all_failed = imported and all(entry["status"] == "failed" for entry in imported)
+        _update(
+            job_id,
+            status="failed" if all_failed else "done",
+            phase="done",
+            result={
+                "files": counts,
+                "rows_written": job["rows_written"],
+                "seconds": round(time.perf_counter() - started, 3),
+            },
+        )
+    except Exception as e:
+        logger.error("Ошибка импорта архива %s: %s", job_id, e, exc_info=True)
+        _update(job_id, status="failed", errors=[str(e)])
+    finally:
+        _update(job_id, finished_at=datetime.utcnow().isoformat())
+        for member in members:
+            remove_spooled(member.path)
+
+
+def shutdown():
+    """Останавливает пулы заданий (вызывается при остановке приложения)."""
+    global _parse_pool, _write_pool
+    with _lock:
+        parse_pool, write_pool = _parse_pool, _write_pool
+        _parse_pool = _write_pool = None
+    if write_pool is not None:
+        write_pool.shutdown(wait=False, cancel_futures=True)
+        parse_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,87 @@
+"""
+Журнал применённых импортов (таблица import_ledger).
+
+Для каждого применённого файла хранится SHA-256 содержимого, программа и число
+строк. Повторная загрузка тех же байтов распознаётся до разбора файла:
+- учебный план — если это последний применённый файл этой программы;
+- кадровая справка — если после неё ничего не импортировалось (импорт планов
+  меняет набор дисциплин, с которыми сопоставляются преподаватели).
+Изменённый файл проходит разбор и сравнение с сохранёнными строками.
+
+Записи в обход импорта справок (создание преподавателя, привязка к программе,
+загрузка программ из CSV) вызывают invalidate_applied: после них повторная
+загрузка справки снова применяется.
+"""
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.models import ImportLedger
+from app.services.import_utils import find_curriculum_program
+
+
+def find_applied(db: Session, kind: str, filename: str, content_hash: str) -> Optional[ImportLedger]:
+    """Запись журнала, если файл с таким содержимым уже применён и актуален."""
+    query = db.query(ImportLedger)
+    if kind == "curriculum":
+        program = find_curriculum_program(db, filename)
+        if program is None:
+            return None
+        query = query.filter(
+            ImportLedger.kind == kind, ImportLedger.program_id == program.program_id
+        )
+
+    latest = query.order_by(ImportLedger.ledger_id.desc()).first()
+    if latest and latest.kind == kind and latest.content_hash == content_hash:
+        return latest
+    return None
+
+
+def record_import(
+    db: Session,
+    kind: str,
+    content_hash: str,
+    filename: str,
+    rows_parsed: int,
+    result: dict,
+    commit: bool = True,
+) -> ImportLedger:
+    """Записывает применённый файл в журнал (с commit=False — в текущую транзакцию)."""
+    entry = ImportLedger(
+        kind=kind,
+        content_hash=content_hash,
+        filename=filename,
+        program_id=result.get("program_id"),
+        rows_parsed=rows_parsed,
+        rows_written=result.get("imported_count", 0),
+    )
+    db.add(entry)
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return entry
+
+
+def invalidate_applied(db: Session, kind: str) -> int:
+    """
+    Удаляет записи журнала вида kind в текущей транзакции (без фиксации):
+    данные изменены в обход импорта, и прежние файлы больше не отражают их.
+    Возвращает число удалённых записей.
+    """
+    return (
+        db.query(ImportLedger)
+        .filter(ImportLedger.kind == kind)
+        .delete(synchronize_session=False)
+    )
+
+
+def ledger_summary(entry: ImportLedger) -> dict:
+    """Результат задания для повторно загруженного файла."""
+    return {
+        "status": "unchanged",
+        "imported_count": 0,
+        "program_id": entry.program_id,
+        "ledger_id": entry.ledger_id,
+        "applied_at": entry.applied_at.isoformat() if entry.applied_at else None,
+    }
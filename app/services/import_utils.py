@@ -1,39 +1,44 @@
-from docx import Document
-import re, math, csv
+import math, csv
 from sqlalchemy import delete
 from sqlalchemy.orm import Session, exc
 from app.models import (
     Teacher,
     Qualification,
+    Retraining,
     EducationProgram,
     TaughtDiscipline,
     Curriculum,
+    teacher_program_association,
 )
 import pandas as pd
 from sqlalchemy.dialects.postgresql import insert
+from app.services.discipline_matching import get_discipline_matcher
+from app.services.docx_tables import iter_table_rows
+from app.services.program_names import parse_program_name
+from app.services.qualifications import parse_courses
+from app.services.teaching_load import program_teacher_ids, refresh_load
+from app.services.response_cache import bump_data_version
 from io import BytesIO
 import traceback
 
 
+def _clean_cell(text: str) -> str:
+    return text.strip().replace("\n", " ").replace("\t", " ")
+
+
 def parse_docx(file_path: str):
-    doc = Document(file_path)
-    table = doc.tables[0]
-    headers = [
-        cell.text.strip().replace("\n", " ").replace("\t", " ")
-        for cell in table.rows[0].cells
-    ]
+    # Строки первой таблицы читаются потоково, без загрузки модели документа
+    rows = iter_table_rows(file_path, 0)
+    headers = [_clean_cell(text) for text in next(rows, [])]
     # print(f"Headers: {headers}")  # Отладочный вывод заголовков
     teachers = []
 
-    for row in table.rows[1:]:
-        cells = [
-            cell.text.strip().replace("\n", " ").replace("\t", " ")
-            for cell in row.cells
-        ]
+    for row in rows:
+        cells = [_clean_cell(text) for text in row]
         if not any(cells):
             continue
 
-        data = {headers[i]: cells[i] for i in range(len(headers))}
+        data = dict(zip(headers, cells))
         # print(f"Row data: {data}")  # Отладочный вывод данных строки
         teacher = {
             "full_name": data.get("Ф.И.О.", ""),
@@ -76,115 +81,239 @@ def parse_docx(file_path: str):
                 "",
             ),
         }
+        # Курсы разбираются здесь же, на стадии разбора файла
+        teacher["qualifications"], teacher["retrainings"] = parse_courses(
+            teacher["qualifications_raw"]
+        )
         # print(f"Parsed teacher: {teacher}")  # Отладочный вывод
         teachers.append(teacher)
     return teachers
 
 
-def import_teachers_with_programs(db: Session, teachers_data: list):
+def _split_list(raw: str) -> list:
+    """Разделяет строку со списком через ';' и убирает пустые элементы."""
+    return [item.strip() for item in (raw or "").split(";") if item.strip()]
+
+
+# Год набора для программ из кадровой справки, если он не указан в наименовании
+DEFAULT_PROGRAM_YEAR = 2023
+
+
+def _unique_short_name(short_name: str, taken: set) -> str:
+    """Подбирает свободный суффикс для short_name по множеству уже занятых имён."""
+    base_short_name = short_name
+    counter = 1
+    while short_name in taken:
+        short_name = f"{base_short_name}_{counter}"
+        counter += 1
+    taken.add(short_name)
+    return short_name
+
+
+def _insert_new_courses(
+    db: Session, model, teacher_ids: dict, teachers_data: list, key: str
+) -> int:
     """
-    Импортирует преподавателей, привязывает их к образовательным программам и дисциплинам.
+    Добавляет курсы (Qualification или Retraining) из записей parse_docx
+    одним многострочным INSERT, пропуская уже записанные у преподавателя.
+    Возвращает число добавленных строк.
     """
+    courses = set()
     for entry in teachers_data:
-        # Проверяем, существует ли преподаватель
-        teacher = db.query(Teacher).filter_by(full_name=entry["full_name"]).first()
-        if not teacher:
-            # Создаем нового преподавателя
-            teacher = Teacher(
-                full_name=entry["full_name"],
-                position=entry["position"],
-                education_level=entry["education_level"],
-                total_experience=entry.get("total_experience", 0),
-                teaching_experience=entry.get("teaching_experience", 0),
-                professional_experience=entry.get("professional_experience", 0),
-                academic_degree=entry.get("academic_degree"),
-                academic_title=entry.get("academic_title"),
+        teacher_id = teacher_ids[entry["full_name"]]
+        for course in entry.get(key, ()):
+            courses.add((teacher_id, course["program_name"], course["year"]))
+    if not courses:
+        return 0
+
+    existing = {
+        tuple(row)
+        for row in db.query(model.teacher_id, model.program_name, model.year).filter(
+            model.teacher_id.in_(sorted({teacher_id for teacher_id, _, _ in courses}))
+        )
+    }
+    rows = [
+        {"teacher_id": teacher_id, "program_name": program_name, "year": year}
+        for teacher_id, program_name, year in sorted(courses - existing)
+    ]
+    if rows:
+        db.execute(insert(model), rows)
+    return len(rows)
+
+
+def import_teachers_with_programs(db: Session, teachers_data: list):
+    """
+    Импортирует преподавателей, привязывает их к образовательным программам и дисциплинам,
+    дописывает курсы повышения квалификации и переподготовки.
+    Справочники загружаются в память один раз, новые строки пишутся
+    многострочными INSERT ... ON CONFLICT, фиксация — одна на файл.
+    """
+    try:
+        # 1. Преподаватели: первое вхождение ФИО в файле считается основным
+        teacher_rows = {}
+        for entry in teachers_data:
+            teacher_rows.setdefault(
+                entry["full_name"],
+                {
+                    "full_name": entry["full_name"],
+                    "position": entry["position"],
+                    "education_level": entry["education_level"],
+                    "total_experience": entry.get("total_experience", 0),
+                    "teaching_experience": entry.get("teaching_experience", 0),
+                    "professional_experience": entry.get("professional_experience", 0),
+                    "academic_degree": entry.get("academic_degree"),
+                    "academic_title": entry.get("academic_title"),
+                },
             )
-            db.add(teacher)
-            db.commit()
-            db.refresh(teacher)
-
-        # Обработка образовательных программ
-        programs_raw = entry.get("programs_raw", "")
-        programs = [
-            p.strip() for p in programs_raw.split(";") if p.strip()
-        ]  # Разделяем строку на отдельные программы
-
-        for program_name in programs:
-            # Проверяем, существует ли программа
-            program = (
-                db.query(EducationProgram).filter_by(program_name=program_name).first()
+        if not teacher_rows:
+            return
+
+        db.execute(
+            insert(Teacher).on_conflict_do_nothing(index_elements=["full_name"]),
+            list(teacher_rows.values()),
+        )
+        teacher_ids = dict(
+            db.query(Teacher.full_name, Teacher.teacher_id).filter(
+                Teacher.full_name.in_(list(teacher_rows))
             )
-            if not program:
-                # Генерация short_name из профиля в скобках
-                profile_match = re.search(r"\((.*?)\)", program_name)
-                profile = profile_match.group(1) if profile_match else "UNKNOWN"
-                short_name = f"{program_name.split()[0]}_{''.join(word[0] for word in profile.split())}_2023"
-
-                # Проверяем уникальность short_name
-                counter = 1
-                base_short_name = short_name
-                while (
-                    db.query(EducationProgram).filter_by(short_name=short_name).first()
-                ):
-                    short_name = f"{base_short_name}_{counter}"
-                    counter += 1
-
-                # Создаем новую программу
-                program = EducationProgram(
-                    program_name=program_name, short_name=short_name, year=2023
+        )
+
+        # 2. Образовательные программы
+        program_names = {
+            program_name
+            for entry in teachers_data
+            for program_name in _split_list(entry.get("programs_raw", ""))
+        }
+        program_ids = {}
+        if program_names:
+            program_ids = dict(
+                db.query(EducationProgram.program_name, EducationProgram.program_id).filter(
+                    EducationProgram.program_name.in_(program_names)
                 )
-                db.add(program)
-                db.commit()
-                db.refresh(program)
-
-            # Привязываем преподавателя к программе
-            if program not in teacher.programs:
-                teacher.programs.append(program)
-
-        # Обработка дисциплин
-        disciplines_raw = entry.get("disciplines_raw", "")
-        disciplines = [
-            d.strip() for d in disciplines_raw.split(";") if d.strip()
-        ]  # Разделяем строку на дисциплины
-
-        for discipline_name in disciplines:
-            # Приведение названия дисциплины к стандартному виду
-            normalized_name = discipline_name.strip().lower()
-
-            # Проверяем, существует ли дисциплина с учётом регистра и лишних пробелов
-            discipline = (
-                db.query(Curriculum)
-                .filter(Curriculum.discipline.ilike(f"%{normalized_name}%"))
-                .first()
             )
-
-            if not discipline:
-                # Создаем новую дисциплину
-                discipline = Curriculum(
-                    discipline=discipline_name.strip(), department="Не указано"
+            new_programs = sorted(program_names - program_ids.keys())
+            if new_programs:
+                taken = {
+                    name
+                    for (name,) in db.query(EducationProgram.short_name)
+                    if name is not None
+                }
+                rows = []
+                for program_name in new_programs:
+                    parsed = parse_program_name(program_name)
+                    year = parsed.year or DEFAULT_PROGRAM_YEAR
+                    rows.append(
+                        {
+                            "program_name": program_name,
+                            "short_name": _unique_short_name(parsed.short_name(year), taken),
+                            "year": year,
+                        }
+                    )
+                db.execute(
+                    insert(EducationProgram).on_conflict_do_nothing(
+                        index_elements=["program_name"]
+                    ),
+                    rows,
                 )
-                db.add(discipline)
-                db.commit()
-                db.refresh(discipline)
-
-            # Привязываем преподавателя к дисциплине через TaughtDiscipline
-            taught_discipline = (
-                db.query(TaughtDiscipline)
-                .filter_by(
-                    teacher_id=teacher.teacher_id,
-                    curriculum_id=discipline.curriculum_id,
+                program_ids.update(
+                    db.query(EducationProgram.program_name, EducationProgram.program_id).filter(
+                        EducationProgram.program_name.in_(new_programs)
+                    )
                 )
-                .first()
+
+        # 3. Дисциплины: лучшая по сходству дисциплина среди программ преподавателя
+        requests = {}
+        for entry in teachers_data:
+            programs = tuple(
+                sorted(program_ids[p] for p in _split_list(entry.get("programs_raw", "")))
+            )
+            for discipline_name in _split_list(entry.get("disciplines_raw", "")):
+                requests.setdefault((discipline_name.lower(), programs), discipline_name)
+        matcher = get_discipline_matcher(db)
+        matched = dict(
+            zip(requests, matcher.match_many([(n, p) for n, p in requests]))
+        )
+
+        missing = {}
+        for key, discipline_name in requests.items():
+            if matched[key] is None:
+                missing.setdefault(key[0], discipline_name)
+        if missing:
+            created = db.execute(
+                insert(Curriculum).returning(
+                    Curriculum.curriculum_id, Curriculum.discipline
+                ),
+                [
+                    {"discipline": name, "department": "Не указано"}
+                    for name in missing.values()
+                ],
+            )
+            created_ids = {discipline.lower(): cid for cid, discipline in created}
+            for key in matched:
+                if matched[key] is None:
+                    matched[key] = created_ids[key[0]]
+
+        # 4. Связи преподаватель-программа и преподаватель-дисциплина
+        program_links = set()
+        discipline_links = set()
+        for entry in teachers_data:
+            teacher_id = teacher_ids[entry["full_name"]]
+            programs = tuple(
+                sorted(program_ids[p] for p in _split_list(entry.get("programs_raw", "")))
             )
-            if not taught_discipline:
-                taught_discipline = TaughtDiscipline(
-                    teacher_id=teacher.teacher_id,
-                    curriculum_id=discipline.curriculum_id,
+            for program_id in programs:
+                program_links.add((teacher_id, program_id))
+            for discipline_name in _split_list(entry.get("disciplines_raw", "")):
+                discipline_links.add(
+                    (teacher_id, matched[(discipline_name.lower(), programs)])
                 )
-                db.add(taught_discipline)
 
+        # Уже существующие связи отсекает уникальный индекс
+        if program_links:
+            db.execute(
+                insert(teacher_program_association).on_conflict_do_nothing(
+                    index_elements=["teacher_id", "program_id"]
+                ),
+                [
+                    {"teacher_id": teacher_id, "program_id": program_id}
+                    for teacher_id, program_id in sorted(program_links)
+                ],
+            )
+        if discipline_links:
+            db.execute(
+                insert(TaughtDiscipline).on_conflict_do_nothing(
+                    index_elements=["teacher_id", "curriculum_id"]
+                ),
+                [
+                    {"teacher_id": teacher_id, "curriculum_id": curriculum_id}
+                    for teacher_id, curriculum_id in sorted(discipline_links)
+                ],
+            )
+
+        # 5. Повышение квалификации и переподготовка: дописываются курсы,
+        # которых ещё нет у преподавателя
+        courses = {}
+        for model, key in ((Qualification, "qualifications"), (Retraining, "retrainings")):
+            courses[key] = _insert_new_courses(db, model, teacher_ids, teachers_data, key)
+
+        # Итоги нагрузки преподавателей файла и кафедры новых дисциплин
+        refresh_load(
+            db,
+            departments=["Не указано"] if missing else [],
+            teacher_ids=teacher_ids.values(),
+        )
         db.commit()
+        bump_data_version()
+        logger.info(
+            f"Импортировано преподавателей: {len(teacher_rows)}, "
+            f"связей с программами: {len(program_links)}, "
+            f"с дисциплинами: {len(discipline_links)}, "
+            f"курсов повышения квалификации: {courses['qualifications']}, "
+            f"переподготовок: {courses['retrainings']}"
+        )
+    except Exception:
+        db.rollback()
+        raise
 
 
 # def import_teachers_with_programs(db: Session, teachers_data: list):
@@ -293,12 +422,17 @@ def assign_teacher_to_program(db: Session, teacher_id: int, program_id: int):
     if program not in teacher.programs:
         teacher.programs.append(program)
         db.commit()
-        print(
-            f"Преподаватель {teacher.full_name} привязан к программе {program.program_name}"
+        bump_data_version()
+        logger.info(
+            "Преподаватель %s привязан к программе %s",
+            teacher.full_name,
+            program.program_name,
         )
     else:
-        print(
-            f"Преподаватель {teacher.full_name} уже привязан к программе {program.program_name}"
+        logger.info(
+            "Преподаватель %s уже привязан к программе %s",
+            teacher.full_name,
+            program.program_name,
         )
 
 
@@ -438,12 +572,12 @@ from fastapi import HTTPException, UploadFile, BackgroundTasks
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 import pandas as pd
-import re
 import os
 from datetime import datetime
 from typing import List, Dict
 from app.models import Curriculum, EducationProgram
 import logging
+from app.logging_config import tracing
 
 
 logger = logging.getLogger(__name__)
@@ -461,6 +595,61 @@ def safe_convert(value, convert_func, default):
 
 
 from collections import defaultdict
+from openpyxl import load_workbook
+
+
+def _excel_columns(header: tuple) -> list:
+    """Имена колонок по строке заголовков — так же, как их строит pandas.read_excel."""
+    columns = []
+    seen = set()
+    for i, name in enumerate(header):
+        name = f"Unnamed: {i}" if name is None else name
+        candidate = name
+        counter = 0
+        while candidate in seen:
+            counter += 1
+            candidate = f"{name}.{counter}"
+        seen.add(candidate)
+        columns.append(candidate)
+    return columns
+
+
+def read_workbook_sheets(
+    file_path, sheet_names, header_marker: str = "Наименование", header_scan_rows: int = 3
+) -> Dict[str, pd.DataFrame]:
+    """
+    Читает нужные листы книги Excel за один проход (openpyxl read_only).
+    Строка заголовков ищется среди первых `header_scan_rows` уже прочитанных строк,
+    остальные листы книги не разбираются. Отсутствующие листы пропускаются.
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for sheet_name in sheet_names:
+            if sheet_name not in workbook.sheetnames:
+                continue
+
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            header = None
+            for _, row in zip(range(header_scan_rows), rows):
+                if header_marker in row:
+                    header = row
+                    break
+            if header is None:
+                raise ValueError(f"Не найдена строка с заголовками в листе '{sheet_name}'")
+
+            data = list(rows)
+            while data and all(value is None for value in data[-1]):
+                data.pop()
+            width = max([len(header)] + [len(row) for row in data])
+            header = tuple(header) + (None,) * (width - len(header))
+            sheets[sheet_name] = pd.DataFrame(
+                [tuple(row) + (None,) * (width - len(row)) for row in data],
+                columns=_excel_columns(header),
+            )
+        return sheets
+    finally:
+        workbook.close()
 
 
 def parse_excel(file_path: str) -> List[Dict]:
@@ -471,28 +660,20 @@ def parse_excel(file_path: str) -> List[Dict]:
     - обработкой различных форматов данных
     """
     try:
-        print(f"\n{'='*50}\nНачало обработки файла: {file_path}\n{'='*50}")
+        logger.info("Начало обработки файла: %s", file_path)
+        trace = tracing(logger)
 
-        # 1. Чтение и анализ структуры файла
-        xls = pd.ExcelFile(file_path)
-        print(f"Листы в файле: {xls.sheet_names}")
+        # 1. Чтение нужных листов за один проход
+        sheets = read_workbook_sheets(file_path, ("ПланСвод", "План"))
+        logger.debug("Прочитаны листы: %s", list(sheets))
+        for sheet_name in ("ПланСвод", "План"):
+            if sheet_name not in sheets:
+                raise ValueError(f"В файле отсутствует лист '{sheet_name}'")
 
         # 2. Определение основных колонок в ПланСвод
-        df_svod = pd.read_excel(xls, sheet_name="ПланСвод", header=None, nrows=5)
-        header_row = None
-
-        # Поиск строки с заголовками
-        for i in range(3):  # Проверяем первые 3 строки
-            if "Наименование" in df_svod.iloc[i].values:
-                header_row = i
-                break
-
-        if header_row is None:
-            raise ValueError("Не найдена строка с заголовками в листе 'ПланСвод'")
-
-        df_svod = pd.read_excel(xls, sheet_name="ПланСвод", header=header_row)
-        print("\nСтруктура листа ПланСвод:")
-        print(df_svod.columns.tolist())
+        df_svod = sheets["ПланСвод"]
+        if trace:
+            logger.debug("Структура листа ПланСвод: %s", df_svod.columns.tolist())
 
         # Автоматическое определение колонок
         disc_col = next(
@@ -506,20 +687,9 @@ def parse_excel(file_path: str) -> List[Dict]:
             raise ValueError("Не найдена колонка с названиями дисциплин")
 
         # 3. Анализ листа План
-        df_plan = pd.read_excel(xls, sheet_name="План", header=None, nrows=5)
-        plan_header_row = None
-
-        for i in range(3):
-            if "Наименование" in df_plan.iloc[i].values:
-                plan_header_row = i
-                break
-
-        if plan_header_row is None:
-            raise ValueError("Не найдена строка с заголовками в листе 'План'")
-
-        df_plan = pd.read_excel(xls, sheet_name="План", header=plan_header_row)
-        print("\nСтруктура листа План:")
-        print(df_plan.columns.tolist())
+        df_plan = sheets["План"]
+        if trace:
+            logger.debug("Структура листа План: %s", df_plan.columns.tolist())
 
         # 4. Определение структуры курсов
         course_blocks = defaultdict(dict)
@@ -528,7 +698,8 @@ def parse_excel(file_path: str) -> List[Dict]:
         for col in df_plan.columns:
             col_name = str(col)
             current_course = col_name
-            print(f"col_name: {col_name} current_course: {current_course}")
+            if trace:
+                logger.debug("col_name: %s current_course: %s", col_name, current_course)
 
             # if "курс" in col_name.lower():
             #     current_course = col_name
@@ -546,109 +717,80 @@ def parse_excel(file_path: str) -> List[Dict]:
             elif "лаб" in col_name.lower():
                 course_blocks[current_course]["lab_col"] = col
 
-        print("\nОбнаруженные блоки курсов:")
-        for course, blocks in course_blocks.items():
-            print(f"{course}: {blocks}")
+        if trace:
+            for course, blocks in course_blocks.items():
+                logger.debug("Блок курса %s: %s", course, blocks)
 
-        # 5. Обработка данных
-        result = []
+        # 5. Обработка данных: план индексируется по названию дисциплины один раз,
+        # часы по блокам курсов суммируются векторно, результат — одно слияние
         discipline_col_plan = next(
             (col for col in df_plan.columns if "наименование" in str(col).lower()),
             disc_col,
         )
 
-        for idx, row in df_svod.iterrows():
-            if pd.isna(row[disc_col]) or str(row[disc_col]).strip() in ["", "nan"]:
-                continue
-
-            discipline = str(row[disc_col]).strip()
-            department = (
-                str(row[dept_col]).strip()
-                if dept_col and pd.notna(row.get(dept_col))
-                else "Не указано"
-            )
-
-            # Поиск дисциплины в листе План
-            hours_data = None
-            if discipline_col_plan in df_plan.columns:
-                mask = (
-                    df_plan[discipline_col_plan].astype(str).str.strip() == discipline
-                )
-                if mask.any():
-                    hours_data = df_plan[mask].iloc[0]
-
-            # Сбор часов по всем курсам
-            lecture_hours = 0.0
-            practice_hours = 0.0
-            lab_hours = 0.0
-            exam_hours = 0.0
-
-            for course, blocks in course_blocks.items():
-                try:
-                    if "lecture_col" in blocks:
-                        val = (
-                            hours_data[blocks["lecture_col"]]
-                            if hours_data is not None
-                            else 0
-                        )
-                        lecture_hours += float(val) if pd.notna(val) else 0
-
-                    if "practice_col" in blocks:
-                        val = (
-                            hours_data[blocks["practice_col"]]
-                            if hours_data is not None
-                            else 0
-                        )
-                        practice_hours += float(val) if pd.notna(val) else 0
-
-                    if "exam_col" in blocks:
-                        val = (
-                            hours_data[blocks["exam_col"]]
-                            if hours_data is not None
-                            else 0
-                        )
-                        exam_hours = int(val) if pd.notna(val) else 0
-
-                    if "lab_col" in blocks:
-                        val = (
-                            hours_data[blocks["lab_col"]]
-                            if hours_data is not None
-                            else 0
-                        )
-                        lab_hours += float(val) if pd.notna(val) else 0
-                except (ValueError, TypeError):
-                    continue
-
-            item = {
-                "discipline": discipline,
-                "department": department,
-                "lecture_hours": lecture_hours,
-                "practice_hours": practice_hours,
-                "exam_ours": exam_hours,
-                "lab_hours": lab_hours,
-                "exam_hours": 0.0,
-                "test_hours": 0.0,
-                "total_practice_hours": practice_hours + lab_hours,
+        def hour_columns(key):
+            return [blocks[key] for blocks in course_blocks.values() if key in blocks]
+
+        def numeric(col):
+            return pd.to_numeric(df_plan[col], errors="coerce").fillna(0.0)
+
+        def sum_hours(key):
+            total = pd.Series(0.0, index=df_plan.index)
+            for col in hour_columns(key):
+                total += numeric(col)
+            return total
+
+        # Экзамен: как и раньше, берётся значение последнего блока с экзаменом
+        exam = pd.Series(0, index=df_plan.index)
+        for col in hour_columns("exam_col"):
+            values = pd.to_numeric(df_plan[col], errors="coerce")
+            exam = exam.where(values.isna() & df_plan[col].notna(), values.fillna(0))
+        plan_hours = pd.DataFrame(
+            {
+                "lecture_hours": sum_hours("lecture_col"),
+                "practice_hours": sum_hours("practice_col"),
+                "lab_hours": sum_hours("lab_col"),
+                "exam_ours": exam.astype(int),
             }
+        )
 
-            print(f"\nДисциплина: {discipline}")
-            print(f"Кафедра: {department}")
-            print(
-                f"Часы: лекции={lecture_hours}, практики={practice_hours}, экзамен в семестре={exam_hours}, лабы={lab_hours}"
+        if discipline_col_plan in df_plan.columns:
+            plan_hours["discipline"] = df_plan[discipline_col_plan].astype(str).str.strip()
+            plan_hours = plan_hours.drop_duplicates("discipline", keep="first")
+        else:
+            plan_hours["discipline"] = pd.Series(dtype=str)
+            plan_hours = plan_hours.iloc[0:0]
+
+        svod_names = df_svod[disc_col]
+        df_result = pd.DataFrame({"discipline": svod_names.astype(str).str.strip()})
+        df_result = df_result[svod_names.notna() & ~df_result["discipline"].isin(["", "nan"])]
+        if dept_col:
+            departments = df_svod.loc[df_result.index, dept_col]
+            df_result["department"] = departments.astype(str).str.strip().where(
+                departments.notna(), "Не указано"
             )
-
-            result.append(item)
+        else:
+            df_result["department"] = "Не указано"
+
+        df_result = df_result.merge(plan_hours, on="discipline", how="left")
+        hour_fields = ["lecture_hours", "practice_hours", "lab_hours"]
+        df_result[hour_fields] = df_result[hour_fields].fillna(0.0).astype(float)
+        df_result["exam_ours"] = df_result["exam_ours"].fillna(0).astype(int)
+        df_result["exam_hours"] = 0.0
+        df_result["test_hours"] = 0.0
+        df_result["total_practice_hours"] = (
+            df_result["practice_hours"] + df_result["lab_hours"]
+        )
+        result = df_result.to_dict("records")
 
         if not result:
             raise ValueError("Файл не содержит данных для импорта")
 
-        print(f"\n{'='*50}\nУспешно обработано дисциплин: {len(result)}")
-        print(f"{'='*50}\n")
+        logger.info("Успешно обработано дисциплин: %d", len(result))
 
         return result
 
     except Exception as e:
-        print(f"\n{'!'*50}\nОшибка при обработке файла: {str(e)}\n{'!'*50}")
         logger.error(f"Ошибка парсинга Excel: {str(e)}", exc_info=True)
         raise ValueError(f"Ошибка чтения файла: {str(e)}")
 
@@ -671,16 +813,6 @@ def import_curriculum(
                 detail="Поддерживаются только файлы Excel (.xlsx, .xls)",
             )
 
-        # Диагностика перед парсингом
-        try:
-            # Пробуем прочитать файл для диагностики
-            diagnostic_df = pd.read_excel(file_path, sheet_name=None, nrows=1)
-            print("Диагностика файла:")
-            for sheet_name, df in diagnostic_df.items():
-                print(f"Лист '{sheet_name}': колонки - {df.columns.tolist()}")
-        except Exception as e:
-            logger.warning(f"Диагностика файла не удалась: {str(e)}")
-
         # Парсинг данных
         try:
             curriculum_data = parse_excel(file_path)
@@ -699,14 +831,98 @@ def import_curriculum(
                 detail="Файл не содержит данных для импорта. Проверьте формат файла.",
             )
 
+        result = store_curriculum(db, filename, curriculum_data)
+
+        # Очистка
+        background_tasks.add_task(
+            lambda: os.remove(file_path) if os.path.exists(file_path) else None
+        )
+
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Критическая ошибка импорта: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}"
+        )
+
+
+def find_curriculum_program(db: Session, filename: str):
+    """Программа учебного плана по коду в начале имени файла (КОД_ПРОФИЛЬ_ИНСТИТУТ_ГОД.xlsx)."""
+    program_code = filename.split("_")[0]
+    return (
+        db.query(EducationProgram)
+        .filter(EducationProgram.short_name.ilike(f"{program_code}%"))
+        .first()
+    )
+
+
+# Ключ строки плана и поля, которые обновляются при повторном импорте:
+# кафедра и все колонки часов Curriculum
+CURRICULUM_KEY_FIELDS = ("discipline", "semester")
+CURRICULUM_UPDATE_FIELDS = ("department",) + tuple(
+    column.name for column in Curriculum.__table__.columns if column.name.endswith("_hours")
+)
+
+
+def diff_curriculum(stored_rows: list, curriculum_data: List[Dict]) -> Dict:
+    """
+    Сравнивает сохранённые строки плана (словари с curriculum_id) с загруженными
+    по ключу (discipline, semester). Повторяющиеся ключи сопоставляются по порядку.
+    Возвращает вставки, обновления (только изменённые поля), число неизменных
+    строк и удалённые строки.
+    """
+    by_key = defaultdict(list)
+    for row in stored_rows:
+        by_key[tuple(row[field] for field in CURRICULUM_KEY_FIELDS)].append(row)
+
+    inserts, updates, unchanged = [], [], 0
+    for item in curriculum_data:
+        candidates = by_key.get(tuple(item.get(field) for field in CURRICULUM_KEY_FIELDS))
+        if not candidates:
+            inserts.append(item)
+            continue
+        row = candidates.pop(0)
+        changed = {
+            field: item.get(field)
+            for field in CURRICULUM_UPDATE_FIELDS
+            if field in item and item.get(field) != row[field]
+        }
+        if changed:
+            updates.append(dict(changed, curriculum_id=row["curriculum_id"]))
+        else:
+            unchanged += 1
+
+    removed = [row for rows in by_key.values() for row in rows]
+    return {"inserts": inserts, "updates": updates, "unchanged": unchanged, "removed": removed}
+
+
+def store_curriculum(
+    db: Session,
+    filename: str,
+    curriculum_data: List[Dict],
+    commit: bool = True,
+    prune_removed: bool = False,
+):
+    """
+    Записывает разобранный учебный план в БД.
+    Программа определяется по коду в имени файла. План сравнивается с сохранённым
+    по (discipline, semester): новые дисциплины добавляются, у существующих
+    обновляются только изменившиеся поля. Дисциплины, которых нет в файле,
+    остаются в БД вместе со связями с преподавателями и только перечисляются
+    в details["removed"].
+    С prune_removed=True такие дисциплины удаляются вместе с их связями
+    с преподавателями (число удалённых связей — в details["teacher_links_removed"]).
+    С commit=False транзакция остаётся открытой: фиксирует её вызывающий
+    (импорт архива пишет все планы одной программы одной транзакцией).
+    """
+    try:
         # Определение программы
         try:
             program_code = filename.split("_")[0]
-            program = (
-                db.query(EducationProgram)
-                .filter(EducationProgram.short_name.ilike(f"{program_code}%"))
-                .first()
-            )
+            program = find_curriculum_program(db, filename)
 
             if not program:
                 available_programs = db.query(EducationProgram.short_name).all()
@@ -726,14 +942,6 @@ def import_curriculum(
                 detail="Некорректное имя файла. Ожидается формат: КОД_ПРОФИЛЬ_ИНСТИТУТ_ГОД.xlsx",
             )
 
-        # Очистка старых данных
-        deleted_count = (
-            db.query(Curriculum)
-            .filter(Curriculum.program_id == program.program_id)
-            .delete(synchronize_session=False)
-        )
-        logger.info(f"Удалено {deleted_count} старых записей учебного плана")
-
         # Подготовка данных
         for item in curriculum_data:
             item["program_id"] = program.program_id
@@ -749,33 +957,87 @@ def import_curriculum(
             ]:
                 item[field] = float(item.get(field, 0))
 
-        # Вставка данных
+        # Сравнение с сохранённым планом: id дисциплин и связи с преподавателями
+        # сохраняются, меняются только отличающиеся строки
+        columns = [Curriculum.curriculum_id] + [
+            getattr(Curriculum, field)
+            for field in CURRICULUM_KEY_FIELDS + CURRICULUM_UPDATE_FIELDS
+        ]
+        stored_rows = [
+            row._asdict()
+            for row in db.query(*columns)
+            .filter(Curriculum.program_id == program.program_id)
+            .order_by(Curriculum.curriculum_id)
+        ]
+        diff = diff_curriculum(stored_rows, curriculum_data)
+        removed_ids = (
+            [row["curriculum_id"] for row in diff["removed"]] if prune_removed else []
+        )
+        written = len(diff["inserts"]) + len(diff["updates"]) + len(removed_ids)
+
         try:
-            db.bulk_insert_mappings(Curriculum, curriculum_data)
-            db.commit()
-            logger.info(f"Успешно импортировано {len(curriculum_data)} дисциплин")
+            links_removed = 0
+            if written:
+                # Итоги нагрузки: преподаватели программы — до удаления связей
+                load_teachers = program_teacher_ids(db, program.program_id)
+            if removed_ids:
+                links_removed = (
+                    db.query(TaughtDiscipline)
+                    .filter(TaughtDiscipline.curriculum_id.in_(removed_ids))
+                    .delete(synchronize_session=False)
+                )
+                db.query(Curriculum).filter(
+                    Curriculum.curriculum_id.in_(removed_ids)
+                ).delete(synchronize_session=False)
+            if diff["updates"]:
+                db.bulk_update_mappings(Curriculum, diff["updates"])
+            if diff["inserts"]:
+                db.bulk_insert_mappings(Curriculum, diff["inserts"])
+            if written:
+                refresh_load(
+                    db,
+                    program_ids=[program.program_id],
+                    departments={row["department"] for row in stored_rows}
+                    | {item.get("department") for item in curriculum_data},
+                    teacher_ids=load_teachers,
+                )
+            if commit:
+                db.commit()
+                if written:
+                    bump_data_version()
         except Exception as e:
             db.rollback()
-            logger.error(f"Ошибка при вставке данных: {str(e)}", exc_info=True)
+            logger.error(f"Ошибка при записи данных: {str(e)}", exc_info=True)
             raise HTTPException(
                 status_code=500, detail=f"Ошибка базы данных при импорте: {str(e)}"
             )
 
-        # Очистка
-        background_tasks.add_task(
-            lambda: os.remove(file_path) if os.path.exists(file_path) else None
+        logger.info(
+            "План программы %s: добавлено %d, обновлено %d, без изменений %d, "
+            "нет в файле %d, удалено %d",
+            program.program_id,
+            len(diff["inserts"]),
+            len(diff["updates"]),
+            diff["unchanged"],
+            len(diff["removed"]),
+            len(removed_ids),
         )
-
-        return {
-            "status": "success",
-            "imported_count": len(curriculum_data),
+        result = {
+            "status": "success" if written else "unchanged",
+            "imported_count": written,
             "program_id": program.program_id,
             "program_name": program.program_name,
             "details": {
-                "disciplines": [d["discipline"] for d in curriculum_data[:3]] + ["..."],
-                "departments": list(set(d["department"] for d in curriculum_data)),
+                "inserted": len(diff["inserts"]),
+                "updated": len(diff["updates"]),
+                "unchanged": diff["unchanged"],
+                "removed": [row["discipline"] for row in diff["removed"]],
+                "departments": sorted(set(d["department"] for d in curriculum_data)),
             },
         }
+        if prune_removed:
+            result["details"]["teacher_links_removed"] = links_removed
+        return result
 
     except HTTPException:
         raise
@@ -874,86 +1136,72 @@ def check_duplicates_in_csv(file_path: str):
             raise ValueError(f"Найдены дубликаты в CSV-файле: {', '.join(duplicates)}")
 
 
-def remove_duplicates_from_csv(file_path: str, output_file_path: str):
+def read_programs_csv(file_path: str) -> Dict[str, int]:
     """
-    Удаляет дубликаты из CSV-файла на основе поля program_name и сохраняет результат в новый файл.
+    Читает CSV образовательных программ построчно: program_name -> year.
+    Повторы program_name отбрасываются (остаётся первое вхождение).
     """
-    try:
-        with open(file_path, mode="r", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            unique_rows = {}
-
-            for row in reader:
-                program_name = row["program_name"].strip()
-                # Если program_name уже есть, пропускаем запись
-                if program_name not in unique_rows:
-                    unique_rows[program_name] = row
-
-        # Сохраняем уникальные записи в новый файл
-        with open(
-            output_file_path, mode="w", encoding="utf-8", newline=""
-        ) as output_file:
-            writer = csv.DictWriter(output_file, fieldnames=reader.fieldnames)
-            writer.writeheader()
-            writer.writerows(unique_rows.values())
-
-        print(
-            f"Дубликаты удалены. Уникальные записи сохранены в файл: {output_file_path}"
-        )
-    except Exception as e:
-        raise RuntimeError(f"Ошибка при удалении дубликатов: {e}")
+    programs = {}
+    with open(file_path, mode="r", encoding="utf-8-sig", newline="") as file:
+        for row in csv.DictReader(file):
+            program_name = row["program_name"].strip()
+            if program_name and program_name not in programs:
+                programs[program_name] = int(row["year"])
+    return programs
+
+
+def _keeps_short_name(current: str, base_short_name: str) -> bool:
+    """Текущее имя программы уже выведено из той же основы (base или base_N)."""
+    if current == base_short_name:
+        return True
+    prefix, _, suffix = current.rpartition("_")
+    return prefix == base_short_name and suffix.isdigit()
 
 
 def import_education_programs(file_path: str, db: Session):
     """
     Импортирует образовательные программы из CSV-файла в таблицу education_programs.
     Если программа с таким program_name уже существует, она обновляется.
+    Занятые short_name читаются одним запросом, свободные суффиксы подбираются
+    в памяти, все строки записываются одним INSERT ... ON CONFLICT DO UPDATE.
+    У существующей программы short_name с той же основой не меняется.
     """
     try:
-        # Удаляем дубликаты перед импортом
-        cleaned_file_path = "cleaned_" + file_path
-        remove_duplicates_from_csv(file_path, cleaned_file_path)
-
-        with open(cleaned_file_path, mode="r", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-
-            for row in reader:
-                program_name = row["program_name"].strip()
-                year = int(row["year"])
-
-                # Генерация short_name из профиля в скобках
-                profile_match = re.search(r"\((.*?)\)", program_name)
-                profile = profile_match.group(1) if profile_match else "UNKNOWN"
-                short_name = f"{program_name.split()[0]}_{''.join(word[0] for word in profile.split())}_{year}"
-
-                # Проверяем уникальность short_name
-                counter = 1
-                base_short_name = short_name
-                while (
-                    db.query(EducationProgram).filter_by(short_name=short_name).first()
-                ):
-                    short_name = f"{base_short_name}_{counter}"
-                    counter += 1
-
-                # Проверяем, существует ли запись с таким program_name
-                existing_program = (
-                    db.query(EducationProgram)
-                    .filter_by(program_name=program_name)
-                    .first()
-                )
-                if existing_program:
-                    # Обновляем существующую запись
-                    existing_program.short_name = short_name
-                    existing_program.year = year
-                else:
-                    # Добавляем новую запись
-                    new_program = EducationProgram(
-                        program_name=program_name, short_name=short_name, year=year
-                    )
-                    db.add(new_program)
+        programs = read_programs_csv(file_path)
+        if not programs:
+            return
 
-            db.commit()
-            print("Импорт завершен.")
+        existing = dict(
+            db.query(EducationProgram.program_name, EducationProgram.short_name)
+        )
+        taken = {name for name in existing.values() if name is not None}
+
+        rows = []
+        for program_name, year in programs.items():
+            base_short_name = parse_program_name(program_name).short_name(year)
+            current = existing.get(program_name)
+            if current is not None and _keeps_short_name(current, base_short_name):
+                short_name = current
+            else:
+                short_name = _unique_short_name(base_short_name, taken)
+            rows.append(
+                {"program_name": program_name, "short_name": short_name, "year": year}
+            )
+
+        statement = insert(EducationProgram)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["program_name"],
+                set_={
+                    "short_name": statement.excluded.short_name,
+                    "year": statement.excluded.year,
+                },
+            ),
+            rows,
+        )
+        db.commit()
+        bump_data_version()
+        logger.info("Импорт образовательных программ завершен: %d", len(rows))
     except Exception as e:
         db.rollback()
         raise RuntimeError(f"Ошибка импорта образовательных программ: {e}")
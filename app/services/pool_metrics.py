@@ -0,0 +1,123 @@
+"""
+Метрики пула соединений SQLAlchemy.
+
+Счётчики выдачи/возврата соединений собираются через события пула
+(connect, checkout, checkin, invalidate). Время ожидания свободного соединения
+событиями не покрывается, поэтому пулы движков создаются классами с замером
+времени получения соединения (_do_get). Снимок отдаётся через /admin/metrics.
+"""
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Накопленные показатели одного пула."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_last = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_last = seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_count": self.waits,
+                "wait_avg_ms": round(self.wait_total / self.waits * 1000, 3) if self.waits else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_last_ms": round(self.wait_last * 1000, 3),
+            }
+
+
+class _TimedGetMixin:
+    """Замеряет, сколько вызывающий ждал соединение из пула."""
+
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self._record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self._record_wait(time.perf_counter() - started)
+        return connection
+
+    def _record_wait(self, seconds: float, timed_out: bool = False):
+        if self.metrics is not None:
+            self.metrics.record_wait(seconds, timed_out)
+
+    def recreate(self):
+        # dispose()/recreate() создают новый пул того же класса — метрики общие
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+# Логгер пула именуется по классу; пулы с замером пишут в логгеры пулов
+# SQLAlchemy, чтобы сообщения о dispose/recreate включались, как и раньше,
+# только через echo_pool или уровень логгера sqlalchemy.pool
+class TimedQueuePool(_TimedGetMixin, QueuePool):
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+
+
+class TimedAsyncAdaptedQueuePool(_TimedGetMixin, AsyncAdaptedQueuePool):
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+
+def instrument_engine(engine) -> PoolMetrics:
+    """Подключает сбор метрик к пулу движка (sync или AsyncEngine.sync_engine)."""
+    metrics = PoolMetrics()
+    pool = engine.pool
+    pool.metrics = metrics
+
+    event.listen(engine, "connect", lambda *args: metrics.increment("connects"))
+    event.listen(engine, "checkout", lambda *args: metrics.increment("checkouts"))
+    event.listen(engine, "checkin", lambda *args: metrics.increment("checkins"))
+    event.listen(engine, "invalidate", lambda *args: metrics.increment("invalidations"))
+    return metrics
+
+
+def pool_status(engine, metrics: PoolMetrics) -> dict:
+    """Текущее состояние пула и накопленные метрики."""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    status.update(metrics.snapshot())
+    return status
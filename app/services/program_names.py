@@ -0,0 +1,76 @@
+"""
+Разбор наименований образовательных программ.
+
+Наименование вида "09.04.04 Программная инженерия (Автоматизированные
+информационные системы)" раскладывается на код, направление, профиль, уровень
+образования (по второй группе кода) и год, если он указан в строке. Шаблоны
+скомпилированы один раз, результаты кэшируются: в кадровых справках одни и те
+же программы повторяются у сотен преподавателей.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+
+_CODE = re.compile(r"^\s*(\d{2}\.\d{2}\.\d{2})(?!\d)")
+_PROFILE = re.compile(r"\((.*?)\)")
+_YEAR = re.compile(r"(?<![\d.])((?:19|20)\d{2})(?![\d.])")
+
+# Вторая группа кода специальности -> уровень образования
+LEVELS = {
+    "01": "СПО (квалифицированные рабочие)",
+    "02": "СПО (специалисты среднего звена)",
+    "03": "бакалавриат",
+    "04": "магистратура",
+    "05": "специалитет",
+    "06": "аспирантура",
+    "07": "адъюнктура",
+    "08": "ординатура",
+    "09": "ассистентура-стажировка",
+}
+
+
+@dataclass(frozen=True)
+class ProgramName:
+    name: str  # Исходное наименование (без крайних пробелов)
+    code: Optional[str]  # Код направления: 09.04.04
+    direction: str  # Направление подготовки
+    profile: Optional[str]  # Профиль (текст в первых скобках)
+    level: Optional[str]  # Уровень образования по коду
+    year: Optional[int]  # Год, если указан в наименовании
+
+    def short_name(self, year: int) -> str:
+        """
+        short_name программы: первое слово наименования, инициалы профиля и год.
+        Для пустого наименования — "Unknown".
+        """
+        if not self.name:
+            return "Unknown"
+        profile = "UNKNOWN" if self.profile is None else self.profile
+        initials = "".join(word[0] for word in profile.split())
+        return f"{self.name.split()[0]}_{initials}_{year}"
+
+
+@lru_cache(maxsize=4096)
+def parse_program_name(program_name: str) -> ProgramName:
+    """Разбирает наименование программы (результат кэшируется)."""
+    name = program_name.strip()
+    code_match = _CODE.match(name)
+    code = code_match.group(1) if code_match else None
+
+    profile_match = _PROFILE.search(name)
+    profile = profile_match.group(1) if profile_match else None
+
+    direction_end = profile_match.start() if profile_match else len(name)
+    direction = name[code_match.end() if code_match else 0:direction_end].strip()
+
+    years = _YEAR.findall(name)
+    return ProgramName(
+        name=name,
+        code=code,
+        direction=direction,
+        profile=profile,
+        level=LEVELS.get(code.split(".")[1]) if code else None,
+        year=int(years[-1]) if years else None,
+    )
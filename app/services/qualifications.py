@@ -0,0 +1,52 @@
+"""
+Разбор сведений о повышении квалификации и профессиональной переподготовке
+из кадровой справки.
+
+Ячейка содержит курсы подряд, каждый в виде "Название. 72 часа. Организация.
+15.11.2022." Ячейка разбирается одним проходом скомпилированного шаблона: курс
+заканчивается датой, из неё берётся год. Переподготовкой считается курс от
+RETRAINING_MIN_HOURS часов (нижняя граница программ профессиональной
+переподготовки) или курс со словом "переподготовка" в названии; остальные —
+повышение квалификации.
+"""
+import re
+
+
+RETRAINING_MIN_HOURS = 250
+
+_COURSE = re.compile(
+    r"\s*(?P<body>.+?)\s*\d{2}\.\d{2}\.(?P<year>\d{4})\s*(?:г\.)?\.?", re.S
+)
+_HOURS = re.compile(r"(?<!\d)(?P<hours>\d+)\s*(?:ак(?:адемических|\.)?\s*)?час", re.I)
+_RETRAINING = re.compile(r"переподготов", re.I)
+_SPACES = re.compile(r"\s+")
+
+
+def parse_courses(raw: str) -> tuple:
+    """
+    Разбирает ячейку сведений о курсах.
+    Возвращает (повышения квалификации, переподготовки) — списки словарей
+    {"program_name", "year"} в порядке ячейки, без повторов.
+    """
+    qualifications, retrainings = [], []
+    seen = set()
+    for match in _COURSE.finditer(raw or ""):
+        body = _SPACES.sub(" ", match.group("body"))
+        hours_match = _HOURS.search(body)
+        title = body[: hours_match.start()] if hours_match else body
+        title = title.strip().rstrip(".").strip()
+        if not title:
+            continue
+
+        year = int(match.group("year"))
+        retraining = bool(_RETRAINING.search(title)) or (
+            hours_match is not None
+            and int(hours_match.group("hours")) >= RETRAINING_MIN_HOURS
+        )
+        key = (retraining, title, year)
+        if key in seen:
+            continue
+        seen.add(key)
+        course = {"program_name": title, "year": year}
+        (retrainings if retraining else qualifications).append(course)
+    return qualifications, retrainings
@@ -0,0 +1,146 @@
+"""
+Метрики запросов: число SQL-запросов, время в БД и время обработки по маршрутам.
+
+SQL-запросы считаются событиями before/after_cursor_execute движков. Счётчик
+текущего HTTP-запроса хранится в contextvar, поэтому запросы из синхронных
+эндпоинтов (пул потоков) и асинхронных (asyncpg) попадают в свой HTTP-запрос.
+Накопленные значения по маршрутам отдаются в текстовом формате Prometheus.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+
+# Число SQL-запросов на HTTP-запрос, выше которого пишется предупреждение
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "20"))
+
+
+class RequestStats:
+    """SQL-активность одного HTTP-запроса."""
+
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request() -> RequestStats:
+    stats = RequestStats()
+    _current.set(stats)
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None and conn.info.get("query_start"):
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - conn.info["query_start"].pop()
+
+
+def instrument_queries(engine):
+    """Подключает подсчёт запросов к движку (sync или AsyncEngine.sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RouteMetrics:
+    """Суммарные показатели по маршрутам для /metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)  # (method, route, status) -> count
+        self._totals = defaultdict(lambda: [0, 0, 0.0, 0.0])  # (method, route) -> [n, queries, db, total]
+        self._over_budget = defaultdict(int)
+
+    def observe(self, method: str, route: str, status: int, stats: RequestStats, elapsed: float):
+        with self._lock:
+            self._requests[(method, route, status)] += 1
+            totals = self._totals[(method, route)]
+            totals[0] += 1
+            totals[1] += stats.queries
+            totals[2] += stats.db_time
+            totals[3] += elapsed
+            if stats.queries > QUERY_BUDGET:
+                self._over_budget[(method, route)] += 1
+
+    def render(self) -> str:
+        """Показатели в текстовом формате Prometheus (version 0.0.4)."""
+        with self._lock:
+            requests = sorted(self._requests.items())
+            totals = sorted((key, list(value)) for key, value in self._totals.items())
+            over_budget = sorted(self._over_budget.items())
+
+        lines = [
+            "# HELP http_requests_total HTTP requests by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in requests:
+            lines.append(
+                f'http_requests_total{{{_labels(method, route)},status="{status}"}} {count}'
+            )
+
+        series = (
+            ("http_request_duration_seconds", "summary", "Time spent handling requests.", 3),
+            ("db_queries", "summary", "SQL statements issued per request.", 1),
+            ("db_query_duration_seconds", "summary", "Time spent in SQL per request.", 2),
+        )
+        for name, kind, help_text, index in series:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (method, route), values in totals:
+                labels = _labels(method, route)
+                lines.append(f"{name}_sum{{{labels}}} {_number(values[index])}")
+                lines.append(f"{name}_count{{{labels}}} {values[0]}")
+
+        lines.append("# HELP db_query_budget_exceeded_total Requests over the SQL query budget.")
+        lines.append("# TYPE db_query_budget_exceeded_total counter")
+        for (method, route), count in over_budget:
+            lines.append(f"db_query_budget_exceeded_total{{{_labels(method, route)}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(method: str, route: str) -> str:
+    return f'method="{_escape(method)}",route="{_escape(route)}"'
+
+
+def _number(value) -> str:
+    return f"{value:.6f}" if isinstance(value, float) else str(value)
+
+
+def route_label(scope: dict) -> str:
+    """Шаблон пути маршрута (/api/teachers/{teacher_id}), а не конкретный URL."""
+    route = scope.get("route")
+    if route is not None and hasattr(route, "path"):
+        return route.path
+    return scope.get("root_path") or "unmatched"
+
+
+def server_timing(stats: RequestStats, elapsed: float) -> str:
+    db_ms = stats.db_time * 1000
+    total_ms = elapsed * 1000
+    return (
+        f'db;dur={db_ms:.1f};desc="{stats.queries} queries", '
+        f"app;dur={max(total_ms - db_ms, 0.0):.1f}, "
+        f"total;dur={total_ms:.1f}"
+    )
+
+
+route_metrics = RouteMetrics()
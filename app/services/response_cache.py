@@ -0,0 +1,85 @@
+"""
+Кэш ответов для редко меняющихся данных.
+
+Данные меняются только при импорте и действиях администратора, поэтому каждая
+запись в БД увеличивает номер версии данных (bump_data_version). Ответы хранятся
+уже сериализованными под ключом (имя, версия), а ETag строится из версии —
+повторный запрос с тем же If-None-Match получает 304 без обращения к БД.
+Кэш живёт в памяти процесса.
+"""
+import threading
+import uuid
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+
+
+# Версия данных уникальна в пределах запуска процесса
+_instance = uuid.uuid4().hex[:8]
+_version = 0
+_entries = {}
+_lock = threading.Lock()
+
+
+def current_version() -> int:
+    with _lock:
+        return _version
+
+
+def bump_data_version():
+    """Отмечает изменение данных: все закэшированные ответы устаревают."""
+    global _version
+    with _lock:
+        _version += 1
+        _entries.clear()
+
+
+def etag_for(name: str, version: int) -> str:
+    return f'"{name}-{_instance}-{version}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Ответ 304, если клиент уже имеет актуальную версию."""
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def get_cached(name: str, version: int) -> Optional[bytes]:
+    with _lock:
+        return _entries.get((name, version))
+
+
+def store(name: str, version: int, body: bytes):
+    with _lock:
+        # Пока строился ответ, данные могли измениться — устаревшее не кладём
+        if version == _version:
+            _entries[(name, version)] = body
+
+
+def json_response(body: bytes, etag: str) -> Response:
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
+
+
+async def cached_json(request: Request, name: str, build: Callable) -> Response:
+    """
+    Отдаёт ответ с ETag: 304 при совпадении If-None-Match, иначе тело из кэша
+    или результат build() — корутины, возвращающей сериализованный JSON.
+    """
+    version = current_version()
+    etag = etag_for(name, version)
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
+    body = get_cached(name, version)
+    if body is None:
+        body = await build()
+        store(name, version, body)
+    return json_response(body, etag)
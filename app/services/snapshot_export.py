@@ -0,0 +1,184 @@
+"""
+Выгрузка снимка данных для аналитики.
+
+Программы, учебные планы, преподаватели, их связи и курсы выгружаются по
+таблице в файл: Parquet или Arrow IPC (нужен pyarrow), а без pyarrow — CSV.
+Файлы собираются в один zip вместе с manifest.json (формат, время, число строк).
+
+Строки читаются курсором на стороне сервера (stream_results) порциями по
+EXPORT_BATCH_SIZE и сразу дописываются в файл, поэтому память не растёт с
+объёмом базы. В PostgreSQL все таблицы читаются в одной транзакции
+REPEATABLE READ — снимок согласован.
+"""
+import csv
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.database import engine
+from app.models import (
+    Curriculum,
+    EducationProgram,
+    Qualification,
+    Retraining,
+    TaughtDiscipline,
+    Teacher,
+    teacher_program_association,
+)
+from app.services.uploads import SPOOL_DIR
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Без pyarrow доступен только CSV
+    pa = pq = None
+
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+# По умолчанию архивы пишутся в спул загрузок: брошенные (клиент оборвал
+# скачивание, процесс упал) удалит cleanup_spool при старте
+EXPORT_DIR = os.getenv("EXPORT_DIR", SPOOL_DIR)
+
+EXPORT_TABLES = (
+    EducationProgram.__table__,
+    Curriculum.__table__,
+    Teacher.__table__,
+    teacher_program_association,
+    TaughtDiscipline.__table__,
+    Qualification.__table__,
+    Retraining.__table__,
+)
+
+# Формат -> расширение файла таблицы
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+
+def available_formats() -> tuple:
+    return tuple(FORMATS) if pa is not None else ("csv",)
+
+
+def default_format() -> str:
+    return "parquet" if pa is not None else "csv"
+
+
+def _arrow_type(column):
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = str
+    if python_type is bool:
+        return pa.bool_()
+    if python_type is int:
+        return pa.int64()
+    if python_type is float:
+        return pa.float64()
+    if python_type is datetime:
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def _arrow_schema(table):
+    return pa.schema([pa.field(column.name, _arrow_type(column)) for column in table.columns])
+
+
+def _record_batch(schema, rows):
+    columns = list(zip(*rows))
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def _write_parquet(path, table, batches):
+    schema = _arrow_schema(table)
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for rows in batches:
+            writer.write_batch(_record_batch(schema, rows))
+
+
+def _write_arrow(path, table, batches):
+    schema = _arrow_schema(table)
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, schema, options=options) as writer:
+        for rows in batches:
+            writer.write_batch(_record_batch(schema, rows))
+
+
+def _write_csv(path, table, batches):
+    # utf-8-sig: Excel открывает кириллицу без выбора кодировки
+    with open(path, "w", encoding="utf-8-sig", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow([column.name for column in table.columns])
+        for rows in batches:
+            writer.writerows(rows)
+
+
+_WRITERS = {"parquet": _write_parquet, "arrow": _write_arrow, "csv": _write_csv}
+
+
+def _batches(connection, table, counter: list):
+    """Строки таблицы порциями из серверного курсора; counter[0] — число строк."""
+    order = list(table.primary_key.columns) or list(table.columns)
+    result = connection.execution_options(
+        stream_results=True, max_row_buffer=EXPORT_BATCH_SIZE
+    ).execute(select(table).order_by(*order))
+    for rows in result.partitions(EXPORT_BATCH_SIZE):
+        counter[0] += len(rows)
+        yield rows
+
+
+def write_snapshot(fmt: str) -> str:
+    """
+    Записывает снимок в формате fmt в zip-файл в EXPORT_DIR и возвращает путь
+    к нему. Файл удаляет вызывающий код после отдачи клиенту.
+    """
+    if fmt not in available_formats():
+        raise ValueError(f"Формат {fmt} недоступен")
+
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, archive_path = tempfile.mkstemp(suffix=".zip", dir=EXPORT_DIR)
+    os.close(fd)
+    work_dir = tempfile.mkdtemp(dir=EXPORT_DIR)
+    manifest = {
+        "format": fmt,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "batch_size": EXPORT_BATCH_SIZE,
+        "tables": {},
+    }
+    try:
+        # Таблицы уже сжаты (Parquet/Arrow) — в архиве хранятся как есть
+        compression = zipfile.ZIP_DEFLATED if fmt == "csv" else zipfile.ZIP_STORED
+        with engine.connect() as connection, zipfile.ZipFile(
+            archive_path, "w", compression=compression, allowZip64=True
+        ) as archive:
+            if connection.dialect.name == "postgresql":
+                connection.execution_options(
+                    isolation_level="REPEATABLE READ", postgresql_readonly=True
+                )
+            with connection.begin():
+                for table in EXPORT_TABLES:
+                    file_name = table.name + FORMATS[fmt]
+                    table_path = os.path.join(work_dir, file_name)
+                    counter = [0]
+                    _WRITERS[fmt](table_path, table, _batches(connection, table, counter))
+                    archive.write(table_path, file_name)
+                    os.remove(table_path)
+                    manifest["tables"][table.name] = {
+                        "file": file_name,
+                        "rows": counter[0],
+                        "columns": [column.name for column in table.columns],
+                    }
+            archive.writestr(
+                "manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2)
+            )
+    except Exception:
+        os.remove(archive_path)
+        raise
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return archive_path
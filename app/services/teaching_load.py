@@ -0,0 +1,117 @@
+"""
+Сводная учебная нагрузка: часы учебных планов по программам, кафедрам
+и преподавателям.
+
+Итоги хранятся в таблицах load_by_program, load_by_department и load_by_teacher
+и пересчитываются только по затронутым ключам (одна группировка на таблицу) в
+той же транзакции, что и импорт, — отчёты читают готовые строки и не сканируют
+curriculum. rebuild_load пересчитывает всё (после ручных правок в БД).
+"""
+from typing import Iterable
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Curriculum,
+    DepartmentLoad,
+    ProgramLoad,
+    TaughtDiscipline,
+    TeacherLoad,
+)
+
+
+HOUR_FIELDS = (
+    "lecture_hours",
+    "practice_hours",
+    "lab_hours",
+    "exam_hours",
+    "test_hours",
+    "course_project_hours",
+    "total_practice_hours",
+    "final_work_hours",
+)
+TOTAL_FIELDS = ("disciplines",) + HOUR_FIELDS + ("total_hours",)
+
+
+def _totals():
+    """Агрегаты по строкам curriculum в порядке TOTAL_FIELDS."""
+    hours = [func.coalesce(getattr(Curriculum, field), 0) for field in HOUR_FIELDS]
+    row_total = hours[0]
+    for column in hours[1:]:
+        row_total = row_total + column
+    return (
+        [func.count(Curriculum.curriculum_id)]
+        + [func.coalesce(func.sum(column), 0) for column in hours]
+        + [func.coalesce(func.sum(row_total), 0)]
+    )
+
+
+# Таблица итогов -> (её ключ, ключ группировки, FROM для группировки)
+_SOURCES = {
+    ProgramLoad: ("program_id", Curriculum.program_id, Curriculum.__table__),
+    DepartmentLoad: ("department", Curriculum.department, Curriculum.__table__),
+    TeacherLoad: (
+        "teacher_id",
+        TaughtDiscipline.teacher_id,
+        TaughtDiscipline.__table__.join(
+            Curriculum.__table__,
+            TaughtDiscipline.curriculum_id == Curriculum.curriculum_id,
+        ),
+    ),
+}
+
+
+def _refresh(db: Session, model, keys=None):
+    """Пересчитывает строки model по ключам keys (None — все строки)."""
+    key_name, group_key, source = _SOURCES[model]
+    key_column = getattr(model, key_name)
+    query = select(group_key, *_totals()).select_from(source).where(group_key.is_not(None))
+
+    if keys is None:
+        db.execute(delete(model))
+    else:
+        keys = sorted({key for key in keys if key is not None})
+        if not keys:
+            return
+        db.execute(delete(model).where(key_column.in_(keys)))
+        query = query.where(group_key.in_(keys))
+
+    db.execute(
+        insert(model).from_select(
+            [key_name, *TOTAL_FIELDS], query.group_by(group_key)
+        )
+    )
+
+
+def refresh_load(
+    db: Session,
+    program_ids: Iterable[int] = (),
+    departments: Iterable[str] = (),
+    teacher_ids: Iterable[int] = (),
+):
+    """
+    Пересчитывает итоги затронутых программ, кафедр и преподавателей.
+    Вызывается до фиксации транзакции, в которой менялись планы или связи.
+    """
+    _refresh(db, ProgramLoad, program_ids)
+    _refresh(db, DepartmentLoad, departments)
+    _refresh(db, TeacherLoad, teacher_ids)
+
+
+def rebuild_load(db: Session):
+    """Полный пересчёт всех итогов (без фиксации транзакции)."""
+    for model in _SOURCES:
+        _refresh(db, model)
+
+
+def program_teacher_ids(db: Session, program_id: int) -> set:
+    """Преподаватели, ведущие дисциплины программы (их итоги зависят от её плана)."""
+    return set(
+        db.scalars(
+            select(TaughtDiscipline.teacher_id)
+            .join(Curriculum, TaughtDiscipline.curriculum_id == Curriculum.curriculum_id)
+            .where(Curriculum.program_id == program_id)
+            .distinct()
+        )
+    )
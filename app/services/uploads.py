@@ -0,0 +1,214 @@
+"""
+Приём загружаемых файлов.
+
+Файл копируется из запроса порциями в отдельный каталог-спул (UPLOAD_SPOOL_DIR)
+под уникальным именем, без чтения целиком в память. Размер ограничен
+UPLOAD_MAX_BYTES (413 при превышении), SHA-256 содержимого считается по ходу
+копирования. Файлы удаляются после импорта или при ошибке, а оставшиеся от
+прерванных запусков — при старте приложения (cleanup_spool).
+
+Из zip-архива в спул распаковываются только файлы с нужными расширениями;
+распакованный объём ограничен UPLOAD_ARCHIVE_MAX_BYTES, число файлов —
+UPLOAD_ARCHIVE_MAX_MEMBERS.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+
+logger = logging.getLogger(__name__)
+
+SPOOL_DIR = os.getenv(
+    "UPLOAD_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "kadrsp-uploads")
+)
+MAX_UPLOAD_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+# Файлы старше этого возраста считаются брошенными (другие воркеры могут
+# в этот момент импортировать свежие файлы)
+SPOOL_STALE_SECONDS = int(os.getenv("UPLOAD_SPOOL_STALE_SECONDS", "3600"))
+CHUNK_SIZE = 1024 * 1024
+ARCHIVE_MAX_MEMBERS = int(os.getenv("UPLOAD_ARCHIVE_MAX_MEMBERS", "200"))
+ARCHIVE_MAX_BYTES = int(os.getenv("UPLOAD_ARCHIVE_MAX_BYTES", str(500 * 1024 * 1024)))
+
+
+@dataclass
+class SpooledUpload:
+    path: str
+    filename: str
+    size: int
+    sha256: str
+
+
+def _check_extension(file: UploadFile, extensions: tuple, message: str):
+    if not (file.filename or "").lower().endswith(extensions):
+        raise HTTPException(status_code=400, detail=message)
+
+
+def _too_large():
+    return HTTPException(
+        status_code=413,
+        detail=f"Файл больше допустимого размера ({MAX_UPLOAD_BYTES / (1024 * 1024):.1f} МБ)",
+    )
+
+
+def _open_spool_file(suffix: str):
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=SPOOL_DIR)
+    return os.fdopen(fd, "wb"), path
+
+
+def _suffix(filename: str) -> str:
+    return os.path.splitext(filename or "")[1].lower()
+
+
+async def spool_upload(file: UploadFile, extensions: tuple, message: str) -> SpooledUpload:
+    """Копирует загруженный файл в спул порциями (для async-эндпоинтов)."""
+    _check_extension(file, extensions, message)
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise _too_large()
+
+    digest = hashlib.sha256()
+    size = 0
+    target, path = _open_spool_file(_suffix(file.filename))
+    try:
+        with target:
+            while chunk := await file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise _too_large()
+                digest.update(chunk)
+                await run_in_threadpool(target.write, chunk)
+    except BaseException:
+        remove_spooled(path)
+        raise
+    return SpooledUpload(path, file.filename, size, digest.hexdigest())
+
+
+def spool_upload_sync(file: UploadFile, extensions: tuple, message: str) -> SpooledUpload:
+    """То же для синхронных эндпоинтов (выполняются в пуле потоков)."""
+    _check_extension(file, extensions, message)
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise _too_large()
+
+    digest = hashlib.sha256()
+    size = 0
+    target, path = _open_spool_file(_suffix(file.filename))
+    try:
+        with target:
+            while chunk := file.file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise _too_large()
+                digest.update(chunk)
+                target.write(chunk)
+    except BaseException:
+        remove_spooled(path)
+        raise
+    return SpooledUpload(path, file.filename, size, digest.hexdigest())
+
+
+def _member_name(info: zipfile.ZipInfo) -> str:
+    """Имя файла архива без каталогов. Без флага UTF-8 имена из Windows — в cp866."""
+    name = info.filename
+    if not info.flag_bits & 0x800:
+        try:
+            name = name.encode("cp437").decode("cp866")
+        except UnicodeError:
+            pass
+    return name.replace("\\", "/").rsplit("/", 1)[-1]
+
+
+def spool_zip_members(zip_path: str, extensions: tuple) -> Tuple[List[SpooledUpload], List[str]]:
+    """
+    Распаковывает из архива в спул файлы с расширениями extensions (по порядку
+    в архиве). Возвращает распакованные файлы и имена пропущенных. Размер
+    считается по фактически распакованным байтам, а не по заголовкам архива.
+    """
+    try:
+        archive = zipfile.ZipFile(zip_path)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Файл не является zip-архивом")
+
+    members, skipped = [], []
+    total = 0
+    try:
+        with archive:
+            for info in archive.infolist():
+                if info.is_dir() or info.filename.startswith("__MACOSX/"):
+                    continue
+                name = _member_name(info)
+                # ~$ — файлы блокировки Office, попадающие в архив вместе с документами
+                if name.startswith(("~$", ".")) or not name.lower().endswith(extensions):
+                    skipped.append(name)
+                    continue
+                if len(members) >= ARCHIVE_MAX_MEMBERS:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"В архиве больше {ARCHIVE_MAX_MEMBERS} файлов для импорта",
+                    )
+
+                digest = hashlib.sha256()
+                size = 0
+                target, path = _open_spool_file(_suffix(name))
+                members.append(SpooledUpload(path, name, 0, ""))
+                with target, archive.open(info) as source:
+                    while chunk := source.read(CHUNK_SIZE):
+                        size += len(chunk)
+                        total += len(chunk)
+                        if size > MAX_UPLOAD_BYTES:
+                            raise _too_large()
+                        if total > ARCHIVE_MAX_BYTES:
+                            raise HTTPException(
+                                status_code=413,
+                                detail="Распакованный архив больше допустимого размера "
+                                f"({ARCHIVE_MAX_BYTES / (1024 * 1024):.1f} МБ)",
+                            )
+                        digest.update(chunk)
+                        target.write(chunk)
+                members[-1].size = size
+                members[-1].sha256 = digest.hexdigest()
+    except BaseException as e:
+        for member in members:
+            remove_spooled(member.path)
+        if isinstance(e, (zipfile.BadZipFile, zlib.error, EOFError, RuntimeError, NotImplementedError)):
+            # Повреждённый архив, шифрование или неподдерживаемое сжатие
+            raise HTTPException(status_code=400, detail=f"Не удалось распаковать архив: {e}")
+        raise
+    return members, skipped
+
+
+def remove_spooled(path: str):
+    """Удаляет файл из спула; отсутствие файла не считается ошибкой."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning("Не удалось удалить загруженный файл %s: %s", path, e)
+
+
+def cleanup_spool(max_age: int = SPOOL_STALE_SECONDS) -> int:
+    """Удаляет из спула файлы старше max_age секунд. Возвращает их число."""
+    if not os.path.isdir(SPOOL_DIR):
+        return 0
+    removed = 0
+    threshold = time.time() - max_age
+    with os.scandir(SPOOL_DIR) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < threshold:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError as e:
+                logger.warning("Не удалось удалить %s из спула: %s", entry.path, e)
+    if removed:
+        logger.info("Из спула загрузок удалено брошенных файлов: %d", removed)
+    return removed
@@ -13,8 +13,8 @@ async function uploadFile() {
     try {
         showStatus('Идет импорт данных...', 'info');
         
-        // Отправка файла на сервер
-        const response = await fetch('/import/teachers', {
+        // Отправка файла на сервер: импорт выполняется в фоне
+        const response = await fetch('/import/teachers/import', {
             method: 'POST',
             body: formData
         });
@@ -23,110 +23,150 @@ async function uploadFile() {
             throw new Error(`Ошибка: ${response.statusText}`);
         }
 
-        showStatus('Импорт завершен, ожидаем данные...', 'info');
-        await pollTeachers(); // Проверяем, появились ли данные
+        const job = await response.json();
+        await pollImportJob(job.job_id); // Ждем завершения задания импорта
+        await loadTeachers();
+        showStatus('Данные успешно загружены!', 'success');
     } catch (error) {
         showStatus(`Ошибка: ${error.message}`, 'danger');
     }
 }
 
-async function loadTeachers() {
+// Состояние списка преподавателей: страницы запрашиваются у сервера по курсору
+const teachersQuery = {
+    sort: 'full_name',
+    limit: 50,
+    nextCursor: null,
+};
+
+const TEACHER_COLUMNS = [
+    'full_name',
+    'position',
+    'total_experience',
+    'teaching_experience',
+    'professional_experience',
+    'education_level',
+    'academic_degree',
+    'academic_title',
+    'disciplines_raw',
+    'qualifications_raw',
+    'programs',
+];
+
+function teacherFilters() {
+    const filters = {};
+    ['position', 'degree', 'department'].forEach(name => {
+        const input = document.getElementById(`filter-${name}`);
+        if (input && input.value.trim()) {
+            filters[name] = input.value.trim();
+        }
+    });
+    return filters;
+}
+
+function teacherRow(teacher) {
+    const row = document.createElement('tr');
+    TEACHER_COLUMNS.forEach(column => {
+        const cell = document.createElement('td');
+        const value = column === 'programs'
+            ? teacher.programs.map(p => p.program_name).join(', ')
+            : teacher[column];
+        cell.textContent = value ?? '';
+        row.appendChild(cell);
+    });
+    return row;
+}
+
+// append = true — дописать следующую страницу к уже показанным строкам
+async function loadTeachers(append = false) {
     try {
-        const response = await fetch('/api/teachers'); // Предполагается, что есть API для получения данных
-        const teachers = await response.json();
+        const params = new URLSearchParams({
+            sort: teachersQuery.sort,
+            limit: teachersQuery.limit,
+            ...teacherFilters(),
+        });
+        if (append && teachersQuery.nextCursor) {
+            params.set('cursor', teachersQuery.nextCursor);
+        }
+
+        const response = await fetch(`/api/teachers?${params}`);
+        if (!response.ok) {
+            throw new Error(`Ошибка: ${response.statusText}`);
+        }
+        const page = await response.json();
+
+        // Строки собираются во фрагменте и добавляются в таблицу за одну вставку
+        const fragment = document.createDocumentFragment();
+        page.items.forEach(teacher => fragment.appendChild(teacherRow(teacher)));
 
         const teachersList = document.getElementById('teachersList');
-        teachersList.innerHTML = ''; // Очищаем таблицу перед заполнением
-
-        teachers.forEach(teacher => {
-            const row = document.createElement('tr');
-            row.innerHTML = `
-                <td>${teacher.full_name}</td>
-                <td>${teacher.position}</td>
-                <td>${teacher.total_experience}</td>
-                <td>${teacher.teaching_experience}</td>
-                <td>${teacher.professional_experience}</td>
-                <td>${teacher.education_level}</td>
-                <td>${teacher.academic_degree}</td>
-                <td>${teacher.academic_title}</td>
-                <td>${teacher.disciplines_raw}</td>
-                <td>${teacher.qualifications_raw}</td>
-                <td>${teacher.programs_raw}</td>
-            `;
-            teachersList.appendChild(row);
-        });
+        if (append) {
+            teachersList.appendChild(fragment);
+        } else {
+            teachersList.replaceChildren(fragment);
+        }
+
+        teachersQuery.nextCursor = page.next_cursor;
+        const moreButton = document.getElementById('loadMoreTeachers');
+        if (moreButton) {
+            moreButton.style.display = page.next_cursor ? 'inline-block' : 'none';
+        }
     } catch (error) {
         console.error('Ошибка загрузки преподавателей:', error);
     }
 }
 
+function loadMoreTeachers() {
+    return loadTeachers(true);
+}
+
+// Сортировка выполняется сервером; повторный щелчок меняет направление
+function sortTeachersBy(field) {
+    teachersQuery.sort = teachersQuery.sort === field ? `-${field}` : field;
+    teachersQuery.nextCursor = null;
+    return loadTeachers();
+}
+
+function sortTeachersByName() {
+    return sortTeachersBy('full_name');
+}
+
+function applyTeacherFilters(event) {
+    if (event) {
+        event.preventDefault();
+    }
+    teachersQuery.nextCursor = null;
+    return loadTeachers();
+}
+
 // // Загружаем преподавателей при загрузке страницы
 // document.addEventListener('DOMContentLoaded', loadTeachers);
 
-async function pollTeachers(interval = 2000, maxAttempts = 10) {
-    let attempts = 0;
-
-    while (attempts < maxAttempts) {
-        try {
-            const response = await fetch('/api/teachers');
-            if (response.ok) {
-                const teachers = await response.json();
-                if (teachers.length > 0) {
-                    teachersData = teachers; // Сохраняем данные
-                    teachersData.sort((a, b) => {
-                        if (a.full_name < b.full_name) return -1;
-                        if (a.full_name > b.full_name) return 1;
-                        return 0;
-                    });
-                    renderTeachersTable(teachersData); // Отображаем таблицу
-                    showStatus('Данные успешно загружены!', 'success');
-                    return;
-                }
-            }
-        } catch (error) {
-            console.error('Ошибка при проверке данных:', error);
+// Опрос состояния задания импорта до его завершения
+async function pollImportJob(jobId, interval = 1000, maxAttempts = 600) {
+    for (let attempts = 0; attempts < maxAttempts; attempts++) {
+        const response = await fetch(`/import/jobs/${jobId}`);
+        if (!response.ok) {
+            throw new Error(`Ошибка: ${response.statusText}`);
+        }
+
+        const job = await response.json();
+        if (job.status === 'done') {
+            return job;
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.errors.map(e => e.message || JSON.stringify(e)).join('; '));
         }
 
-        attempts++;
+        const progress = job.phase === 'writing' ? `, записывается строк: ${job.rows_parsed}` : '';
+        showStatus(`Идет импорт данных (${job.phase}${progress})...`, 'info');
         await new Promise(resolve => setTimeout(resolve, interval)); // Ждем перед следующей попыткой
     }
 
-    showStatus('Не удалось загрузить данные. Попробуйте обновить страницу.', 'danger');
+    throw new Error('Импорт не завершился вовремя. Попробуйте обновить страницу.');
 }
 
-let teachersData = []; // Глобальная переменная для хранения данных преподавателей
-let isAscending = true; // Флаг для переключения направления сортировки
-
-function sortTeachersByName() {
-    // Сортируем массив преподавателей по ФИО
-    teachersData.sort((a, b) => {
-        if (a.full_name < b.full_name) return isAscending ? -1 : 1;
-        if (a.full_name > b.full_name) return isAscending ? 1 : -1;
-        return 0;
-    });
-    
-    isAscending = !isAscending; // Переключаем направление сортировки
-    renderTeachersTable(teachersData); // Обновляем таблицу
-}
-
-function renderTeachersTable(teachers) {
-    const tbody = document.getElementById('teachersList');
-    tbody.innerHTML = ''; // Очистка таблицы перед добавлением данных
-    
-    teachers.forEach(teacher => {
-        const qualifications = teacher.qualifications.map(q => q.name).join(', ');
-        tbody.innerHTML += `
-            <tr>
-                <td>${teacher.full_name}</td>
-                <td>${teacher.position}</td>
-                <td>${teacher.education_level}</td>
-                <td>${qualifications}</td>
-            </tr>
-        `;
-    });
-}
-
-document.addEventListener('DOMContentLoaded', loadTeachers);
+document.addEventListener('DOMContentLoaded', () => loadTeachers());
 
 function showStatus(message, type = 'info') {
     const statusDiv = document.getElementById('status');
@@ -140,5 +180,3 @@ function showStatus(message, type = 'info') {
         }, 5000);
     }
 }
-
-document.addEventListener('DOMContentLoaded', loadTeachers);
\ No newline at end of file
@@ -26,7 +26,7 @@ async function uploadCurriculum() {
         const submitBtn = document.querySelector('#curriculumForm button');
         submitBtn.disabled = true;
 
-        const response = await fetch('/api/upload-curriculum', {
+        const response = await fetch('/import/upload-curriculum', {
             method: 'POST',
             body: formData
         });
@@ -37,14 +37,14 @@ async function uploadCurriculum() {
             throw new Error(`${response.status}: ${errorText || 'Неизвестная ошибка'}`);
         }
 
-        // Обработка бизнес-логики ошибок
-        const result = await response.json();
-        if (result.error) {
-            throw new Error(result.error);
+        // Импорт выполняется в фоне: ждем завершения задания
+        const job = await waitForImportJob((await response.json()).job_id);
+        if (job.status === 'failed') {
+            throw new Error(job.errors.map(e => e.message || JSON.stringify(e)).join('; '));
         }
 
         // Успешная загрузка
-        showStatus(`Загружено ${result.imported} записей`, 'success');
+        showStatus(`Загружено ${job.rows_written} записей`, 'success');
         fileInput.value = ''; // Сброс выбора файла
         
         // Обновление таблицы
@@ -62,4 +62,18 @@ async function uploadCurriculum() {
         const submitBtn = document.querySelector('#curriculumForm button');
         if (submitBtn) submitBtn.disabled = false;
     }
-}
\ No newline at end of file
+}
+
+async function waitForImportJob(jobId, interval = 1000) {
+    while (true) {
+        const response = await fetch(`/import/jobs/${jobId}`);
+        if (!response.ok) {
+            throw new Error(`${response.status}: ${response.statusText}`);
+        }
+        const job = await response.json();
+        if (job.status === 'done' || job.status === 'failed') {
+            return job;
+        }
+        await new Promise(resolve => setTimeout(resolve, interval));
+    }
+}
@@ -0,0 +1,154 @@
+"""
+Бенчмарк пропускной способности при конкурентных запросах.
+
+Сравнивает два варианта одного и того же «медленного» запроса (SELECT pg_sleep):
+- before: async-эндпоинт с синхронной сессией SessionLocal (блокирует цикл событий);
+- after: async-эндпоинт с асинхронной сессией AsyncSessionLocal.
+
+Дополнительно можно прогнать реальные эндпоинты приложения (--endpoints).
+Запросы выполняются прямо через ASGI-интерфейс в одном цикле событий, как в
+одном воркере uvicorn. Нужна работающая PostgreSQL из app/database.py.
+
+Пример:
+    python -m benchmarks.async_concurrency --concurrency 50 --requests 500
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from app.database import SessionLocal, AsyncSessionLocal
+
+
+def build_demo_app(delay: float) -> FastAPI:
+    demo = FastAPI()
+
+    @demo.get("/before")
+    async def sync_session_in_async_endpoint():
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT pg_sleep(:delay)"), {"delay": delay})
+        finally:
+            db.close()
+        return {}
+
+    @demo.get("/after")
+    async def async_session_endpoint():
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SELECT pg_sleep(:delay)"), {"delay": delay})
+        return {}
+
+    return demo
+
+
+async def asgi_get(app, path: str, with_headers: bool = False):
+    """
+    Минимальный GET-запрос к ASGI-приложению. Возвращает HTTP-статус
+    или (статус, заголовки) при with_headers.
+    """
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    status = {}
+    headers = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+            headers.update(
+                (key.decode("latin-1").lower(), value.decode("latin-1"))
+                for key, value in message.get("headers", [])
+            )
+
+    await app(scope, receive, send)
+    if with_headers:
+        return status.get("code", 0), headers
+    return status.get("code", 0)
+
+
+async def measure(app, path: str, concurrency: int, total: int) -> dict:
+    """Выполняет total запросов не более чем по concurrency одновременно."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            code = await asgi_get(app, path)
+            latencies.append(time.perf_counter() - started)
+            if code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+    }
+
+
+async def run(args) -> list:
+    results = []
+    demo = build_demo_app(args.delay)
+    for path in ("/before", "/after"):
+        results.append(await measure(demo, path, args.concurrency, args.requests))
+
+    if args.endpoints:
+        from app.main import app
+
+        for path in args.endpoints:
+            results.append(await measure(app, path, args.concurrency, args.requests))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=0.02, help="длительность pg_sleep, с")
+    parser.add_argument(
+        "--endpoints",
+        nargs="*",
+        default=[],
+        help="пути реальных эндпоинтов, например /curriculum/programs",
+    )
+    parser.add_argument("--output", help="файл для результатов в JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    report = json.dumps(results, ensure_ascii=False, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
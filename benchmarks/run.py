@@ -0,0 +1,251 @@
+"""
+Набор бенчмарков импорта и основных эндпоинтов на синтетических данных.
+
+Шаги: генерация файлов (benchmarks.synthetic), import_education_programs,
+parse_docx, import_teachers_with_programs, parse_excel и запись учебных планов,
+затем GET-запросы к основным эндпоинтам. Для каждого шага сохраняются времена
+повторов и медиана, для эндпоинтов — ещё и число SQL-запросов (из Server-Timing).
+
+По умолчанию используется временная SQLite (для эндпоинтов нужен aiosqlite).
+Для PostgreSQL укажите --database-url и --reset: схема будет пересоздана.
+
+Пример:
+    python -m benchmarks.run --programs 20 --disciplines 60 --teachers 300 \\
+        --output results.json --compare previous.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+
+ENDPOINTS = [
+    "/api/teachers",
+    "/api/teachers/1",
+    "/curriculum/programs",
+    "/curriculum/EducationProgram",
+    "/curriculum/program/1",
+    "/curriculum/?program_id=1",
+    "/reports/load",
+    "/reports/load/teachers",
+]
+
+
+def _async_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _summary(name: str, seconds: list, **extra) -> dict:
+    return dict(
+        name=name,
+        runs=len(seconds),
+        median_ms=round(statistics.median(seconds) * 1000, 3),
+        min_ms=round(min(seconds) * 1000, 3),
+        seconds=[round(s, 6) for s in seconds],
+        **extra,
+    )
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def _reset_schema(engine):
+    from app.models import Base
+
+    # Расширение pg_trgm создаёт сам create_all (см. app/models.py)
+    with engine.begin() as connection:
+        Base.metadata.drop_all(connection)
+        Base.metadata.create_all(connection)
+
+
+def run_imports(files: dict, repeat: int) -> list:
+    """Время разбора и импорта. Импорты повторяются на уже заполненной БД."""
+    from app.database import SessionLocal, engine
+    from app.services.import_utils import (
+        import_education_programs,
+        import_teachers_with_programs,
+        parse_docx,
+        parse_excel,
+        store_curriculum,
+    )
+
+    results = []
+
+    csv_path = files["programs_csv"][0]
+    seconds = []
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            seconds.append(_timed(import_education_programs, csv_path, db)[0])
+        finally:
+            db.close()
+    results.append(_summary("import_education_programs", seconds))
+
+    docx_path = files["staff_docx"][0]
+    seconds = [_timed(parse_docx, docx_path)[0] for _ in range(repeat)]
+    teachers_data = parse_docx(docx_path)
+    results.append(_summary("parse_docx", seconds, rows=len(teachers_data)))
+
+    seconds = []
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            seconds.append(_timed(import_teachers_with_programs, db, teachers_data)[0])
+        finally:
+            db.close()
+    results.append(_summary("import_teachers_with_programs", seconds, rows=len(teachers_data)))
+
+    parse_seconds, store_seconds, rows = [], [], 0
+    for path in files["curriculum_xlsx"]:
+        elapsed, data = _timed(parse_excel, path)
+        parse_seconds.append(elapsed)
+        rows += len(data)
+        db = SessionLocal()
+        try:
+            store_seconds.append(_timed(store_curriculum, db, os.path.basename(path), data)[0])
+        finally:
+            db.close()
+    results.append(_summary("parse_excel", parse_seconds, rows=rows))
+    results.append(_summary("store_curriculum", store_seconds, rows=rows))
+
+    # Связи преподавателей с дисциплинами появляются после загрузки планов
+    db = SessionLocal()
+    try:
+        elapsed = _timed(import_teachers_with_programs, db, teachers_data)[0]
+    finally:
+        db.close()
+    results.append(_summary("import_teachers_with_programs (with curriculum)", [elapsed]))
+
+    engine.dispose()
+    return results
+
+
+async def run_endpoints(repeat: int) -> list:
+    from app.database import async_engine
+    from app.main import app
+    from benchmarks.async_concurrency import asgi_get
+
+    results = []
+    for path in ENDPOINTS:
+        seconds, queries, status = [], None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            status, headers = await asgi_get(app, path, with_headers=True)
+            seconds.append(time.perf_counter() - started)
+            timing = headers.get("server-timing", "")
+            if 'desc="' in timing:
+                # Наибольшее число запросов — у первого, некэшированного ответа
+                count = int(timing.split('desc="', 1)[1].split()[0])
+                queries = max(queries or 0, count)
+        results.append(_summary(f"GET {path}", seconds, status=status, queries=queries))
+
+    await async_engine.dispose()
+    return results
+
+
+def compare(current: dict, previous: dict) -> list:
+    """Отношение медиан текущего прогона к предыдущему по одноимённым шагам."""
+    before = {r["name"]: r for r in previous["results"]}
+    rows = []
+    for result in current["results"]:
+        old = before.get(result["name"])
+        if old and old["median_ms"]:
+            rows.append(
+                {
+                    "name": result["name"],
+                    "previous_ms": old["median_ms"],
+                    "current_ms": result["median_ms"],
+                    "ratio": round(result["median_ms"] / old["median_ms"], 3),
+                }
+            )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки импорта и эндпоинтов")
+    parser.add_argument("--programs", type=int, default=10)
+    parser.add_argument("--disciplines", type=int, default=40, help="дисциплин на программу")
+    parser.add_argument("--teachers", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", help="по умолчанию — временная SQLite")
+    parser.add_argument("--reset", action="store_true", help="пересоздать схему в --database-url")
+    parser.add_argument("--workdir", help="каталог для сгенерированных файлов")
+    parser.add_argument("--output", help="файл для результатов в JSON")
+    parser.add_argument("--compare", help="JSON предыдущего прогона для сравнения")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="kadr-bench-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    if args.database_url and not args.reset:
+        parser.error("для --database-url нужен --reset: схема базы будет пересоздана")
+
+    # Движки приложения создаются при импорте app.database
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["ASYNC_DATABASE_URL"] = _async_url(database_url)
+
+    from app.database import engine
+    from benchmarks.synthetic import generate_institution, write_institution
+
+    started = time.perf_counter()
+    institution = generate_institution(args.programs, args.disciplines, args.teachers, args.seed)
+    files = write_institution(institution, workdir)
+    generate_seconds = time.perf_counter() - started
+
+    _reset_schema(engine)
+    results = [_summary("generate", [generate_seconds])]
+    results += run_imports(files, args.repeat)
+    results += asyncio.run(run_endpoints(args.repeat))
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "scale": {
+                "programs": args.programs,
+                "disciplines": args.disciplines,
+                "teachers": args.teachers,
+                "seed": args.seed,
+                "repeat": args.repeat,
+            },
+        },
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f))
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
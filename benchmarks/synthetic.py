@@ -0,0 +1,280 @@
+"""
+Генератор синтетических данных института для бенчмарков.
+
+Создаёт файлы в тех же форматах, что приходят от пользователей:
+- CSV образовательных программ (program_name, short_name, year);
+- .docx с таблицей кадрового состава (заголовки как в справке по кадрам);
+- учебные планы .xlsx с листами ПланСвод и План (три строки заголовков,
+  блоки по семестрам).
+
+Масштаб задаётся числом программ, дисциплин на программу и преподавателей;
+при одном и том же seed файлы совпадают.
+
+Пример:
+    python -m benchmarks.synthetic --programs 20 --disciplines 60 --teachers 300 --out /tmp/inst
+"""
+import argparse
+import csv
+import os
+import random
+from typing import Dict, List
+
+from docx import Document
+from openpyxl import Workbook
+
+
+YEAR = 2024
+SEMESTERS = 4
+INSTITUTE = "ИИТ"
+
+_DIRECTIONS = [
+    "Прикладная математика",
+    "Прикладная информатика",
+    "Программная инженерия",
+    "Информатика и вычислительная техника",
+    "Информационные системы и технологии",
+    "Информационная безопасность",
+    "Бизнес-информатика",
+    "Статистика",
+]
+_PROFILE_WORDS = [
+    "Анализ", "данных", "Разработка", "программных", "систем", "Управление",
+    "проектами", "Интеллектуальные", "информационные", "технологии", "Цифровая",
+    "экономика", "Архитектура", "распределенных", "Машинное", "обучение",
+]
+_SUBJECTS = [
+    "Математический анализ", "Алгоритмы и структуры данных", "Базы данных",
+    "Операционные системы", "Компьютерные сети", "Машинное обучение",
+    "Теория вероятностей", "Проектирование информационных систем",
+    "Защита информации", "Архитектура ЭВМ", "Программирование на Python",
+    "Технологии разработки программного обеспечения", "Дискретная математика",
+    "Системный анализ", "Облачные вычисления", "Анализ данных",
+]
+_QUALIFIERS = ["", "(продвинутый курс)", "(практикум)", "и их приложения", "в профессиональной сфере"]
+_PRACTICES = ["Ознакомительная практика", "Преддипломная практика", "Выпускная квалификационная работа"]
+_SURNAMES = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов", "Волков", "Соколов", "Лебедев", "Козлов"]
+_NAMES = ["Алексей", "Сергей", "Дмитрий", "Андрей", "Михаил", "Николай", "Павел", "Олег"]
+_PATRONYMICS = ["Николаевич", "Сергеевич", "Владимирович", "Петрович", "Андреевич", "Игоревич"]
+_POSITIONS = ["Ассистент", "Старший преподаватель", "Доцент", "Профессор", "Заведующий кафедрой"]
+_DEGREES = ["отсутствует", "Кандидат технических наук", "Кандидат физико-математических наук", "Доктор технических наук"]
+_TITLES = ["отсутствует", "Доцент", "Профессор"]
+_COURSES = [
+    "Оказание первой помощи",
+    "Электронно-информационная образовательная среда",
+    "Технологии искусственного интеллекта в образовании",
+    "Цифровые инструменты преподавателя",
+]
+_DEPARTMENTS = [
+    "кафедра прикладной математики",
+    "кафедра программной инженерии",
+    "кафедра информационных систем",
+    "кафедра вычислительной техники",
+]
+
+STAFF_HEADERS = [
+    "№",
+    "Ф.И.О.",
+    "Должность преподавателя",
+    "Перечень преподаваемых дисциплин",
+    "Уровень (уровни) профессионального образования, квалификация",
+    "Наименование направления подготовки и (или) специальности, в том числе научной",
+    "Учёная степень (при наличии)",
+    "Учёное звание (при наличии)",
+    "Сведения о повышении квалификации (за последние 3 года) и сведения о профессиональной переподготовке (при наличии)",
+    "Общий стаж работы",
+    "Стаж работы по специальности (сведения о продолжительности опыта (лет) работы в профессиональной сфере)",
+    "Наименование образовательных программ, в реализации которых участвует педагогический работник",
+]
+
+_PLAN_COMMON = [
+    "Считать в плане", "Наименование", "Экза мен", "Зачет", "Зачет с оц.", "КП", "КР",
+    "Экспер тное", "По плану", "Конт. раб.", "СР", "Конт роль", "Пр. подгот",
+]
+_PLAN_SEMESTER = ["з.е.", "Лек", "Лаб", "Пр", "Пр пр. подгот", "СР", "КрПА", "Конт роль"]
+_SVOD_COMMON = [
+    "Считать в плане", "Наименование", "Экза мен", "Зачет", "Зачет с оц.", "КП", "КР",
+    "Экспер тное", "Факт", "Экспер тное", "По плану", "Конт. раб.", "Ауд.", "СР",
+    "Конт роль", "Пр. подгот",
+]
+
+
+def generate_institution(programs: int, disciplines: int, teachers: int, seed: int = 0) -> Dict:
+    """
+    Описание института: программы с дисциплинами и преподаватели, ведущие
+    дисциплины одной-трёх программ.
+    """
+    rng = random.Random(seed)
+
+    program_list = []
+    for index in range(programs):
+        # Уникальный код на программу: учебный план сопоставляется по коду
+        code = f"{index // 90 + 1:02d}.04.{index % 90 + 10:02d}"
+        profile = " ".join(rng.sample(_PROFILE_WORDS, rng.randint(2, 4))).capitalize()
+        name = f"{code} {rng.choice(_DIRECTIONS)} ({profile})"
+        names = []
+        for number in range(max(disciplines - len(_PRACTICES), 0)):
+            # Названия в пределах программы уникальны: предмет + номер части
+            subject = _SUBJECTS[number % len(_SUBJECTS)]
+            part = number // len(_SUBJECTS) + 1
+            names.append(" ".join(filter(None, [subject, rng.choice(_QUALIFIERS), f"{part}"])))
+        names.extend(_PRACTICES[: max(disciplines - len(names), 0)])
+        program_list.append({"code": code, "program_name": name, "year": YEAR, "disciplines": names})
+
+    teacher_list = []
+    for index in range(teachers):
+        taught_programs = rng.sample(program_list, min(len(program_list), rng.randint(1, 3)))
+        taught = sorted(
+            {rng.choice(p["disciplines"]) for p in taught_programs for _ in range(rng.randint(1, 4))}
+        )
+        name = f"{rng.choice(_SURNAMES)} {rng.choice(_NAMES)} {rng.choice(_PATRONYMICS)}"
+        total = rng.randint(3, 40)
+        teacher_list.append(
+            {
+                "full_name": f"{name} {index + 1}",
+                "position": rng.choice(_POSITIONS),
+                "education_level": "Высшее образование - специалитет, магистратура. магистр",
+                "specialty": rng.choice(_DIRECTIONS),
+                "academic_degree": rng.choice(_DEGREES),
+                "academic_title": rng.choice(_TITLES),
+                "qualifications": "\n".join(
+                    f"{rng.choice(_COURSES)}. {rng.choice([16, 36, 72])} часов. "
+                    f"РТУ МИРЭА. {rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(2021, 2024)}."
+                    for _ in range(rng.randint(1, 3))
+                ),
+                "total_experience": total,
+                "teaching_experience": rng.randint(1, total),
+                "disciplines": taught,
+                "programs": sorted(p["program_name"] for p in taught_programs),
+            }
+        )
+
+    return {"programs": program_list, "teachers": teacher_list, "seed": seed}
+
+
+def write_programs_csv(institution: Dict, path: str) -> str:
+    """CSV программ в формате processed_programs_2023.csv."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["program_name", "short_name", "year"])
+        for program in institution["programs"]:
+            writer.writerow([program["program_name"], f"{program['code']}_{program['year']}", program["year"]])
+    return path
+
+
+def write_staff_docx(institution: Dict, path: str) -> str:
+    """Справка о кадровом составе: одна таблица, первая строка — заголовки."""
+    rows = [
+        [
+            str(number),
+            teacher["full_name"],
+            teacher["position"],
+            "; ".join(teacher["disciplines"]),
+            teacher["education_level"],
+            teacher["specialty"],
+            teacher["academic_degree"],
+            teacher["academic_title"],
+            teacher["qualifications"],
+            str(teacher["total_experience"]),
+            str(teacher["teaching_experience"]),
+            "; ".join(teacher["programs"]),
+        ]
+        for number, teacher in enumerate(institution["teachers"], start=1)
+    ]
+    document = Document()
+    table = document.add_table(rows=len(rows) + 1, cols=len(STAFF_HEADERS))
+    for row, values in zip(table.rows, [STAFF_HEADERS] + rows):
+        for cell, value in zip(row.cells, values):
+            cell.text = value
+    document.save(path)
+    return path
+
+
+def curriculum_filename(program: Dict) -> str:
+    """Имя файла в ожидаемом формате КОД_ПРОФИЛЬ_ИНСТИТУТ_ГОД.xlsx."""
+    return f"{program['code']}_СИН_{INSTITUTE}_{program['year']}.xlsx"
+
+
+def write_curriculum_xlsx(program: Dict, path: str, seed: int = 0) -> str:
+    """Учебный план с листами ПланСвод и План в структуре выгрузки из системы планов."""
+    rng = random.Random(f"{seed}:{program['code']}")
+    rows = []
+    for name in program["disciplines"]:
+        semester = rng.randint(1, SEMESTERS)
+        lecture, lab, practice = rng.choice([16, 32, 48]), rng.choice([0, 16, 32]), rng.choice([16, 32])
+        rows.append((name, semester, lecture, lab, practice, rng.choice(_DEPARTMENTS)))
+
+    workbook = Workbook(write_only=True)
+
+    svod = workbook.create_sheet("ПланСвод")
+    semester_heads = [f"Семестр {s}" for s in range(1, SEMESTERS + 1)]
+    svod.append(["-", "-", "Формы пром. атт."] + [None] * 13 + [f"Курс {s // 2 + 1}" if s % 2 == 0 else None for s in range(SEMESTERS)] + ["Закрепленная кафедра", None])
+    svod.append([None] * 16 + semester_heads + [None, None])
+    svod.append(_SVOD_COMMON + ["з.е."] * SEMESTERS + ["Код", "Наименование"])
+    svod.append(["Блок 1.Дисциплины (модули) "] + [None] * (len(_SVOD_COMMON) + SEMESTERS + 1))
+    for number, (name, semester, lecture, lab, practice, department) in enumerate(rows, start=1):
+        credits = (lecture + lab + practice) // 36 + 1
+        per_semester = [credits if s == semester else None for s in range(1, SEMESTERS + 1)]
+        svod.append(
+            ["+", name, str(semester), None, None, None, None, credits, credits, credits * 36, credits * 36,
+             lecture + lab + practice, lecture + lab + practice, credits * 36 - lecture - lab - practice,
+             None, None] + per_semester + [str(number), department]
+        )
+
+    plan = workbook.create_sheet("План")
+    plan.append(["-", "-", "Формы пром. атт."] + [None] * 10 + sum(([f"Курс {s // 2 + 1}"] + [None] * (len(_PLAN_SEMESTER) - 1) for s in range(SEMESTERS)), []))
+    plan.append([None] * len(_PLAN_COMMON) + sum(([f"Семестр {s}"] + [None] * (len(_PLAN_SEMESTER) - 1) for s in range(1, SEMESTERS + 1)), []))
+    plan.append(_PLAN_COMMON + _PLAN_SEMESTER * SEMESTERS)
+    plan.append(["Блок 1.Дисциплины (модули) "] + [None] * (len(_PLAN_COMMON) + len(_PLAN_SEMESTER) * SEMESTERS - 1))
+    for name, semester, lecture, lab, practice, _ in rows:
+        credits = (lecture + lab + practice) // 36 + 1
+        blocks = []
+        for s in range(1, SEMESTERS + 1):
+            if s == semester:
+                blocks += [credits, lecture, lab or None, practice, None, credits * 36 - lecture - lab - practice, 0.25, None]
+            else:
+                blocks += [None] * len(_PLAN_SEMESTER)
+        plan.append(
+            ["+", name, str(semester), None, None, None, None, credits, credits * 36,
+             lecture + lab + practice, None, None, None] + blocks
+        )
+
+    workbook.save(path)
+    return path
+
+
+def write_institution(institution: Dict, out_dir: str) -> Dict[str, List[str]]:
+    """Записывает все файлы института в каталог и возвращает их пути."""
+    os.makedirs(out_dir, exist_ok=True)
+    curriculum_dir = os.path.join(out_dir, "curriculum")
+    os.makedirs(curriculum_dir, exist_ok=True)
+    return {
+        "programs_csv": [write_programs_csv(institution, os.path.join(out_dir, "programs.csv"))],
+        "staff_docx": [write_staff_docx(institution, os.path.join(out_dir, "staff.docx"))],
+        "curriculum_xlsx": [
+            write_curriculum_xlsx(
+                program,
+                os.path.join(curriculum_dir, curriculum_filename(program)),
+                institution["seed"],
+            )
+            for program in institution["programs"]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация синтетических данных института")
+    parser.add_argument("--programs", type=int, default=10)
+    parser.add_argument("--disciplines", type=int, default=40, help="дисциплин на программу")
+    parser.add_argument("--teachers", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="каталог для файлов")
+    args = parser.parse_args()
+
+    institution = generate_institution(args.programs, args.disciplines, args.teachers, args.seed)
+    files = write_institution(institution, args.out)
+    for kind, paths in files.items():
+        print(f"{kind}: {len(paths)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
-from docx import Document
 import csv
 
-doc = Document('АИС МАГИ.docx')
-table = doc.tables[0]
+from app.services.docx_tables import iter_table_rows
+
+rows = iter_table_rows('АИС МАГИ.docx', 0)
+next(rows, None)  # Пропустить заголовок
 
 with open('output.csv', 'w', encoding='utf-8', newline='') as f:
     writer = csv.writer(f, delimiter=',')
@@ -11,6 +12,6 @@ with open('output.csv', 'w', encoding='utf-8', newline='') as f:
                     "academic_degree", "academic_title", "qualification_updates", 
                     "total_experience", "speciality_experience", "educational_programs"])
     # Данные
-    for row in table.rows[1:]:  # Пропустить заголовок
-        cells = [cell.text.strip().replace('\n', '; ') for cell in row.cells]
+    for row in rows:
+        cells = [text.strip().replace('\n', '; ') for text in row]
         writer.writerow(cells)
\ No newline at end of file
@@ -1,8 +1,8 @@
 from docx import Document
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-import re
-from app.models import Teacher, Qualification, EducationProgram, TaughtDiscipline, Base
+from app.models import Teacher, Qualification, Retraining, EducationProgram, TaughtDiscipline, Base
+from app.services.qualifications import parse_courses
 from database import SQLALCHEMY_DATABASE_URL
 
 # Настройки БД
@@ -71,17 +71,12 @@ def import_to_db(teachers_data):
             discipline = TaughtDiscipline(discipline_name=disc, teacher_id=teacher.teacher_id)
             db.add(discipline)
 
-        # Обработка квалификаций
-        quals = re.split(r'(?<=\d{4}\.)\s*', entry["qualifications_raw"])
-        for qual in quals:
-            if not qual.strip():
-                continue
-            year_match = re.search(r'\b(\d{4})\.?$', qual)
-            year = int(year_match.group(1)) if year_match else None
-            course_name = re.sub(r'\s*\d{2}\.\d{2}\.\d{4}\.*\s*$', '', qual).strip()
-            if course_name and year:
-                qual_entry = Qualification(course_name=course_name, year=year, teacher_id=teacher.teacher_id)
-                db.add(qual_entry)
+        # Обработка квалификаций и переподготовок
+        qualifications, retrainings = parse_courses(entry["qualifications_raw"])
+        for course in qualifications:
+            db.add(Qualification(teacher_id=teacher.teacher_id, **course))
+        for course in retrainings:
+            db.add(Retraining(teacher_id=teacher.teacher_id, **course))
 
         # Обработка образовательных программ
         programs = [p.strip() for p in entry["programs_raw"].split(";") if p.strip()]
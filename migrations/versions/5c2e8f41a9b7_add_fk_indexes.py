@@ -0,0 +1,61 @@
+"""add fk indexes
+
+Revision ID: 5c2e8f41a9b7
+Revises: da3f099f0449
+Create Date: 2026-10-18 10:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e8f41a9b7'
+down_revision: Union[str, None] = 'da3f099f0449'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Перед созданием уникальных ограничений удаляем накопившиеся дубликаты связей
+    op.execute(
+        """
+        DELETE FROM taught_disciplines a
+        USING taught_disciplines b
+        WHERE a.discipline_id > b.discipline_id
+          AND a.teacher_id = b.teacher_id
+          AND a.curriculum_id = b.curriculum_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM teacher_programs a
+        USING teacher_programs b
+        WHERE a.ctid > b.ctid
+          AND a.teacher_id = b.teacher_id
+          AND a.program_id = b.program_id
+        """
+    )
+
+    # Индекс по teacher_id не нужен: его покрывает уникальный индекс (teacher_id, ...)
+    op.create_unique_constraint('uq_taught_disciplines_teacher_curriculum', 'taught_disciplines', ['teacher_id', 'curriculum_id'])
+    op.create_index(op.f('ix_taught_disciplines_curriculum_id'), 'taught_disciplines', ['curriculum_id'], unique=False)
+    op.create_unique_constraint('uq_teacher_programs_teacher_program', 'teacher_programs', ['teacher_id', 'program_id'])
+    op.create_index(op.f('ix_teacher_programs_program_id'), 'teacher_programs', ['program_id'], unique=False)
+    op.create_index(op.f('ix_curriculum_program_id'), 'curriculum', ['program_id'], unique=False)
+    op.create_index(op.f('ix_qualifications_teacher_id'), 'qualifications', ['teacher_id'], unique=False)
+    op.create_index(op.f('ix_retrainings_teacher_id'), 'retrainings', ['teacher_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_retrainings_teacher_id'), table_name='retrainings')
+    op.drop_index(op.f('ix_qualifications_teacher_id'), table_name='qualifications')
+    op.drop_index(op.f('ix_curriculum_program_id'), table_name='curriculum')
+    op.drop_index(op.f('ix_teacher_programs_program_id'), table_name='teacher_programs')
+    op.drop_constraint('uq_teacher_programs_teacher_program', 'teacher_programs', type_='unique')
+    op.drop_index(op.f('ix_taught_disciplines_curriculum_id'), table_name='taught_disciplines')
+    op.drop_constraint('uq_taught_disciplines_teacher_curriculum', 'taught_disciplines', type_='unique')
@@ -0,0 +1,29 @@
+"""add discipline trgm index
+
+Revision ID: 9e4b7d2c6a15
+Revises: 5c2e8f41a9b7
+Create Date: 2026-10-18 11:03:17.224980
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b7d2c6a15'
+down_revision: Union[str, None] = '5c2e8f41a9b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_curriculum_discipline_trgm', 'curriculum', ['discipline'], unique=False, postgresql_using='gin', postgresql_ops={'discipline': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_curriculum_discipline_trgm', table_name='curriculum', postgresql_using='gin')
@@ -0,0 +1,43 @@
+"""add import ledger
+
+Revision ID: b3f1c8d27e60
+Revises: 9e4b7d2c6a15
+Create Date: 2026-10-18 16:58:02.417305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c8d27e60'
+down_revision: Union[str, None] = '9e4b7d2c6a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('import_ledger',
+    sa.Column('ledger_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=32), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('program_id', sa.Integer(), nullable=True),
+    sa.Column('rows_parsed', sa.Integer(), nullable=True),
+    sa.Column('rows_written', sa.Integer(), nullable=True),
+    sa.Column('applied_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['program_id'], ['education_programs.program_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ledger_id')
+    )
+    op.create_index(op.f('ix_import_ledger_content_hash'), 'import_ledger', ['content_hash'], unique=False)
+    op.create_index('ix_import_ledger_kind_program', 'import_ledger', ['kind', 'program_id', 'ledger_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_import_ledger_kind_program', table_name='import_ledger')
+    op.drop_index(op.f('ix_import_ledger_content_hash'), table_name='import_ledger')
+    op.drop_table('import_ledger')
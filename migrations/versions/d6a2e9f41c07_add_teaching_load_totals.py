@@ -0,0 +1,80 @@
+"""add teaching load totals
+
+Revision ID: d6a2e9f41c07
+Revises: b3f1c8d27e60
+Create Date: 2026-10-18 17:05:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6a2e9f41c07'
+down_revision: Union[str, None] = 'b3f1c8d27e60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+HOUR_COLUMNS = (
+    'lecture_hours', 'practice_hours', 'lab_hours', 'exam_hours', 'test_hours',
+    'course_project_hours', 'total_practice_hours', 'final_work_hours',
+)
+
+
+def _totals_columns():
+    return [
+        sa.Column('disciplines', sa.Integer(), nullable=False),
+        *[sa.Column(name, sa.Float(), nullable=False) for name in HOUR_COLUMNS],
+        sa.Column('total_hours', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    ]
+
+
+def _backfill(table: str, key: str, group_key: str, source: str):
+    sums = ", ".join(f"COALESCE(SUM(COALESCE(c.{name}, 0)), 0)" for name in HOUR_COLUMNS)
+    row_total = " + ".join(f"COALESCE(c.{name}, 0)" for name in HOUR_COLUMNS)
+    columns = ", ".join(HOUR_COLUMNS)
+    op.execute(
+        f"INSERT INTO {table} ({key}, disciplines, {columns}, total_hours) "
+        f"SELECT {group_key}, COUNT(c.curriculum_id), {sums}, COALESCE(SUM({row_total}), 0) "
+        f"FROM {source} WHERE {group_key} IS NOT NULL GROUP BY {group_key}"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('load_by_program',
+    sa.Column('program_id', sa.Integer(), nullable=False),
+    *_totals_columns(),
+    sa.ForeignKeyConstraint(['program_id'], ['education_programs.program_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('program_id')
+    )
+    op.create_table('load_by_department',
+    sa.Column('department', sa.String(length=255), nullable=False),
+    *_totals_columns(),
+    sa.PrimaryKeyConstraint('department')
+    )
+    op.create_table('load_by_teacher',
+    sa.Column('teacher_id', sa.Integer(), nullable=False),
+    *_totals_columns(),
+    sa.ForeignKeyConstraint(['teacher_id'], ['teachers.teacher_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('teacher_id')
+    )
+
+    # Итоги по уже загруженным планам
+    _backfill('load_by_program', 'program_id', 'c.program_id', 'curriculum c')
+    _backfill('load_by_department', 'department', 'c.department', 'curriculum c')
+    _backfill(
+        'load_by_teacher', 'teacher_id', 't.teacher_id',
+        'taught_disciplines t JOIN curriculum c ON c.curriculum_id = t.curriculum_id',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('load_by_teacher')
+    op.drop_table('load_by_department')
+    op.drop_table('load_by_program')
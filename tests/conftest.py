@@ -0,0 +1,86 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import database
+from app.models import Base, DepartmentLoad, ProgramLoad, TeacherLoad
+from app.services.teaching_load import TOTAL_FIELDS
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    # Файл SQLite на тест: общий для синхронного и асинхронного движков
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def session_factory(database_path):
+    engine = create_engine(
+        f"sqlite:///{database_path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def load_snapshot(db):
+    """Итоги нагрузки: таблица -> {ключ: значения TOTAL_FIELDS}."""
+
+    def snapshot():
+        totals = {}
+        for model in (ProgramLoad, DepartmentLoad, TeacherLoad):
+            key = model.__table__.primary_key.columns.keys()[0]
+            totals[model] = {
+                getattr(load, key): {field: getattr(load, field) for field in TOTAL_FIELDS}
+                for load in db.query(model).populate_existing()
+            }
+        return totals
+
+    return snapshot
+
+
+@pytest.fixture
+def async_engine(session_factory, database_path):
+    # NullPool: соединения не переживают цикл событий TestClient
+    return create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+
+
+@pytest.fixture
+def make_client(session_factory, async_engine):
+    """Приложение с указанными роутерами поверх тестовой базы."""
+    async_session_factory = async_sessionmaker(
+        bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+    def get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
+    def make(*routers):
+        app = FastAPI()
+        for router in routers:
+            app.include_router(router)
+        app.dependency_overrides[database.get_db] = get_db
+        app.dependency_overrides[database.get_async_db] = get_async_db
+        return TestClient(app)
+
+    return make
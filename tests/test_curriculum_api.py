@@ -0,0 +1,54 @@
+from sqlalchemy import event
+
+from app.models import Curriculum, EducationProgram, TaughtDiscipline, Teacher
+from app.routers import curriculum
+
+
+def test_programs_lists_only_dropdown_fields(db, make_client, async_engine):
+    programs = [
+        EducationProgram(program_name=name, short_name=short_name, year=year)
+        for name, short_name, year in (
+            ("09.04.04 Программная инженерия (АИС)", "09.04.04_Аис_2023", 2023),
+            ("01.03.02 Прикладная математика (Анализ данных)", None, 2024),
+        )
+    ]
+    db.add_all(programs)
+    teacher = Teacher(full_name="Иванов Иван Иванович", position="Доцент", education_level="ВО")
+    db.add(teacher)
+    db.flush()
+    for program in programs:
+        for number in range(3):
+            row = Curriculum(
+                program_id=program.program_id, discipline=f"Дисциплина {number}", department="ИиППО"
+            )
+            db.add(row)
+            db.flush()
+            db.add(TaughtDiscipline(teacher_id=teacher.teacher_id, curriculum_id=row.curriculum_id))
+    db.commit()
+
+    statements = []
+    event.listen(
+        async_engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    response = make_client(curriculum.router).get("/curriculum/programs")
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "program_id": programs[1].program_id,
+            "program_name": "01.03.02 Прикладная математика (Анализ данных)",
+            "short_name": None,
+            "year": 2024,
+        },
+        {
+            "program_id": programs[0].program_id,
+            "program_name": "09.04.04 Программная инженерия (АИС)",
+            "short_name": "09.04.04_Аис_2023",
+            "year": 2023,
+        },
+    ]
+    # Учебные планы и преподаватели не загружаются
+    assert len(statements) == 1
+    assert "curriculum" not in statements[0]
@@ -0,0 +1,193 @@
+import pytest
+
+from app.models import (
+    Curriculum,
+    DepartmentLoad,
+    EducationProgram,
+    ProgramLoad,
+    TaughtDiscipline,
+    Teacher,
+    TeacherLoad,
+)
+from app.services.import_utils import diff_curriculum, store_curriculum
+from app.services.teaching_load import rebuild_load
+
+
+FILENAME = "09.04.04_АИС_ИИТ_2024.xlsx"
+
+
+def _stored(curriculum_id, discipline, semester, department="ИиППО", **hours):
+    row = {
+        "curriculum_id": curriculum_id,
+        "discipline": discipline,
+        "semester": semester,
+        "department": department,
+        "lecture_hours": 0.0,
+        "practice_hours": 0.0,
+        "lab_hours": 0.0,
+        "exam_hours": 0.0,
+        "test_hours": 0.0,
+        "total_practice_hours": 0.0,
+    }
+    row.update(hours)
+    return row
+
+
+def _item(discipline, semester, department="ИиППО", **hours):
+    item = {"discipline": discipline, "semester": semester, "department": department}
+    item.update(hours)
+    return item
+
+
+def test_diff_curriculum_classifies_rows():
+    stored = [
+        _stored(1, "Математика", 1, lecture_hours=36.0),
+        _stored(2, "Физика", 1, lecture_hours=18.0),
+        _stored(3, "Физика", 2, lecture_hours=18.0),
+        _stored(4, "История", 1),
+    ]
+    incoming = [
+        _item("Математика", 1, lecture_hours=36.0),  # без изменений
+        _item("Физика", 1, lecture_hours=36.0),  # изменились часы
+        _item("Физика", 2, department="Физики", lecture_hours=18.0),  # сменилась кафедра
+        _item("Философия", 3, lecture_hours=18.0),  # новая дисциплина
+    ]
+
+    diff = diff_curriculum(stored, incoming)
+
+    assert diff["unchanged"] == 1
+    assert diff["updates"] == [
+        {"lecture_hours": 36.0, "curriculum_id": 2},
+        {"department": "Физики", "curriculum_id": 3},
+    ]
+    assert diff["inserts"] == [incoming[3]]
+    assert [row["curriculum_id"] for row in diff["removed"]] == [4]
+
+
+def test_diff_curriculum_keys_on_discipline_and_semester():
+    stored = [_stored(1, "Математика", 1), _stored(2, "Математика", 1)]
+    # Тот же ключ дважды сопоставляется по порядку, другой семестр — новая строка
+    incoming = [_item("Математика", 1), _item("Математика", 1), _item("Математика", 2)]
+
+    diff = diff_curriculum(stored, incoming)
+
+    assert diff["unchanged"] == 2
+    assert diff["updates"] == []
+    assert diff["removed"] == []
+    assert diff["inserts"] == [incoming[2]]
+
+
+@pytest.fixture
+def program(db):
+    program = EducationProgram(
+        program_name="09.04.04 Программная инженерия (Автоматизированные информационные системы)",
+        short_name="09.04.04_Аис_2023",
+        year=2023,
+    )
+    db.add(program)
+    db.commit()
+    return program
+
+
+def _plan(math_lectures=36.0, with_history=True, with_philosophy=False):
+    plan = [
+        _item("Математика", 1, lecture_hours=math_lectures, practice_hours=18.0),
+        _item("Физика", 2, department="Физики", lecture_hours=18.0, lab_hours=18.0),
+    ]
+    if with_history:
+        plan.append(_item("История", 1, department="Истории", lecture_hours=16.0))
+    if with_philosophy:
+        plan.append(_item("Философия", 3, department="Истории", practice_hours=32.0))
+    return plan
+
+
+def test_reimport_keeps_links_and_refreshes_load(db, program, load_snapshot):
+    store_curriculum(db, FILENAME, _plan())
+    ids = dict(db.query(Curriculum.discipline, Curriculum.curriculum_id))
+
+    teacher = Teacher(full_name="Иванов Иван Иванович", position="Доцент", education_level="ВО")
+    db.add(teacher)
+    db.flush()
+    db.add_all(
+        TaughtDiscipline(teacher_id=teacher.teacher_id, curriculum_id=ids[name])
+        for name in ("Математика", "История")
+    )
+    db.commit()
+    rebuild_load(db)
+    db.commit()
+
+    result = store_curriculum(
+        db, FILENAME, _plan(math_lectures=54.0, with_history=False, with_philosophy=True)
+    )
+
+    assert result["status"] == "success"
+    assert result["details"]["inserted"] == 1
+    assert result["details"]["updated"] == 1
+    assert result["details"]["unchanged"] == 1
+    assert result["details"]["removed"] == ["История"]
+    assert "teacher_links_removed" not in result["details"]
+
+    # Дисциплина, которой нет в файле, остаётся вместе со связью
+    stored_ids = dict(db.query(Curriculum.discipline, Curriculum.curriculum_id))
+    assert stored_ids["История"] == ids["История"]
+    assert db.query(TaughtDiscipline).count() == 2
+
+    # Итоги после повторного импорта совпадают с полным пересчётом
+    incremental = load_snapshot()
+    rebuild_load(db)
+    db.commit()
+    assert incremental == load_snapshot()
+
+    program_totals = incremental[ProgramLoad][program.program_id]
+    assert program_totals["disciplines"] == 4
+    assert program_totals["lecture_hours"] == 54.0 + 18.0 + 16.0
+    assert program_totals["total_hours"] == (54.0 + 18.0) + (18.0 + 18.0) + 16.0 + 32.0
+
+    teacher_totals = incremental[TeacherLoad][teacher.teacher_id]
+    assert teacher_totals["disciplines"] == 2
+    assert teacher_totals["total_hours"] == (54.0 + 18.0) + 16.0
+
+    assert incremental[DepartmentLoad]["Истории"]["disciplines"] == 2
+
+
+def test_reimport_prunes_removed_only_on_request(db, program, load_snapshot):
+    store_curriculum(db, FILENAME, _plan())
+    history_id = dict(db.query(Curriculum.discipline, Curriculum.curriculum_id))["История"]
+    teacher = Teacher(full_name="Петров Пётр Петрович", position="Доцент", education_level="ВО")
+    db.add(teacher)
+    db.flush()
+    db.add(TaughtDiscipline(teacher_id=teacher.teacher_id, curriculum_id=history_id))
+    db.commit()
+
+    result = store_curriculum(db, FILENAME, _plan(with_history=False), prune_removed=True)
+
+    assert result["details"]["removed"] == ["История"]
+    assert result["details"]["teacher_links_removed"] == 1
+    assert db.get(Curriculum, history_id) is None
+    assert db.query(TaughtDiscipline).count() == 0
+    assert load_snapshot()[TeacherLoad] == {}
+
+
+def test_unchanged_reimport_writes_nothing(db, program):
+    store_curriculum(db, FILENAME, _plan())
+
+    result = store_curriculum(db, FILENAME, _plan())
+
+    assert result["status"] == "unchanged"
+    assert result["imported_count"] == 0
+
+
+def test_reimport_updates_project_and_final_work_hours(db, program):
+    plan = _plan()
+    plan[0].update(course_project_hours=0.0, final_work_hours=0)
+    store_curriculum(db, FILENAME, plan)
+
+    changed = _plan()
+    changed[0].update(course_project_hours=36.0, final_work_hours=108)
+    result = store_curriculum(db, FILENAME, changed)
+
+    assert result["status"] == "success"
+    assert (result["details"]["updated"], result["details"]["unchanged"]) == (1, 2)
+    db.expire_all()
+    math = db.query(Curriculum).filter(Curriculum.discipline == "Математика").one()
+    assert (math.course_project_hours, math.final_work_hours) == (36.0, 108)
@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import create_engine, create_mock_engine
+from sqlalchemy.orm import Session
+
+from app.models import Base, Curriculum, EducationProgram
+from app.services.discipline_matching import (
+    SIMILARITY_THRESHOLD,
+    InMemoryDisciplineMatcher,
+    PgTrgmDisciplineMatcher,
+    get_discipline_matcher,
+    similarity,
+)
+
+
+def _create_all_ddl(url):
+    statements = []
+    engine = create_mock_engine(url, lambda sql, *args, **kwargs: statements.append(sql))
+    Base.metadata.create_all(engine, checkfirst=False)
+    return [str(sql.compile(dialect=engine.dialect)).strip() for sql in statements]
+
+
+def test_create_all_creates_pg_trgm_before_trigram_index():
+    ddl = _create_all_ddl("postgresql+psycopg2://")
+
+    assert ddl[0] == "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+    assert any("gin_trgm_ops" in statement for statement in ddl)
+
+
+def test_create_all_skips_pg_trgm_on_other_dialects():
+    ddl = _create_all_ddl("sqlite://")
+
+    assert not any("pg_trgm" in statement for statement in ddl)
+
+
+@pytest.fixture
+def curriculum(db):
+    programs = [
+        EducationProgram(program_name=name, short_name=short_name, year=2024)
+        for name, short_name in (
+            ("09.04.04 Программная инженерия (АИС)", "09.04.04_Аис_2024"),
+            ("01.03.02 Прикладная математика (Анализ данных)", "01.03.02_Ад_2024"),
+        )
+    ]
+    db.add_all(programs)
+    db.flush()
+    ais, ad = (program.program_id for program in programs)
+    rows = {
+        "databases": Curriculum(program_id=ais, discipline="Базы данных", department="ИиППО"),
+        "analysis": Curriculum(
+            program_id=ad, discipline="Математический анализ", department="Математики"
+        ),
+        "ai": Curriculum(program_id=ais, discipline="ИИ в медицине", department="ИиППО"),
+        "databases_ad": Curriculum(program_id=ad, discipline="Базы данных", department="ИиППО"),
+    }
+    db.add_all(rows.values())
+    db.commit()
+    return {key: row.curriculum_id for key, row in rows.items()}, (ais, ad)
+
+
+def test_exact_match_ignores_case(db, curriculum):
+    ids, _ = curriculum
+    matcher = get_discipline_matcher(db)
+
+    assert matcher.match("базы данных") == ids["databases"]
+    assert matcher.match("Математический анализ") == ids["analysis"]
+
+
+def test_trigram_near_miss_matches(db, curriculum):
+    ids, _ = curriculum
+    name = "Математический анлиз"
+    assert SIMILARITY_THRESHOLD <= similarity(name, "Математический анализ") < 1
+
+    assert get_discipline_matcher(db).match(name) == ids["analysis"]
+
+
+def test_substring_matches_below_threshold(db, curriculum):
+    ids, _ = curriculum
+    matcher = get_discipline_matcher(db)
+
+    # Как ilike('%name%'): вхождение подстрокой при низком сходстве
+    assert similarity("анал", "Математический анализ") < SIMILARITY_THRESHOLD
+    assert matcher.match("анал") == ids["analysis"]
+    # Слова короче трёх символов не дают общих триграмм — полный проход
+    assert matcher.match("ИИ") == ids["ai"]
+
+
+def test_unrelated_name_is_rejected(db, curriculum):
+    ids, _ = curriculum
+    name = "Физическая культура"
+    assert all(
+        similarity(name, discipline) < SIMILARITY_THRESHOLD
+        for discipline in ("Базы данных", "Математический анализ", "ИИ в медицине")
+    )
+
+    assert get_discipline_matcher(db).match_many([(name, None), ("базы данных", None)]) == [
+        None,
+        ids["databases"],
+    ]
+
+
+def test_programs_of_teacher_take_priority(db, curriculum):
+    ids, (ais, ad) = curriculum
+    matcher = get_discipline_matcher(db)
+
+    assert matcher.match("Базы данных", [ad]) == ids["databases_ad"]
+    assert matcher.match("Базы данных", [ais]) == ids["databases"]
+    # Без программ — меньший curriculum_id
+    assert matcher.match("Базы данных") == ids["databases"]
+
+
+def test_matcher_follows_session_dialect(db):
+    assert isinstance(get_discipline_matcher(db), InMemoryDisciplineMatcher)
+
+    # Движок не подключается: выбор идёт по диалекту
+    with Session(bind=create_engine("postgresql+psycopg2://")) as session:
+        assert isinstance(get_discipline_matcher(session), PgTrgmDisciplineMatcher)
@@ -0,0 +1,50 @@
+import docx
+import pytest
+
+from app.services.docx_tables import iter_docx_rows, iter_table_rows
+
+
+def _python_docx_rows(path):
+    return [
+        (index, [cell.text for cell in row.cells])
+        for index, table in enumerate(docx.Document(path).tables)
+        for row in table.rows
+    ]
+
+
+@pytest.fixture
+def document(tmp_path):
+    doc = docx.Document()
+    doc.add_paragraph("Текст до таблиц")
+
+    staff = doc.add_table(rows=4, cols=3)
+    for r, row in enumerate(staff.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"r{r}c{c}"
+    staff.cell(0, 0).merge(staff.cell(0, 1))  # gridSpan
+    staff.cell(1, 2).merge(staff.cell(3, 2))  # vMerge
+    paragraphs = staff.cell(2, 0)
+    paragraphs.text = "первый абзац"
+    paragraphs.add_paragraph("второй\tабзац")
+    # Вложенная таблица не входит в doc.tables
+    staff.cell(3, 1).add_table(rows=1, cols=1).cell(0, 0).text = "вложенная"
+
+    programs = doc.add_table(rows=2, cols=2)
+    programs.cell(0, 0).text = "Программа"
+    programs.cell(1, 1).text = "09.04.04 Программная инженерия (АИС)"
+
+    path = tmp_path / "staff.docx"
+    doc.save(path)
+    return path
+
+
+def test_rows_match_python_docx(document):
+    assert list(iter_docx_rows(document)) == _python_docx_rows(document)
+
+
+def test_iter_table_rows_selects_table(document):
+    expected = [cells for index, cells in _python_docx_rows(document) if index == 1]
+    assert list(iter_table_rows(document, 1)) == expected
+
+    with pytest.raises(IndexError):
+        list(iter_table_rows(document, 2))
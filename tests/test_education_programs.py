@@ -0,0 +1,77 @@
+import csv
+
+from app.models import EducationProgram
+from app.services.import_utils import import_education_programs
+
+
+AIS = "09.04.04 Программная инженерия (Автоматизированные информационные системы)"
+AIS_ALGORITHMS = "09.04.04 Программная инженерия (Алгоритмы интеллектуальных систем)"
+IVT = "09.03.01 Информатика и вычислительная техника"
+
+
+def _write_programs(path, rows):
+    with open(path, "w", encoding="utf-8-sig", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["program_name", "short_name", "year"])
+        for program_name, year in rows:
+            writer.writerow([program_name, "", year])
+    return str(path)
+
+
+def _programs(db):
+    db.expire_all()
+    return {
+        program.program_name: (program.short_name, program.year)
+        for program in db.query(EducationProgram)
+    }
+
+
+def test_second_upload_keeps_short_names(db, tmp_path):
+    path = _write_programs(
+        tmp_path / "programs.csv",
+        [(AIS, 2024), (AIS_ALGORITHMS, 2024), (IVT, 2023), (AIS, 2025)],
+    )
+
+    import_education_programs(path, db)
+    first = _programs(db)
+    ids = dict(db.query(EducationProgram.program_name, EducationProgram.program_id))
+    import_education_programs(path, db)
+
+    assert _programs(db) == first
+    # Повтор program_name в файле: остаётся первое вхождение
+    assert first == {
+        AIS: ("09.04.04_Аис_2024", 2024),
+        AIS_ALGORITHMS: ("09.04.04_Аис_2024_1", 2024),
+        IVT: ("09.03.01_U_2023", 2023),
+    }
+    assert dict(db.query(EducationProgram.program_name, EducationProgram.program_id)) == ids
+
+
+def test_upload_keeps_suffix_of_existing_program(db, tmp_path):
+    # Имя с той же основой, но другим суффиксом, уже занято программой
+    db.add(EducationProgram(program_name=AIS, short_name="09.04.04_Аис_2024_3", year=2024))
+    db.commit()
+
+    import_education_programs(
+        _write_programs(tmp_path / "programs.csv", [(AIS, 2024), (AIS_ALGORITHMS, 2024)]), db
+    )
+
+    assert _programs(db) == {
+        AIS: ("09.04.04_Аис_2024_3", 2024),
+        AIS_ALGORITHMS: ("09.04.04_Аис_2024", 2024),
+    }
+
+
+def test_upload_renames_program_when_year_changes(db, tmp_path):
+    import_education_programs(
+        _write_programs(tmp_path / "first.csv", [(AIS, 2024), (IVT, 2023)]), db
+    )
+
+    import_education_programs(
+        _write_programs(tmp_path / "second.csv", [(AIS, 2025), (IVT, 2023)]), db
+    )
+
+    assert _programs(db) == {
+        AIS: ("09.04.04_Аис_2025", 2025),
+        IVT: ("09.03.01_U_2023", 2023),
+    }
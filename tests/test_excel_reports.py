@@ -0,0 +1,103 @@
+import pytest
+from openpyxl import load_workbook
+
+from app.models import Curriculum, EducationProgram, TaughtDiscipline, Teacher
+from app.services import excel_reports
+from app.services.excel_reports import HOUR_TITLES, write_department_report, write_program_report
+from app.services.teaching_load import HOUR_FIELDS
+
+
+@pytest.fixture
+def plans(db, session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_reports, "engine", session_factory.kw["bind"])
+    monkeypatch.setattr(excel_reports, "SPOOL_DIR", str(tmp_path / "spool"))
+
+    programs = [
+        EducationProgram(program_name=name, short_name=short_name, year=2024)
+        for name, short_name in (
+            ("09.04.04 Программная инженерия (АИС)", "09.04.04_Аис_2024"),
+            ("01.03.02 Прикладная математика (Анализ данных)", "01.03.02_Ад_2024"),
+        )
+    ]
+    teachers = [
+        Teacher(full_name=name, position="Доцент", education_level="ВО")
+        for name in ("Иванов Иван Иванович", "Петров Пётр Петрович")
+    ]
+    db.add_all(programs + teachers)
+    db.flush()
+    ais, ad = (program.program_id for program in programs)
+    rows = [
+        Curriculum(
+            program_id=ais, semester=1, discipline="Базы данных", department="ИиППО",
+            lecture_hours=36.0, lab_hours=36.0, course_project_hours=18.0,
+        ),
+        Curriculum(
+            program_id=ais, semester=2, discipline="История", department="Истории", lecture_hours=32.0
+        ),
+        Curriculum(
+            program_id=ad, semester=8, discipline="Преддипломная практика", department="ИиППО",
+            final_work_hours=216.0,
+        ),
+    ]
+    db.add_all(rows)
+    db.flush()
+    # Два преподавателя у дисциплины: часы в итогах считаются один раз
+    db.add_all(
+        TaughtDiscipline(teacher_id=teacher.teacher_id, curriculum_id=rows[0].curriculum_id)
+        for teacher in teachers
+    )
+    db.commit()
+    return ais
+
+
+def _sheet_rows(path):
+    sheet = load_workbook(path).active
+    return [list(row) for row in sheet.iter_rows(values_only=True)]
+
+
+def _by_header(rows, line):
+    """Непустые ячейки строки по заголовкам столбцов."""
+    return {title: value for title, value in zip(rows[2], line) if value is not None}
+
+
+def test_program_report_totals_under_hour_columns(plans):
+    path, short_name = write_program_report(plans)
+    rows = _sheet_rows(path)
+
+    assert short_name == "09.04.04_Аис_2024"
+    totals = rows[-1]
+    assert totals[0] == "Итого"
+    # Итоги стоят под своими заголовками часов
+    assert _by_header(rows, totals) == {
+        **{HOUR_TITLES[field]: 0 for field in HOUR_FIELDS},
+        "Лекции": 36.0 + 32.0,
+        "Лабораторные": 36.0,
+        "Курсовой проект": 18.0,
+        "Всего": 36.0 + 36.0 + 18.0 + 32.0,
+        "Семестр": "Итого",
+    }
+    databases = _by_header(rows, rows[3])
+    assert databases["Дисциплина"] == "Базы данных"
+    assert databases["Всего"] == 90.0
+    assert databases["Преподаватели"] == "Иванов Иван Иванович, Петров Пётр Петрович"
+
+
+def test_department_report_totals_under_hour_columns(plans):
+    rows = _sheet_rows(write_department_report("ИиППО"))
+
+    assert rows[2][0] == "Программа"
+    assert [line[0] for line in rows[3:-2]] == ["01.03.02_Ад_2024", "09.04.04_Аис_2024"]
+    assert _by_header(rows, rows[-1]) == {
+        **{HOUR_TITLES[field]: 0 for field in HOUR_FIELDS},
+        "Лекции": 36.0,
+        "Лабораторные": 36.0,
+        "Курсовой проект": 18.0,
+        "ВКР": 216.0,
+        "Всего": 36.0 + 36.0 + 18.0 + 216.0,
+        "Программа": "Итого",
+    }
+
+
+def test_missing_program_or_department(plans):
+    assert write_program_report(plans + 100) is None
+    assert write_department_report("Физики") is None
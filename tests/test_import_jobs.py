@@ -0,0 +1,252 @@
+import hashlib
+import os
+import uuid
+from concurrent.futures import Future
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.models import Curriculum, EducationProgram, ImportLedger, Teacher
+from app.routers import import_router
+from app.services import import_jobs
+from app.services.uploads import SpooledUpload
+
+
+class _InlinePool:
+    """Пул, выполняющий задачу сразу в вызывающем потоке."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+@pytest.fixture
+def jobs(session_factory, monkeypatch):
+    monkeypatch.setattr(import_jobs, "SessionLocal", session_factory)
+    monkeypatch.setattr(import_jobs, "_pools", lambda: (_InlinePool(), _InlinePool()))
+    monkeypatch.setattr(import_jobs, "_jobs", import_jobs.OrderedDict())
+    return import_jobs
+
+
+def _spooled(tmp_path, name, content=b"data"):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def _phase(jobs):
+    (job,) = jobs._jobs.values()
+    return job["status"], job["phase"]
+
+
+def test_job_moves_through_phases(jobs, monkeypatch, tmp_path):
+    seen = []
+
+    def parse(file_path):
+        seen.append(_phase(jobs))
+        return [{"row": 1}, {"row": 2}]
+
+    def store(db, filename, data):
+        seen.append(_phase(jobs))
+        return {"status": "success", "imported_count": len(data)}
+
+    monkeypatch.setitem(jobs.JOB_KINDS, "teachers", (parse, store))
+    path = _spooled(tmp_path, "staff.docx")
+
+    job = jobs.submit_import("teachers", path, "staff.docx")
+
+    assert seen == [("running", "parsing"), ("running", "writing")]
+    assert (job["status"], job["phase"]) == ("done", "done")
+    assert (job["rows_parsed"], job["rows_written"]) == (2, 2)
+    assert job["result"] == {"status": "success", "imported_count": 2}
+    assert job["finished_at"] is not None
+    # Файл из спула удаляется после задания
+    assert not (tmp_path / "staff.docx").exists()
+
+
+def test_failed_job_keeps_error_and_removes_file(jobs, monkeypatch, tmp_path):
+    def store(db, filename, data):
+        raise HTTPException(status_code=404, detail="Программа не найдена")
+
+    monkeypatch.setitem(jobs.JOB_KINDS, "curriculum", (lambda file_path: [{}], store))
+    path = _spooled(tmp_path, "plan.xlsx")
+
+    job = jobs.submit_import("curriculum", path, "plan.xlsx")
+
+    assert job["status"] == "failed"
+    assert job["phase"] == "writing"
+    assert job["errors"] == ["Программа не найдена"]
+    assert job["finished_at"] is not None
+    assert not (tmp_path / "plan.xlsx").exists()
+
+
+def test_unknown_kind_is_rejected(jobs):
+    with pytest.raises(ValueError):
+        jobs.submit_import("programs", "programs.csv", "programs.csv")
+
+
+def test_job_status_endpoint(jobs, monkeypatch, tmp_path):
+    app = FastAPI()
+    app.include_router(import_router.router)
+    client = TestClient(app)
+
+    monkeypatch.setitem(
+        jobs.JOB_KINDS,
+        "teachers",
+        (lambda file_path: [], lambda db, filename, data: {"imported_count": 0}),
+    )
+    job = jobs.submit_import("teachers", _spooled(tmp_path, "staff.docx"), "staff.docx")
+
+    response = client.get(f"/import/jobs/{job['job_id']}")
+    assert response.status_code == 200
+    assert response.json()["status"] == "done"
+
+    response = client.get("/import/jobs/unknown")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Задание импорта не найдено"}
+
+
+AIS_PLAN = "09.04.04_АИС_ИИТ_2023.xlsx"
+AD_PLAN = "01.03.02_АД_ИИТ_2024.xlsx"
+AD_PLAN_NEXT = "01.03.02_АД_ИИТ_2025.xlsx"
+
+
+@pytest.fixture
+def programs(db):
+    ais = EducationProgram(
+        program_name="09.04.04 Программная инженерия (Автоматизированные информационные системы)",
+        short_name="09.04.04_Аис_2023",
+        year=2023,
+    )
+    ad = EducationProgram(
+        program_name="01.03.02 Прикладная математика (Анализ данных)",
+        short_name="01.03.02_Ад_2024",
+        year=2024,
+    )
+    db.add_all([ais, ad])
+    db.commit()
+    return {"ais": ais.program_id, "ad": ad.program_id}
+
+
+def _plan(*disciplines):
+    return [
+        {"discipline": name, "semester": 1, "department": "ИиППО", "lecture_hours": 18.0}
+        for name in disciplines
+    ]
+
+
+PARSED = {
+    AIS_PLAN: _plan("Базы данных", "Алгоритмы"),
+    AD_PLAN: _plan("Математический анализ"),
+    AD_PLAN_NEXT: _plan("Математический анализ", "Статистика"),
+    "11.11.11_НЕТ_ИИТ_2024.xlsx": _plan("Дисциплина"),
+    "staff.docx": [
+        {
+            "full_name": "Иванов Иван Иванович",
+            "position": "Доцент",
+            "education_level": "ВО",
+            "disciplines_raw": "Базы данных",
+            "programs_raw": "",
+        }
+    ],
+}
+
+
+@pytest.fixture
+def archive(jobs, monkeypatch, tmp_path):
+    def parse(file_path):
+        return PARSED[os.path.basename(file_path)]
+
+    store = jobs.store_curriculum
+
+    def store_curriculum(db, filename, data, commit=True):
+        # Второй план программы 01.03.02 не записывается
+        if filename == AD_PLAN_NEXT:
+            raise ValueError("сбой записи")
+        return store(db, filename, data, commit=commit)
+
+    monkeypatch.setitem(jobs.JOB_KINDS, "curriculum", (parse, None))
+    monkeypatch.setitem(jobs.JOB_KINDS, "teachers", (parse, None))
+    monkeypatch.setattr(jobs, "store_curriculum", store_curriculum)
+
+    def members(*names):
+        result = []
+        for name in names:
+            directory = tmp_path / uuid.uuid4().hex
+            directory.mkdir()
+            content = name.encode()
+            path = _spooled(directory, name, content)
+            result.append(
+                SpooledUpload(path, name, len(content), hashlib.sha256(content).hexdigest())
+            )
+        return result
+
+    return members
+
+
+def _files(job):
+    return {entry["filename"]: entry for entry in job["files"]}
+
+
+def _disciplines(db, program_id):
+    return sorted(
+        name
+        for (name,) in db.query(Curriculum.discipline).filter(Curriculum.program_id == program_id)
+    )
+
+
+def test_archive_rolls_back_only_the_failing_program(jobs, archive, programs, db):
+    members = archive(
+        AIS_PLAN, AD_PLAN, AD_PLAN_NEXT, "11.11.11_НЕТ_ИИТ_2024.xlsx", "staff.docx"
+    )
+
+    job = jobs.submit_archive("plans.zip", members, skipped=["readme.txt"])
+
+    assert job["status"] == "done"
+    files = _files(job)
+    assert files[AIS_PLAN]["status"] == "success"
+    assert files[AIS_PLAN]["rows_written"] == 2
+    # Оба плана программы отменены одной транзакцией
+    assert (files[AD_PLAN_NEXT]["status"], files[AD_PLAN_NEXT]["error"]) == ("failed", "сбой записи")
+    assert files[AD_PLAN]["status"] == "failed"
+    assert files[AD_PLAN]["error"] == "Не записан: транзакция программы отменена"
+    assert files["11.11.11_НЕТ_ИИТ_2024.xlsx"]["error"] == "Программа с кодом 11.11.11 не найдена"
+    assert files["staff.docx"]["status"] == "success"
+    assert files["readme.txt"]["status"] == "skipped"
+    assert job["result"]["files"] == {"success": 2, "failed": 3, "skipped": 1}
+
+    assert _disciplines(db, programs["ais"]) == ["Алгоритмы", "Базы данных"]
+    assert _disciplines(db, programs["ad"]) == []
+    assert sorted(filename for (filename,) in db.query(ImportLedger.filename)) == [
+        AIS_PLAN,
+        "staff.docx",
+    ]
+    assert db.query(Teacher).count() == 1
+    assert all(not os.path.exists(member.path) for member in members)
+
+
+def test_archive_skips_applied_files(jobs, archive, programs, db):
+    jobs.submit_archive("plans.zip", archive(AIS_PLAN, "staff.docx"))
+
+    job = jobs.submit_archive("plans.zip", archive(AIS_PLAN, "staff.docx"))
+
+    files = _files(job)
+    assert files[AIS_PLAN]["status"] == "unchanged"
+    assert files["staff.docx"]["status"] == "unchanged"
+    assert job["rows_written"] == 0
+    assert db.query(ImportLedger).count() == 2
+
+
+def test_curriculum_groups_follow_write_order(jobs, archive, programs, db):
+    members = archive(AIS_PLAN, AD_PLAN, AD_PLAN_NEXT)
+    files = [jobs._file_entry(member.filename, "curriculum", member.sha256) for member in members]
+    job_id = jobs._register(jobs._new_job("archive", "plans.zip", files=files))
+
+    groups = jobs._curriculum_groups(job_id, members, [1, 2, 0])
+
+    assert groups == {programs["ad"]: [1, 2], programs["ais"]: [0]}
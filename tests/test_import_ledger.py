@@ -0,0 +1,125 @@
+import hashlib
+
+import pytest
+
+from app.models import EducationProgram, ImportLedger
+from app.routers import admin
+from app.services import import_jobs
+from app.services.import_ledger import find_applied, invalidate_applied, record_import
+
+
+CURRICULUM_FILE = "09.04.04_АИС_ИИТ_2024.xlsx"
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def program(db):
+    program = EducationProgram(
+        program_name="09.04.04 Программная инженерия (Автоматизированные информационные системы)",
+        short_name="09.04.04_Аис_2023",
+        year=2023,
+    )
+    db.add(program)
+    db.commit()
+    return program
+
+
+def test_curriculum_applied_only_while_latest_for_program(db, program):
+    result = {"program_id": program.program_id, "imported_count": 3}
+    record_import(db, "curriculum", _sha(b"v1"), CURRICULUM_FILE, 3, result)
+
+    applied = find_applied(db, "curriculum", CURRICULUM_FILE, _sha(b"v1"))
+    assert applied is not None and applied.program_id == program.program_id
+    assert find_applied(db, "curriculum", CURRICULUM_FILE, _sha(b"v2")) is None
+
+    # Новая версия плана: прежний файл снова нужно применять
+    record_import(db, "curriculum", _sha(b"v2"), CURRICULUM_FILE, 3, result)
+    assert find_applied(db, "curriculum", CURRICULUM_FILE, _sha(b"v1")) is None
+    assert find_applied(db, "curriculum", CURRICULUM_FILE, _sha(b"v2")) is not None
+
+
+def test_curriculum_unknown_program_is_not_applied(db, program):
+    result = {"program_id": program.program_id}
+    record_import(db, "curriculum", _sha(b"v1"), CURRICULUM_FILE, 1, result)
+    assert find_applied(db, "curriculum", "01.03.02_ПМ_ИИТ_2024.xlsx", _sha(b"v1")) is None
+
+
+def test_teachers_applied_until_any_later_import(db, program):
+    record_import(db, "teachers", _sha(b"staff"), "staff.docx", 10, {"imported_count": 10})
+    assert find_applied(db, "teachers", "staff.docx", _sha(b"staff")) is not None
+
+    # Импорт плана меняет дисциплины, с которыми сопоставляются преподаватели
+    result = {"program_id": program.program_id}
+    record_import(db, "curriculum", _sha(b"plan"), CURRICULUM_FILE, 1, result)
+    assert find_applied(db, "teachers", "staff.docx", _sha(b"staff")) is None
+
+
+def test_invalidate_applied_drops_only_that_kind(db, program):
+    result = {"program_id": program.program_id}
+    record_import(db, "curriculum", _sha(b"plan"), CURRICULUM_FILE, 1, result)
+    record_import(db, "teachers", _sha(b"staff"), "staff.docx", 10, {"imported_count": 10})
+
+    assert invalidate_applied(db, "teachers") == 1
+    db.commit()
+
+    assert find_applied(db, "teachers", "staff.docx", _sha(b"staff")) is None
+    assert find_applied(db, "curriculum", CURRICULUM_FILE, _sha(b"plan")) is not None
+    assert db.query(ImportLedger).count() == 1
+
+
+class _FailingPool:
+    def submit(self, *args, **kwargs):
+        raise AssertionError("файл не должен разбираться повторно")
+
+
+def test_job_short_circuits_identical_bytes(session_factory, monkeypatch, tmp_path):
+    stored = []
+
+    def store(db, filename, data):
+        stored.append(data)
+        return {"imported_count": len(data)}
+
+    monkeypatch.setattr(import_jobs, "SessionLocal", session_factory)
+    monkeypatch.setitem(import_jobs.JOB_KINDS, "teachers", (None, store))
+    monkeypatch.setattr(import_jobs, "_pools", lambda: (_FailingPool(), None))
+
+    content = b"staff document"
+    db = session_factory()
+    record_import(db, "teachers", _sha(content), "staff.docx", 2, {"imported_count": 2})
+    db.close()
+
+    spooled = tmp_path / "upload.docx"
+    spooled.write_bytes(content)
+    job_id = "ledger-job"
+    job = {"job_id": job_id, "status": "queued", "errors": [], "result": None}
+    monkeypatch.setitem(import_jobs._jobs, job_id, job)
+    import_jobs._run_job(job_id, "teachers", str(spooled), "staff.docx", _sha(content))
+
+    job = import_jobs.get_job(job_id)
+    assert job["status"] == "done"
+    assert job["result"]["status"] == "unchanged"
+    assert stored == []
+    assert not spooled.exists()
+
+
+def test_program_upload_invalidates_teachers_ledger(db, make_client, tmp_path):
+    record_import(db, "teachers", _sha(b"staff"), "staff.docx", 10, {"imported_count": 10})
+    csv_file = tmp_path / "programs.csv"
+    csv_file.write_text(
+        "program_name,year\n01.03.02 Прикладная математика (Анализ данных),2024\n",
+        encoding="utf-8",
+    )
+
+    with open(csv_file, "rb") as file:
+        response = make_client(admin.router).post(
+            "/admin/upload-programs", files={"file": ("programs.csv", file, "text/csv")}
+        )
+
+    assert response.status_code == 200
+    db.expire_all()
+    assert db.query(EducationProgram).count() == 1
+    # Та же справка после загрузки программ снова применяется
+    assert find_applied(db, "teachers", "staff.docx", _sha(b"staff")) is None
@@ -0,0 +1,88 @@
+import pytest
+from openpyxl import Workbook
+
+from app.services.import_utils import parse_excel, read_workbook_sheets
+
+
+PLAN_HEADER = ["Наименование", "Семестр", "Экз", "Лек", "Пр", "Лаб", "Экз", "Лек", "Пр", "Лаб"]
+
+
+@pytest.fixture
+def plan_file(tmp_path):
+    workbook = Workbook()
+    svod = workbook.active
+    svod.title = "ПланСвод"
+    svod.append(["Учебный план 09.04.04"])
+    svod.append(["№", "Наименование", "Кафедра"])
+    svod.append([1, "Математика", "ИиППО"])
+    svod.append([2, " Физика ", None])
+    svod.append([3, None, "ИиППО"])
+    svod.append([4, "История", "Истории"])
+    svod.append([5, "Дисциплина без часов", "ИиППО"])
+
+    # Лист, который парсер не читает
+    workbook.create_sheet("Титул").append(["Титульный лист"])
+
+    plan = workbook.create_sheet("План")
+    plan.append([None, None, "1 курс", None, None, None, "2 курс"])
+    plan.append(PLAN_HEADER)
+    plan.append(["Математика", 1, 1, 36, 18, None, 2, 18, 18, None])
+    # Числа строкой и прочерки, как в выгрузках планов
+    plan.append(["Физика", 2, None, "18", "-", 16, "зач", 18, None, "16"])
+    plan.append([" История ", 1, "экз", 16, None, None, None, None, None, None])
+    # Повтор дисциплины: берётся первая строка
+    plan.append(["Математика", 3, 1, 100, 100, 100, 1, 100, 100, 100])
+    plan.append([None] * len(PLAN_HEADER))
+
+    path = tmp_path / "09.04.04_АИС_ИИТ_2024.xlsx"
+    workbook.save(path)
+    return path
+
+
+def _record(discipline, department, lecture, practice, lab, exam):
+    return {
+        "discipline": discipline,
+        "department": department,
+        "lecture_hours": lecture,
+        "practice_hours": practice,
+        "lab_hours": lab,
+        "exam_ours": exam,
+        "exam_hours": 0.0,
+        "test_hours": 0.0,
+        "total_practice_hours": practice + lab,
+    }
+
+
+def test_parse_excel_sums_course_blocks_and_merges_sheets(plan_file):
+    assert parse_excel(str(plan_file)) == [
+        _record("Математика", "ИиППО", 54.0, 36.0, 0.0, 2),
+        # Нечисловые часы считаются нулём; нечисловой экзамен оставляет
+        # значение предыдущего блока, пустой — обнуляет
+        _record("Физика", "Не указано", 36.0, 0.0, 32.0, 0),
+        _record("История", "Истории", 16.0, 0.0, 0.0, 0),
+        _record("Дисциплина без часов", "ИиППО", 0.0, 0.0, 0.0, 0),
+    ]
+
+
+def test_read_workbook_sheets_finds_header_row(plan_file):
+    sheets = read_workbook_sheets(str(plan_file), ("План", "Нет такого листа"))
+
+    assert list(sheets) == ["План"]
+    plan = sheets["План"]
+    # Повторяющиеся заголовки нумеруются, как в pandas.read_excel
+    assert plan.columns.tolist() == [
+        "Наименование", "Семестр", "Экз", "Лек", "Пр", "Лаб", "Экз.1", "Лек.1", "Пр.1", "Лаб.1"
+    ]
+    # Пустые строки в конце листа отбрасываются
+    assert len(plan) == 4
+
+
+def test_parse_excel_requires_both_sheets(tmp_path):
+    workbook = Workbook()
+    workbook.active.title = "ПланСвод"
+    workbook.active.append(["Наименование", "Кафедра"])
+    path = tmp_path / "plan.xlsx"
+    workbook.save(path)
+
+    with pytest.raises(ValueError, match="План"):
+        parse_excel(str(path))
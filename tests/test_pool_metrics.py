@@ -0,0 +1,53 @@
+import logging
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.services.pool_metrics import (
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+    instrument_engine,
+)
+
+
+def _engine(database_path, **kwargs):
+    return create_engine(f"sqlite:///{database_path}", poolclass=TimedQueuePool, **kwargs)
+
+
+def test_timed_pools_log_under_sqlalchemy_pool_loggers(database_path):
+    engine = _engine(database_path, pool_logging_name="kadrsp")
+
+    assert engine.pool.logger.name == "sqlalchemy.pool.impl.QueuePool.kadrsp"
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}", poolclass=TimedAsyncAdaptedQueuePool
+    )
+    assert async_engine.pool.logger.name == "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+
+def test_dispose_is_silent_in_app_log(database_path, caplog):
+    caplog.set_level(logging.INFO, logger="app")
+    engine = _engine(database_path)
+    metrics = instrument_engine(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    engine.dispose()
+
+    assert [r for r in caplog.records if r.name.startswith("app.")] == []
+    # Пул после dispose() продолжает писать в те же метрики
+    assert engine.pool.metrics is metrics
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert metrics.snapshot()["checkouts"] == 2
+
+
+def test_echo_pool_still_logs_dispose(database_path, caplog):
+    caplog.set_level(logging.INFO)
+    engine = _engine(database_path, echo_pool=True)
+
+    engine.dispose()
+
+    assert any(
+        r.name == "sqlalchemy.pool.impl.QueuePool" and "disposed" in r.getMessage()
+        for r in caplog.records
+    )
@@ -0,0 +1,123 @@
+import csv
+
+import docx
+import pytest
+
+import Converter_Programms
+from app.models import EducationProgram
+from app.services.import_utils import import_education_programs
+from app.services.program_names import parse_program_name
+
+
+@pytest.mark.parametrize(
+    "program_name, code, direction, profile, level, year",
+    [
+        (
+            "09.04.04 Программная инженерия (Автоматизированные информационные системы)",
+            "09.04.04",
+            "Программная инженерия",
+            "Автоматизированные информационные системы",
+            "магистратура",
+            None,
+        ),
+        (
+            "  01.03.02 Прикладная математика (Анализ данных) 2024 ",
+            "01.03.02",
+            "Прикладная математика",
+            "Анализ данных",
+            "бакалавриат",
+            2024,
+        ),
+        (
+            "10.05.01 Компьютерная безопасность (Анализ (безопасность) систем)",
+            "10.05.01",
+            "Компьютерная безопасность",
+            "Анализ (безопасность",
+            "специалитет",
+            None,
+        ),
+        ("Программа без кода", None, "Программа без кода", None, None, None),
+    ],
+)
+def test_parse_program_name(program_name, code, direction, profile, level, year):
+    parsed = parse_program_name(program_name)
+
+    assert parsed.name == program_name.strip()
+    assert (parsed.code, parsed.direction, parsed.profile) == (code, direction, profile)
+    assert (parsed.level, parsed.year) == (level, year)
+
+
+@pytest.mark.parametrize(
+    "program_name, short_name",
+    [
+        (
+            "09.04.04 Программная инженерия (Автоматизированные информационные системы)",
+            "09.04.04_Аис_2023",
+        ),
+        ("01.03.02 Прикладная математика (Анализ данных) 2024", "01.03.02_Ад_2023"),
+        # Без профиля инициалы берутся от заглушки UNKNOWN
+        ("09.03.01 Информатика и вычислительная техника", "09.03.01_U_2023"),
+        ("09.03.01 Информатика ()", "09.03.01__2023"),
+        ("", "Unknown"),
+        ("   ", "Unknown"),
+    ],
+)
+def test_short_name(program_name, short_name):
+    assert parse_program_name(program_name).short_name(2023) == short_name
+
+
+def test_parse_is_cached():
+    name = "38.03.05 Бизнес-информатика (Цифровая экономика)"
+    assert parse_program_name(name) is parse_program_name(name)
+
+
+def test_import_education_programs_writes_parsed_short_names(db, tmp_path):
+    path = tmp_path / "programs.csv"
+    with open(path, "w", encoding="utf-8-sig", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["program_name", "short_name", "year"])
+        for program_name, year in (
+            ("09.04.04 Программная инженерия (Автоматизированные информационные системы)", 2024),
+            ("09.04.04 Программная инженерия (Алгоритмы интеллектуальных систем)", 2024),
+            ("09.03.01 Информатика и вычислительная техника", 2023),
+        ):
+            writer.writerow([program_name, "", year])
+
+    import_education_programs(str(path), db)
+
+    assert dict(db.query(EducationProgram.program_name, EducationProgram.short_name)) == {
+        "09.04.04 Программная инженерия (Автоматизированные информационные системы)": "09.04.04_Аис_2024",
+        # Та же основа short_name — свободный суффикс
+        "09.04.04 Программная инженерия (Алгоритмы интеллектуальных систем)": "09.04.04_Аис_2024_1",
+        "09.03.01 Информатика и вычислительная техника": "09.03.01_U_2023",
+    }
+
+
+def test_converter_csv_matches_imported_short_names(db, tmp_path, monkeypatch):
+    programs = [
+        "09.04.04 Программная инженерия (Автоматизированные информационные системы)",
+        "09.04.04 Программная инженерия (Алгоритмы интеллектуальных систем)",
+        "09.03.01 Информатика и вычислительная техника",
+    ]
+    doc = docx.Document()
+    table = doc.add_table(rows=1, cols=2)
+    table.rows[0].cells[1].text = "Наименование образовательных программ"
+    for cell_text in (f"{programs[0]}; {programs[2]};", f"{programs[1]};; {programs[0]}"):
+        table.add_row().cells[1].text = cell_text
+    path = tmp_path / "АИС_МАГИ_2024.docx"
+    doc.save(path)
+    # CSV пишется в текущий каталог
+    monkeypatch.chdir(tmp_path)
+
+    Converter_Programms.process_docx(str(path))
+    with open(tmp_path / "processed_programs_2024.csv", encoding="utf-8", newline="") as file:
+        converted = {row["program_name"]: row["short_name"] for row in csv.DictReader(file)}
+    import_education_programs(str(tmp_path / "processed_programs_2024.csv"), db)
+
+    # Пустые фрагменты между ";" отброшены
+    assert sorted(converted) == sorted(programs)
+    imported = dict(db.query(EducationProgram.program_name, EducationProgram.short_name))
+    assert converted[programs[0]] == imported[programs[0]] == "09.04.04_Аис_2024"
+    assert converted[programs[2]] == imported[programs[2]] == "09.03.01_U_2024"
+    # Суффикс для совпавшей основы подбирает импорт
+    assert imported[programs[1]] == converted[programs[1]] + "_1"
@@ -0,0 +1,81 @@
+import pytest
+
+from app.models import Qualification, Retraining
+from app.services.import_utils import import_teachers_with_programs
+from app.services.qualifications import RETRAINING_MIN_HOURS, parse_courses
+
+
+@pytest.mark.parametrize(
+    "raw, qualifications, retrainings",
+    [
+        (
+            "Цифровые технологии в образовании. 72 часа. ТПУ. 15.11.2022.",
+            [("Цифровые технологии в образовании", 2022)],
+            [],
+        ),
+        (
+            f"Анализ данных. {RETRAINING_MIN_HOURS} часов. НГУ. 01.06.2021 г.",
+            [],
+            [("Анализ данных", 2021)],
+        ),
+        (
+            f"Анализ данных. {RETRAINING_MIN_HOURS - 1} ак. часов. НГУ. 01.06.2021.",
+            [("Анализ данных", 2021)],
+            [],
+        ),
+        (
+            # По названию — переподготовка при любом числе часов
+            "Профессиональная переподготовка «Педагогика». 72 академических часа. 10.02.2020.",
+            [],
+            [("Профессиональная переподготовка «Педагогика»", 2020)],
+        ),
+        ("", [], []),
+        (None, [], []),
+    ],
+)
+def test_courses_are_classified_by_hours_and_title(raw, qualifications, retrainings):
+    parsed = parse_courses(raw)
+
+    assert parsed == (
+        [{"program_name": name, "year": year} for name, year in qualifications],
+        [{"program_name": name, "year": year} for name, year in retrainings],
+    )
+
+
+def test_cell_with_several_courses():
+    raw = (
+        "Информационная безопасность. 36 часов. ТПУ. 12.03.2023.\n"
+        "Машинное обучение. 520 часов. ТГУ. 30.06.2022.\n"
+        "Информационная  безопасность. 36 часов. ТПУ. 12.03.2023."
+    )
+
+    qualifications, retrainings = parse_courses(raw)
+
+    # Повтор курса в ячейке отбрасывается
+    assert qualifications == [{"program_name": "Информационная безопасность", "year": 2023}]
+    assert retrainings == [{"program_name": "Машинное обучение", "year": 2022}]
+
+
+def test_import_adds_only_new_courses(db):
+    raw = (
+        "Информационная безопасность. 36 часов. ТПУ. 12.03.2023. "
+        "Машинное обучение. 520 часов. ТГУ. 30.06.2022."
+    )
+    qualifications, retrainings = parse_courses(raw)
+    entry = {
+        "full_name": "Иванов Иван Иванович",
+        "position": "Доцент",
+        "education_level": "ВО",
+        "qualifications": qualifications,
+        "retrainings": retrainings,
+    }
+
+    import_teachers_with_programs(db, [entry])
+    import_teachers_with_programs(db, [dict(entry)])
+
+    assert [(q.program_name, q.year) for q in db.query(Qualification)] == [
+        ("Информационная безопасность", 2023)
+    ]
+    assert [(r.program_name, r.year) for r in db.query(Retraining)] == [
+        ("Машинное обучение", 2022)
+    ]
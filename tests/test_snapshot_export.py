@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+import zipfile
+
+import pytest
+
+from app.models import Curriculum, EducationProgram, TaughtDiscipline, Teacher
+from app.services import snapshot_export
+from app.services.snapshot_export import pa, pq
+
+needs_pyarrow = pytest.mark.skipif(pa is None, reason="pyarrow не установлен")
+
+
+@pytest.fixture
+def snapshot(db, session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_export, "engine", session_factory.kw["bind"])
+    monkeypatch.setattr(snapshot_export, "EXPORT_DIR", str(tmp_path / "export"))
+    # Порция меньше таблицы: строки пишутся в несколько приёмов
+    monkeypatch.setattr(snapshot_export, "EXPORT_BATCH_SIZE", 2)
+
+    program = EducationProgram(
+        program_name="09.04.04 Программная инженерия (АИС)", short_name="09.04.04_Аис_2024", year=2024
+    )
+    teacher = Teacher(full_name="Иванов Иван Иванович", position="Доцент", education_level="ВО")
+    db.add_all([program, teacher])
+    db.flush()
+    rows = [
+        Curriculum(
+            program_id=program.program_id, discipline=f"Дисциплина {number}",
+            department="ИиППО", lecture_hours=18.0 * number,
+        )
+        for number in range(5)
+    ]
+    db.add_all(rows)
+    db.flush()
+    db.add(TaughtDiscipline(teacher_id=teacher.teacher_id, curriculum_id=rows[0].curriculum_id))
+    program.teachers.append(teacher)
+    db.commit()
+
+    # Таблица -> ожидаемое число строк
+    return {
+        "education_programs": 1,
+        "curriculum": 5,
+        "teachers": 1,
+        "teacher_programs": 1,
+        "taught_disciplines": 1,
+        "qualifications": 0,
+        "retrainings": 0,
+    }
+
+
+def _read_table(archive, name, fmt):
+    data = archive.read(name)
+    if fmt == "parquet":
+        return pq.read_table(io.BytesIO(data)).num_rows
+    if fmt == "arrow":
+        return pa.ipc.open_file(pa.BufferReader(data)).read_all().num_rows
+    reader = csv.reader(io.StringIO(data.decode("utf-8-sig")))
+    next(reader)  # Заголовок
+    return sum(1 for _ in reader)
+
+
+@pytest.mark.parametrize(
+    "fmt",
+    [
+        pytest.param("parquet", marks=needs_pyarrow),
+        pytest.param("arrow", marks=needs_pyarrow),
+        "csv",
+    ],
+)
+def test_archive_has_file_per_table(snapshot, fmt):
+    path = snapshot_export.write_snapshot(fmt)
+
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        extension = snapshot_export.FORMATS[fmt]
+        assert sorted(archive.namelist()) == sorted(
+            [name + extension for name in snapshot] + ["manifest.json"]
+        )
+        counts = {
+            name: _read_table(archive, name + extension, fmt) for name in snapshot
+        }
+
+    assert counts == snapshot
+    assert manifest["format"] == fmt
+    assert {name: table["rows"] for name, table in manifest["tables"].items()} == snapshot
+
+
+def test_without_pyarrow_only_csv(snapshot, monkeypatch):
+    monkeypatch.setattr(snapshot_export, "pa", None)
+    monkeypatch.setattr(snapshot_export, "pq", None)
+
+    assert snapshot_export.available_formats() == ("csv",)
+    assert snapshot_export.default_format() == "csv"
+    with pytest.raises(ValueError):
+        snapshot_export.write_snapshot("parquet")
+
+    path = snapshot_export.write_snapshot(snapshot_export.default_format())
+    with zipfile.ZipFile(path) as archive:
+        counts = {name: _read_table(archive, name + ".csv", "csv") for name in snapshot}
+    assert counts == snapshot
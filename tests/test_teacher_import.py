@@ -0,0 +1,120 @@
+import docx
+import pytest
+from sqlalchemy import func, select
+
+from app.models import (
+    Curriculum,
+    EducationProgram,
+    Qualification,
+    TaughtDiscipline,
+    Teacher,
+    teacher_program_association,
+)
+from app.services.import_utils import import_teachers_with_programs, parse_docx
+
+
+HEADERS = [
+    "Ф.И.О.",
+    "Должность преподавателя",
+    "Перечень преподаваемых дисциплин",
+    "Уровень (уровни) профессионального образования, квалификация",
+    "Учёная степень (при наличии)",
+    "Учёное звание (при наличии)",
+    "Сведения о повышении квалификации (за последние 3 года) и сведения о профессиональной переподготовке (при наличии)",
+    "Общий стаж работы",
+    "Наименование образовательных программ, в реализации которых участвует педагогический работник",
+]
+
+AIS = "09.04.04 Программная инженерия (Автоматизированные информационные системы)"
+AD = "01.03.02 Прикладная математика (Анализ данных) 2024"
+
+
+def _write_staff(path, rows):
+    doc = docx.Document()
+    table = doc.add_table(rows=1, cols=len(HEADERS))
+    for cell, header in zip(table.rows[0].cells, HEADERS):
+        cell.text = header
+    for values in rows:
+        for cell, value in zip(table.add_row().cells, values):
+            cell.text = value
+    doc.save(path)
+    return path
+
+
+@pytest.fixture
+def staff_file(tmp_path):
+    course = "Информационная безопасность, 72 ч., 12.03.2023"
+    return _write_staff(
+        tmp_path / "staff.docx",
+        [
+            ["Иванов Иван Иванович", "Доцент", "Базы данных; Машинное обучение", "ВО",
+             "к.т.н.", "доцент", course, "15", f"{AIS}; {AD}"],
+            ["Петров Пётр Петрович", "Старший преподаватель", "базы данных", "ВО",
+             "", "", "", "7", AIS],
+            # Повтор ФИО в файле: основной считается первая строка
+            ["Иванов Иван Иванович", "Профессор", "Машинное обучение", "ВО",
+             "", "", course, "16", AD],
+        ],
+    )
+
+
+def _counts(db):
+    return {
+        model: db.scalar(select(func.count()).select_from(model))
+        for model in (
+            Teacher,
+            EducationProgram,
+            Curriculum,
+            TaughtDiscipline,
+            teacher_program_association,
+            Qualification,
+        )
+    }
+
+
+def _duplicates(db, *columns):
+    return db.execute(
+        select(*columns).group_by(*columns).having(func.count() > 1)
+    ).all()
+
+
+def test_reimport_of_same_file_adds_nothing(db, staff_file):
+    program = EducationProgram(program_name=AIS, short_name="09.04.04_Аис_2023", year=2023)
+    db.add(program)
+    db.flush()
+    databases = Curriculum(
+        program_id=program.program_id, discipline="Базы данных", department="ИиППО"
+    )
+    db.add(databases)
+    db.commit()
+
+    import_teachers_with_programs(db, parse_docx(str(staff_file)))
+    first = _counts(db)
+    import_teachers_with_programs(db, parse_docx(str(staff_file)))
+
+    assert _counts(db) == first
+    assert first[Teacher] == 2
+    assert first[EducationProgram] == 2
+    # "Машинное обучение" нет в планах — создаётся один раз
+    assert first[Curriculum] == 2
+    assert first[TaughtDiscipline] == 3
+    assert first[teacher_program_association] == 3
+    assert first[Qualification] == 1
+
+    assert _duplicates(db, Teacher.full_name) == []
+    assert _duplicates(db, EducationProgram.program_name) == []
+    assert _duplicates(db, TaughtDiscipline.teacher_id, TaughtDiscipline.curriculum_id) == []
+    assert _duplicates(
+        db,
+        teacher_program_association.c.teacher_id,
+        teacher_program_association.c.program_id,
+    ) == []
+
+    ivanov = db.scalar(select(Teacher).where(Teacher.full_name == "Иванов Иван Иванович"))
+    assert (ivanov.position, ivanov.total_experience) == ("Доцент", 15)
+    # Оба преподавателя ведут дисциплину из плана программы
+    assert db.scalar(
+        select(func.count())
+        .select_from(TaughtDiscipline)
+        .where(TaughtDiscipline.curriculum_id == databases.curriculum_id)
+    ) == 2
@@ -0,0 +1,99 @@
+import pytest
+
+from app.models import EducationProgram, Teacher
+from app.routers import teachers
+
+
+# ФИО, должность, общий стаж: повторы должностей и стажа, пустой стаж
+STAFF = [
+    ("Андреев Андрей Андреевич", "Доцент", 10),
+    ("Борисов Борис Борисович", "Профессор", None),
+    ("Васильев Василий Васильевич", "Доцент", 10),
+    ("Григорьев Григорий Григорьевич", "Старший преподаватель", 0),
+    ("Дмитриев Дмитрий Дмитриевич", "Доцент", 5),
+    ("Егоров Егор Егорович", "Профессор", 10),
+    ("Жуков Жук Жукович", "Доцент", None),
+]
+
+
+@pytest.fixture
+def staff(db):
+    program = EducationProgram(
+        program_name="09.04.04 Программная инженерия (АИС)", short_name="09.04.04_Аис_2024", year=2024
+    )
+    rows = [
+        Teacher(full_name=name, position=position, total_experience=experience, education_level="ВО")
+        for name, position, experience in STAFF
+    ]
+    rows[0].programs.append(program)
+    rows[2].programs.append(program)
+    db.add_all(rows)
+    db.commit()
+    return {teacher.full_name: teacher.teacher_id for teacher in rows}, program.program_id
+
+
+def _pages(client, **params):
+    ids, cursor, pages = [], None, 0
+    while True:
+        query = dict(params, limit=2)
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/api/teachers", params=query)
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["items"]) <= 2
+        ids += [item["teacher_id"] for item in body["items"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+def _expected(ids, key, descending=False):
+    index = {"position": 1, "total_experience": 2}[key]
+    rows = [(row[index] or 0, ids[row[0]]) for row in STAFF]
+    return [teacher_id for _, teacher_id in sorted(rows, reverse=descending)]
+
+
+@pytest.mark.parametrize(
+    "sort", ["position", "-position", "total_experience", "-total_experience"]
+)
+def test_pages_cover_list_once_with_ties(staff, make_client, sort):
+    ids, _ = staff
+    client = make_client(teachers.router)
+
+    paged, pages = _pages(client, sort=sort)
+
+    # Равные значения сортировки разводит teacher_id: без пропусков и повторов
+    assert paged == _expected(ids, sort.lstrip("-"), sort.startswith("-"))
+    assert pages == 4
+
+
+def test_filtered_pages_and_aggregates(staff, make_client):
+    ids, program_id = staff
+    client = make_client(teachers.router)
+
+    paged, _ = _pages(client, program_id=program_id)
+    assert paged == [ids["Андреев Андрей Андреевич"], ids["Васильев Василий Васильевич"]]
+
+    body = client.get("/api/teachers", params={"program_id": program_id, "limit": 1}).json()
+    assert body["sort"] == "full_name"
+    assert body["items"][0]["programs"] == [
+        {"program_id": program_id, "program_name": "09.04.04 Программная инженерия (АИС)"}
+    ]
+    assert body["items"][0]["disciplines_raw"] == ""
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"cursor": "не-курсор"},
+        # Курсор строковой сортировки к числовой
+        {"cursor": teachers._encode_cursor("Доцент", 1), "sort": "total_experience"},
+        {"sort": "academic_degree"},
+    ],
+)
+def test_bad_sort_or_cursor(staff, make_client, params):
+    response = make_client(teachers.router).get("/api/teachers", params=params)
+
+    assert response.status_code == 400
@@ -0,0 +1,127 @@
+import pytest
+
+from app.models import (
+    Curriculum,
+    DepartmentLoad,
+    EducationProgram,
+    ProgramLoad,
+    TaughtDiscipline,
+    Teacher,
+    TeacherLoad,
+)
+from app.services.teaching_load import program_teacher_ids, rebuild_load, refresh_load
+
+
+@pytest.fixture
+def plans(db):
+    programs = [
+        EducationProgram(program_name=name, short_name=short_name, year=2024)
+        for name, short_name in (
+            ("09.04.04 Программная инженерия (АИС)", "09.04.04_Аис_2024"),
+            ("01.03.02 Прикладная математика (Анализ данных)", "01.03.02_Ад_2024"),
+        )
+    ]
+    teachers = [
+        Teacher(full_name=name, position="Доцент", education_level="ВО")
+        for name in ("Иванов Иван Иванович", "Петров Пётр Петрович")
+    ]
+    db.add_all(programs + teachers)
+    db.flush()
+    ais, ad = (program.program_id for program in programs)
+    rows = {
+        "databases": Curriculum(
+            program_id=ais, discipline="Базы данных", department="ИиППО",
+            lecture_hours=36.0, lab_hours=36.0, course_project_hours=18.0,
+        ),
+        "history": Curriculum(
+            program_id=ais, discipline="История", department="Истории", lecture_hours=32.0
+        ),
+        "analysis": Curriculum(
+            program_id=ad, discipline="Математический анализ", department="Математики",
+            lecture_hours=54.0, practice_hours=54.0, exam_hours=2.0,
+        ),
+        # Часы не заданы: в итогах считаются нулём
+        "practice": Curriculum(
+            program_id=ad, discipline="Преддипломная практика", department="ИиППО",
+            lecture_hours=None, final_work_hours=216,
+        ),
+    }
+    db.add_all(rows.values())
+    db.flush()
+    ivanov, petrov = (teacher.teacher_id for teacher in teachers)
+    db.add_all(
+        TaughtDiscipline(teacher_id=teacher_id, curriculum_id=rows[key].curriculum_id)
+        for teacher_id, key in (
+            (ivanov, "databases"), (ivanov, "analysis"), (petrov, "history"), (petrov, "practice")
+        )
+    )
+    db.commit()
+    rebuild_load(db)
+    db.commit()
+    return {
+        "programs": (ais, ad),
+        "teachers": (ivanov, petrov),
+        "rows": {key: row.curriculum_id for key, row in rows.items()},
+    }
+
+
+def test_rebuild_sums_hours_per_key(db, plans, load_snapshot):
+    ais, ad = plans["programs"]
+    ivanov, _ = plans["teachers"]
+    totals = load_snapshot()
+
+    assert totals[ProgramLoad][ais]["disciplines"] == 2
+    assert totals[ProgramLoad][ais]["total_hours"] == 36.0 + 36.0 + 18.0 + 32.0
+    assert totals[ProgramLoad][ad]["final_work_hours"] == 216
+    assert totals[DepartmentLoad]["ИиППО"]["disciplines"] == 2
+    assert totals[DepartmentLoad]["ИиППО"]["lecture_hours"] == 36.0
+    assert totals[TeacherLoad][ivanov]["total_hours"] == (36.0 + 36.0 + 18.0) + (54.0 + 54.0 + 2.0)
+
+
+def test_refresh_of_touched_keys_matches_rebuild(db, plans, load_snapshot):
+    ais, ad = plans["programs"]
+    ivanov, petrov = plans["teachers"]
+    rows = plans["rows"]
+    before = load_snapshot()
+
+    # Часы, кафедра и связи меняются в обход импорта
+    touched_teachers = program_teacher_ids(db, ais)
+    databases = db.get(Curriculum, rows["databases"])
+    databases.lecture_hours = 18.0
+    databases.department = "Математики"
+    db.add(TaughtDiscipline(teacher_id=petrov, curriculum_id=rows["databases"]))
+    db.flush()
+    refresh_load(
+        db,
+        program_ids=[ais],
+        departments=["ИиППО", "Математики"],
+        teacher_ids=touched_teachers | {petrov},
+    )
+    db.commit()
+    incremental = load_snapshot()
+
+    # Итоги нетронутой программы не пересчитывались и не менялись
+    assert incremental[ProgramLoad][ad] == before[ProgramLoad][ad]
+    assert incremental[ProgramLoad][ais]["lecture_hours"] == 18.0 + 32.0
+    assert incremental[DepartmentLoad]["ИиППО"]["disciplines"] == 1
+
+    rebuild_load(db)
+    db.commit()
+    assert incremental == load_snapshot()
+    assert {ivanov, petrov} <= set(incremental[TeacherLoad])
+
+
+def test_refresh_drops_keys_without_rows(db, plans, load_snapshot):
+    _, ad = plans["programs"]
+    _, petrov = plans["teachers"]
+    rows = plans["rows"]
+
+    db.query(TaughtDiscipline).filter(TaughtDiscipline.teacher_id == petrov).delete()
+    db.query(Curriculum).filter(Curriculum.curriculum_id == rows["history"]).delete()
+    refresh_load(db, departments=["Истории", None], teacher_ids=[petrov])
+    db.commit()
+
+    totals = load_snapshot()
+    assert "Истории" not in totals[DepartmentLoad]
+    assert petrov not in totals[TeacherLoad]
+    assert ad in totals[ProgramLoad]